@@ -0,0 +1,510 @@
+'''
+Benchmark engine scraping terhadap server fixture lokal (tanpa mengakses banpt.or.id).
+
+- startup: waktu startup dan memori puncak (RSS) tiap engine, di proses Python baru.
+- crawl: waktu extract_table_data, go_to_next_page dan crawl penuh per engine
+  (baris/detik, detik/halaman, jumlah round-trip WebDriver).
+- memory: memori data hasil scraping sebagai list dict vs RecordBatch kolumnar.
+- parse: parsing snapshot HTML #table per backend, serial vs process pool, dan (jika Chrome
+  tersedia) ekstraksi per sel WebElement vs JavaScript massal vs snapshot HTML.
+Hasil bisa disimpan sebagai JSON untuk dibandingkan antar versi.
+'''
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import repeat
+
+import fixture_server
+import scraper
+
+# Script yang dijalankan di proses anak: import scraper, start engine, lalu laporkan metrik
+STARTUP_CHILD_SCRIPT = """
+import json
+import resource
+import sys
+import time
+
+started = time.perf_counter()
+import scraper
+engine = scraper.ENGINES[sys.argv[1]](**json.loads(sys.argv[2]))
+engine.start()
+startup_seconds = time.perf_counter() - started
+engine.close()
+
+print(json.dumps({
+    'startup_seconds': startup_seconds,
+    'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'children_peak_rss_kb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    'selenium_loaded': 'selenium' in sys.modules,
+}))
+"""
+
+def run_startup_once(engine_name, engine_kwargs):
+    '''Menjalankan satu percobaan startup engine di proses baru.'''
+    result = subprocess.run(
+        [sys.executable, '-c', STARTUP_CHILD_SCRIPT, engine_name, json.dumps(engine_kwargs)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Engine {engine_name} gagal start: {result.stderr.strip()[-500:]}")
+    # Baris terakhir stdout adalah laporan JSON, sisanya log print dari scraper
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def benchmark_engine_startup(engine_name, engine_kwargs, repeat=3):
+    '''Mengukur startup engine beberapa kali dan mengembalikan median serta nilai puncak.'''
+    runs = [run_startup_once(engine_name, engine_kwargs) for _ in range(repeat)]
+    return {
+        'engine': engine_name,
+        'runs': repeat,
+        'startup_seconds_median': statistics.median(run['startup_seconds'] for run in runs),
+        'startup_seconds_min': min(run['startup_seconds'] for run in runs),
+        'peak_rss_mb': max(run['peak_rss_kb'] for run in runs) / 1024,
+        'children_peak_rss_mb': max(run['children_peak_rss_kb'] for run in runs) / 1024,
+        'selenium_loaded': any(run['selenium_loaded'] for run in runs),
+    }
+
+def print_startup_report(results):
+    '''Menampilkan tabel perbandingan startup antar engine.'''
+    print(f"{'Engine':<10} {'Startup (median)':>17} {'Startup (min)':>14} {'RSS Python':>11} {'RSS anak':>9} {'Selenium':>9}")
+    for result in results:
+        print(f"{result['engine']:<10} {result['startup_seconds_median']:>16.3f}s {result['startup_seconds_min']:>13.3f}s "
+              f"{result['peak_rss_mb']:>9.1f}MB {result['children_peak_rss_mb']:>7.1f}MB "
+              f"{'ya' if result['selenium_loaded'] else 'tidak':>9}")
+
+def count_webdriver_calls(driver):
+    '''Membungkus driver.execute agar setiap round-trip WebDriver (termasuk dari WebElement) terhitung.'''
+    counter = {'calls': 0}
+    original_execute = driver.execute
+    
+    def counting_execute(driver_command, params=None):
+        counter['calls'] += 1
+        return original_execute(driver_command, params)
+    
+    driver.execute = counting_execute
+    return counter
+
+class OperationTimer:
+    '''Mencatat durasi dan round-trip WebDriver tiap pemanggilan fungsi scraper yang dibungkus.'''
+    
+    def __init__(self, counter=None):
+        self.counter = counter or {'calls': 0}
+        self.samples = {}
+        self._originals = {}
+    
+    def wrap(self, name):
+        original = getattr(scraper, name)
+        self._originals[name] = original
+        
+        def timed(*args, **kwargs):
+            calls_before = self.counter['calls']
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.samples.setdefault(name, []).append(
+                    (time.perf_counter() - started, self.counter['calls'] - calls_before))
+        
+        setattr(scraper, name, timed)
+    
+    def restore(self):
+        for name, original in self._originals.items():
+            setattr(scraper, name, original)
+        self._originals = {}
+    
+    def summary(self):
+        result = {}
+        for name, samples in self.samples.items():
+            durations = [duration for duration, _ in samples]
+            result[name] = {
+                'calls': len(samples),
+                'seconds_median': statistics.median(durations),
+                'seconds_total': sum(durations),
+                'webdriver_round_trips_median': statistics.median(calls for _, calls in samples),
+            }
+        return result
+
+def _crawl_result(engine_name, pages, rows, seconds, **extra):
+    result = {
+        'engine': engine_name,
+        'pages': pages,
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds else 0.0,
+        'seconds_per_page': seconds / pages if pages else 0.0,
+    }
+    result.update(extra)
+    return result
+
+def benchmark_http_crawl(server, base_url, page_size=1000, max_pages=None, max_concurrency=8):
+    '''Crawl penuh lewat HttpEngine terhadap endpoint JSON fixture.'''
+    requests_before = server.request_counts.get(server.json_path, 0)
+    started = time.perf_counter()
+    with scraper.HttpEngine(endpoint_url=base_url + server.json_path, page_size=page_size,
+                            url=base_url + fixture_server.PAGE_PATH, max_concurrency=max_concurrency) as engine:
+        pages = rows = 0
+        for page_data in engine.iter_pages(max_pages=max_pages):
+            pages += 1
+            rows += len(page_data)
+        seconds = time.perf_counter() - started
+        host_metrics = engine.session.metrics_report()
+        peak_concurrency = engine.limiter.peak_limit
+        throttle_events = engine.limiter.throttle_events
+    return _crawl_result('http', pages, rows, seconds, page_size=page_size, webdriver_round_trips=0,
+                         http_requests=server.request_counts.get(server.json_path, 0) - requests_before,
+                         peak_concurrency=peak_concurrency, throttle_events=throttle_events,
+                         host_metrics=host_metrics)
+
+def benchmark_selenium_crawl(base_url, webdriver_executable_path="", max_pages=None, headless=True):
+    '''Crawl lewat SeleniumEngine sambil mengukur extract_table_data dan go_to_next_page.'''
+    engine = scraper.SeleniumEngine(webdriver_executable_path, headless=headless,
+                                    url=base_url + fixture_server.PAGE_PATH)
+    engine.start()
+    counter = count_webdriver_calls(engine.driver)
+    timer = OperationTimer(counter)
+    timer.wrap('extract_table_data')
+    timer.wrap('go_to_next_page')
+    try:
+        started = time.perf_counter()
+        pages = rows = 0
+        for page_data in engine.iter_pages(max_pages=max_pages):
+            pages += 1
+            rows += len(page_data)
+        seconds = time.perf_counter() - started
+    finally:
+        timer.restore()
+        engine.close()
+    return _crawl_result('selenium', pages, rows, seconds, page_size=100,
+                         webdriver_round_trips=counter['calls'], operations=timer.summary())
+
+def print_crawl_report(results):
+    '''Menampilkan ringkasan benchmark crawl per engine.'''
+    print(f"{'Engine':<10} {'Halaman':>8} {'Baris':>8} {'Baris/detik':>12} {'Detik/halaman':>14} {'Round-trip WD':>14}")
+    for result in results:
+        print(f"{result['engine']:<10} {result['pages']:>8} {result['rows']:>8} {result['rows_per_second']:>12.1f} "
+              f"{result['seconds_per_page']:>14.3f} {result['webdriver_round_trips']:>14}")
+        for name, operation in result.get('operations', {}).items():
+            print(f"    {name}: median {operation['seconds_median']:.3f} detik, "
+                  f"{operation['webdriver_round_trips_median']} round-trip ({operation['calls']} kali)")
+
+def measure_rows_memory(build):
+    '''Memori (byte) yang masih dipegang hasil build() setelah selesai, diukur dengan tracemalloc.'''
+    gc.collect()
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        data = build()
+        seconds = time.perf_counter() - started
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'rows': len(data), 'bytes': current, 'peak_bytes': peak, 'seconds': seconds}
+
+def benchmark_row_memory(rows, page_size=1000):
+    '''Membandingkan memori seluruh baris fixture: list dict per baris vs RecordBatch gabungan.'''
+    payload = json.dumps(rows)
+    
+    def build_dict_rows():
+        scraped_at = datetime.now().isoformat()
+        return [scraper.build_row_data([scraper.clean_cell_text(value) for value in json_row], scraped_at)
+                for json_row in json.loads(payload)]
+    
+    def build_record_batch():
+        json_rows = json.loads(payload)
+        return scraper.RecordBatch.concat(scraper.map_json_rows(json_rows[start:start + page_size])
+                                          for start in range(0, len(json_rows), page_size))
+    
+    results = []
+    for name, build in (('list_dict', build_dict_rows), ('record_batch', build_record_batch)):
+        result = measure_rows_memory(build)
+        result['representation'] = name
+        results.append(result)
+    return results
+
+def print_memory_report(results):
+    '''Menampilkan perbandingan memori antar representasi baris.'''
+    baseline = results[0]['bytes']
+    print(f"{'Representasi':<14} {'Baris':>8} {'Memori':>10} {'Puncak':>10} {'Rasio':>7} {'Waktu':>8}")
+    for result in results:
+        print(f"{result['representation']:<14} {result['rows']:>8} {result['bytes'] / 1e6:>8.1f}MB "
+              f"{result['peak_bytes'] / 1e6:>8.1f}MB {baseline / result['bytes']:>6.1f}x {result['seconds']:>7.2f}s")
+
+def _parse_result(method, pages, rows, seconds, **extra):
+    result = {
+        'method': method,
+        'pages': pages,
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds else 0.0,
+        'seconds_per_page': seconds / pages if pages else 0.0,
+    }
+    result.update(extra)
+    return result
+
+def benchmark_html_parsing(rows, parsers=None, page_size=100, workers=None):
+    '''Memparse snapshot #table seluruh baris fixture per backend, serial lalu di process pool.'''
+    page_html = [fixture_server.render_table_html(rows[start:start + page_size])
+                 for start in range(0, len(rows), page_size)]
+    workers = workers or os.cpu_count() or 1
+    results = []
+    for parser in parsers or scraper.available_html_parsers():
+        started = time.perf_counter()
+        parsed_rows = sum(len(scraper.parse_table_html(html_text, parser)) for html_text in page_html)
+        results.append(_parse_result(f"{parser} serial", len(page_html), parsed_rows,
+                                     time.perf_counter() - started, parser=parser, workers=0))
+        
+        started = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed_rows = sum(len(batch) for batch in executor.map(scraper.parse_table_html, page_html,
+                                                                    repeat(parser), chunksize=8))
+        results.append(_parse_result(f"{parser} pool", len(page_html), parsed_rows,
+                                     time.perf_counter() - started, parser=parser, workers=workers))
+    return results
+
+def benchmark_selenium_extraction(base_url, webdriver_executable_path="", max_pages=5, parser=None):
+    '''Membandingkan cara ekstraksi halaman yang sama di Chrome: per sel WebElement, JavaScript massal, snapshot HTML.
+
+    Durasi snapshot dihitung sampai baris selesai diparse di proses ini (tanpa pool) agar sebanding.
+    '''
+    engine = scraper.SeleniumEngine(webdriver_executable_path, headless=True, url=base_url + fixture_server.PAGE_PATH)
+    engine.start()
+    counter = count_webdriver_calls(engine.driver)
+    methods = {
+        'per_cell': lambda driver: scraper.extract_table_data_per_row(driver, {'webdriver_calls': 0}),
+        'bulk_js': scraper.extract_table_data,
+        'snapshot': lambda driver: scraper.parse_table_html(scraper.capture_table_snapshot(driver).html, parser),
+    }
+    samples = {name: [] for name in methods}
+    try:
+        if not engine._new_navigator().open():
+            raise RuntimeError("Gagal menyiapkan tabel fixture")
+        for page in range(1, max_pages + 1):
+            for name, extract in methods.items():
+                calls_before = counter['calls']
+                started = time.perf_counter()
+                rows = len(extract(engine.driver))
+                samples[name].append((time.perf_counter() - started, counter['calls'] - calls_before, rows))
+            if page < max_pages and not scraper.go_to_next_page(engine.driver):
+                break
+    finally:
+        engine.close()
+    
+    results = []
+    for name, method_samples in samples.items():
+        results.append(_parse_result(name, len(method_samples), sum(rows for _, _, rows in method_samples),
+                                     sum(seconds for seconds, _, _ in method_samples),
+                                     webdriver_round_trips_median=statistics.median(
+                                         calls for _, calls, _ in method_samples)))
+    return results
+
+def print_parse_report(results):
+    '''Menampilkan perbandingan kecepatan parsing/ekstraksi per metode.'''
+    print(f"{'Metode':<22} {'Halaman':>8} {'Baris':>8} {'Baris/detik':>12} {'Detik/halaman':>14} {'Round-trip WD':>14}")
+    for result in results:
+        print(f"{result['method']:<22} {result['pages']:>8} {result['rows']:>8} {result['rows_per_second']:>12.1f} "
+              f"{result['seconds_per_page']:>14.4f} {result.get('webdriver_round_trips_median', 0):>14}")
+
+def git_revision():
+    '''Commit git saat ini (untuk membandingkan hasil antar versi), None jika tidak tersedia.'''
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def write_results(path, section, results, config):
+    '''Menyimpan hasil benchmark sebagai JSON beserta metadata versi.'''
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'config': config,
+        section: results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Hasil benchmark disimpan ke '{path}'")
+
+def run_startup_command(args):
+    results = []
+    server = None
+    try:
+        for engine_name in args.engines:
+            if engine_name == 'http':
+                endpoint = args.endpoint
+                if not endpoint and not os.path.exists(args.endpoint_cache):
+                    # Tanpa endpoint, start() melakukan discovery lewat Chrome dan yang terukur justru Selenium
+                    if server is None:
+                        server, base_url = fixture_server.start_fixture_server(fixture_server.generate_fixture_rows(1))
+                        print(f"Endpoint cache '{args.endpoint_cache}' tidak ada, engine http memakai endpoint "
+                              f"server fixture {base_url}")
+                    endpoint = base_url + fixture_server.JSON_PATH
+                if endpoint:
+                    engine_kwargs = {'endpoint_url': endpoint}
+                else:
+                    engine_kwargs = {'endpoint_cache_path': args.endpoint_cache}
+            else:
+                engine_kwargs = {'webdriver_executable_path': args.webdriver_path}
+                if engine_name == 'selenium':
+                    engine_kwargs['headless'] = True
+
+            print(f"Mengukur engine '{engine_name}' ({args.repeat} percobaan)...")
+            try:
+                results.append(benchmark_engine_startup(engine_name, engine_kwargs, repeat=args.repeat))
+            except RuntimeError as e:
+                print(f"    Error: {e}")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    print()
+    print_startup_report(results)
+    if args.output:
+        write_results(args.output, 'startup', results, vars(args))
+
+def run_crawl_command(args):
+    if args.data:
+        rows = fixture_server.load_fixture_rows(args.data)
+    else:
+        rows = fixture_server.generate_fixture_rows(args.rows)
+    server, base_url = fixture_server.start_fixture_server(rows, latency=args.latency, assets_url=args.assets_url,
+                                                           error_rate=args.error_rate)
+    print(f"Server fixture: {base_url} ({len(rows)} baris, latensi {args.latency}s)")
+
+    results = []
+    try:
+        for engine_name in args.engines:
+            print(f"\nMenjalankan crawl engine '{engine_name}'...")
+            try:
+                if engine_name == 'http':
+                    results.append(benchmark_http_crawl(server, base_url, page_size=args.page_size,
+                                                        max_pages=args.max_pages, max_concurrency=args.concurrency))
+                elif engine_name == 'selenium':
+                    results.append(benchmark_selenium_crawl(base_url, args.webdriver_path, max_pages=args.max_pages))
+                else:
+                    print(f"    Engine '{engine_name}' tidak didukung oleh benchmark crawl.")
+            except Exception as e:
+                print(f"    Error: {e}")
+    finally:
+        server.shutdown()
+
+    print()
+    print_crawl_report(results)
+    if args.output:
+        write_results(args.output, 'crawl', results, vars(args))
+
+def run_memory_command(args):
+    if args.data:
+        rows = fixture_server.load_fixture_rows(args.data)
+    else:
+        rows = fixture_server.generate_fixture_rows(args.rows)
+    results = benchmark_row_memory(rows, page_size=args.page_size)
+    print_memory_report(results)
+    if args.output:
+        write_results(args.output, 'memory', results, vars(args))
+
+def run_parse_command(args):
+    if args.data:
+        rows = fixture_server.load_fixture_rows(args.data)
+    else:
+        rows = fixture_server.generate_fixture_rows(args.rows)
+    print(f"Parsing {len(rows)} baris fixture per {args.page_size} baris (parser: "
+          f"{', '.join(args.parsers or scraper.available_html_parsers())})...")
+    results = benchmark_html_parsing(rows, args.parsers, page_size=args.page_size, workers=args.workers)
+    print()
+    print_parse_report(results)
+
+    if args.selenium:
+        server, base_url = fixture_server.start_fixture_server(rows, assets_url=args.assets_url)
+        print(f"\nMembandingkan ekstraksi di Chrome terhadap {base_url} ({args.max_pages} halaman)...")
+        try:
+            selenium_results = benchmark_selenium_extraction(base_url, args.webdriver_path, max_pages=args.max_pages)
+        except Exception as e:
+            print(f"    Error: {e}")
+        else:
+            print()
+            print_parse_report(selenium_results)
+            results.extend(selenium_results)
+        finally:
+            server.shutdown()
+    if args.output:
+        write_results(args.output, 'parse', results, vars(args))
+
+def build_arg_parser():
+    '''Parser CLI benchmark (juga dipakai subcommand "python -m scraper bench").'''
+    parser = argparse.ArgumentParser(description="Benchmark engine scraping")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    startup_parser = subparsers.add_parser('startup', help="Bandingkan waktu startup dan memori engine")
+    startup_parser.add_argument('--engines', nargs='+', default=['http', 'selenium'],
+                                help="Engine yang dibandingkan (default: http selenium)")
+    startup_parser.add_argument('--endpoint', default=None,
+                                help="URL endpoint JSON DataTables untuk engine http (tanpa discovery browser)")
+    startup_parser.add_argument('--endpoint-cache', default="banpt_ajax_endpoint.json",
+                                help="File endpoint tersimpan untuk engine http jika --endpoint tidak diisi "
+                                     "(jika tidak ada, dipakai endpoint server fixture lokal)")
+    startup_parser.add_argument('--webdriver-path', default="", help="Path ChromeDriver (kosong = cari di PATH)")
+    startup_parser.add_argument('--repeat', type=int, default=3, help="Jumlah percobaan per engine")
+    startup_parser.add_argument('--output', default=None, help="Simpan hasil sebagai JSON ke file ini")
+
+    crawl_parser = subparsers.add_parser('crawl', help="Benchmark crawl terhadap server fixture lokal")
+    crawl_parser.add_argument('--engines', nargs='+', default=['http', 'selenium'])
+    crawl_parser.add_argument('--rows', type=int, default=33552, help="Jumlah baris fixture sintetis")
+    crawl_parser.add_argument('--data', default=None, help="File JSON rekaman (lihat fixture_server.py record)")
+    crawl_parser.add_argument('--latency', type=float, default=0.0, help="Latensi buatan server per request (detik)")
+    crawl_parser.add_argument('--error-rate', type=float, default=0.0,
+                              help="Peluang server fixture membalas 429 (menguji backoff engine http)")
+    crawl_parser.add_argument('--page-size', type=int, default=1000, help="Ukuran halaman engine http")
+    crawl_parser.add_argument('--concurrency', type=int, default=8, help="Batas maksimum request paralel engine http")
+    crawl_parser.add_argument('--max-pages', type=int, default=None, help="Batas halaman per engine")
+    crawl_parser.add_argument('--assets-url', default=fixture_server.DEFAULT_ASSETS_URL,
+                              help="Base URL jQuery/DataTables untuk halaman fixture")
+    crawl_parser.add_argument('--webdriver-path', default="", help="Path ChromeDriver (kosong = cari di PATH)")
+    crawl_parser.add_argument('--output', default=None, help="Simpan hasil sebagai JSON ke file ini")
+
+    memory_parser = subparsers.add_parser('memory', help="Bandingkan memori list dict vs RecordBatch")
+    memory_parser.add_argument('--rows', type=int, default=33552, help="Jumlah baris fixture sintetis")
+    memory_parser.add_argument('--data', default=None, help="File JSON rekaman (lihat fixture_server.py record)")
+    memory_parser.add_argument('--page-size', type=int, default=1000, help="Baris per RecordBatch halaman")
+    memory_parser.add_argument('--output', default=None, help="Simpan hasil sebagai JSON ke file ini")
+
+    parse_parser = subparsers.add_parser('parse', help="Benchmark parsing snapshot HTML #table")
+    parse_parser.add_argument('--rows', type=int, default=33552, help="Jumlah baris fixture sintetis")
+    parse_parser.add_argument('--data', default=None, help="File JSON rekaman (lihat fixture_server.py record)")
+    parse_parser.add_argument('--page-size', type=int, default=100, help="Baris per snapshot (default: 100 seperti tabel)")
+    parse_parser.add_argument('--parsers', nargs='+', choices=list(scraper.HTML_PARSERS), default=None,
+                              help="Backend yang dibandingkan (default: semua yang terpasang)")
+    parse_parser.add_argument('--workers', type=int, default=None, help="Jumlah process pool (default: jumlah CPU)")
+    parse_parser.add_argument('--selenium', action='store_true',
+                              help="Bandingkan juga ekstraksi per sel, JavaScript massal dan snapshot di Chrome")
+    parse_parser.add_argument('--max-pages', type=int, default=5, help="Halaman yang diukur dengan --selenium")
+    parse_parser.add_argument('--assets-url', default=fixture_server.DEFAULT_ASSETS_URL,
+                              help="Base URL jQuery/DataTables untuk halaman fixture")
+    parse_parser.add_argument('--webdriver-path', default="", help="Path ChromeDriver (kosong = cari di PATH)")
+    parse_parser.add_argument('--output', default=None, help="Simpan hasil sebagai JSON ke file ini")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    if args.command == 'startup':
+        run_startup_command(args)
+    elif args.command == 'memory':
+        run_memory_command(args)
+    elif args.command == 'parse':
+        run_parse_command(args)
+    else:
+        run_crawl_command(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,382 @@
+'''
+Server lokal pengganti banpt.or.id untuk replay dan benchmark scraping tanpa internet.
+Menyajikan halaman pencarian_prodi.php atau pencarian_institusi.php (rekaman atau template
+bawaan) dan backend JSON server-side yang kompatibel dengan DataTables, dengan latensi buatan
+yang bisa diatur.
+'''
+import argparse
+import gzip
+import json
+import mimetypes
+import os
+import random
+import threading
+import time
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+PAGE_PATH = "/direktori/prodi/pencarian_prodi.php"
+JSON_PATH = "/direktori/prodi/data_prodi.php"
+INSTITUSI_PAGE_PATH = "/direktori/institusi/pencarian_institusi.php"
+INSTITUSI_JSON_PATH = "/direktori/institusi/data_institusi.php"
+
+# Path, judul dan header kolom tabel per direktori; expiry_column adalah indeks kolom
+# tanggal kedaluwarsa yang dipakai render kolom status (kolom terakhir tabel)
+FIXTURE_DIRECTORIES = {
+    'prodi': {
+        'page_path': PAGE_PATH,
+        'json_path': JSON_PATH,
+        'title': "Direktori Akreditasi Program Studi",
+        'headers': ["Perguruan Tinggi", "Program Studi", "Strata", "Wilayah", "No. SK", "Tahun SK", "Peringkat",
+                    "Tanggal Kedaluwarsa"],
+        'expiry_column': 7,
+    },
+    'institusi': {
+        'page_path': INSTITUSI_PAGE_PATH,
+        'json_path': INSTITUSI_JSON_PATH,
+        'title': "Direktori Akreditasi Perguruan Tinggi",
+        'headers': ["Perguruan Tinggi", "Peringkat", "No. SK", "Tahun SK", "Wilayah", "Tanggal Kedaluwarsa"],
+        'expiry_column': 5,
+    },
+}
+
+# Aset jQuery/DataTables/Bootstrap disalin di fixture_assets/ dengan tata letak paket npm seperti di CDN
+# (<paket>@<versi>/<path>) dan disajikan server fixture sendiri di ASSETS_PATH, sehingga halaman
+# fixture tidak bergantung pada internet; --assets-url bisa diarahkan ke CDN, mis. https://cdn.jsdelivr.net/npm
+# Versi, sumber dan lisensi tiap paket dicatat di fixture_assets/README.md
+ASSETS_PATH = "/assets"
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixture_assets")
+DEFAULT_ASSETS_URL = ASSETS_PATH
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title} (fixture)</title>
+<link rel="stylesheet" href="{assets}/bootstrap@4.5.3/dist/css/bootstrap.min.css">
+<link rel="stylesheet" href="{assets}/datatables.net-bs4@1.10.15/css/dataTables.bootstrap4.min.css">
+</head>
+<body>
+<table id="table" class="table table-striped" style="width:100%">
+  <thead>
+    <tr>
+      {headers}<th>Status Kedaluwarsa</th>
+    </tr>
+  </thead>
+  <tbody></tbody>
+</table>
+<script src="{assets}/jquery@3.7.1/dist/jquery.min.js"></script>
+<script src="{assets}/datatables.net@1.10.15/js/jquery.dataTables.min.js"></script>
+<script src="{assets}/datatables.net-bs4@1.10.15/js/dataTables.bootstrap4.min.js"></script>
+<script>
+$(function() {{
+  $('#table').DataTable({{
+    processing: true,
+    serverSide: true,
+    ajax: {{url: '{json_path}', type: 'GET'}},
+    columnDefs: [{{
+      targets: {status_column},
+      data: null,
+      orderable: false,
+      render: function(data, type, row) {{
+        return new Date(row[{expiry_column}]) < new Date() ? 'Kedaluwarsa' : 'Masih Berlaku';
+      }}
+    }}]
+  }});
+}});
+</script>
+</body>
+</html>
+"""
+
+FIXTURE_PRODI = [
+    "Teknik Informatika", "Sistem Informasi", "Manajemen", "Akuntansi", "Ilmu Hukum",
+    "Pendidikan Guru Sekolah Dasar", "Kedokteran", "Farmasi", "Teknik Sipil", "Ilmu Komunikasi",
+    "Agribisnis", "Keperawatan", "Psikologi", "Pendidikan Bahasa Inggris", "Teknik Elektro",
+]
+FIXTURE_STRATA = ["D3", "D4", "S1", "S1", "S1", "S2", "S3", "Profesi"]
+FIXTURE_PERINGKAT = ["Unggul", "Baik Sekali", "Baik", "A", "B", "C", "Terakreditasi Sementara"]
+
+def generate_fixture_rows(count, seed=42):
+    '''Membuat baris DataTables sintetis yang deterministik (8 kolom seperti tabel asli).'''
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        tahun_sk = rng.randint(2015, 2024)
+        kedaluwarsa = date(tahun_sk + 5, rng.randint(1, 12), rng.randint(1, 28))
+        rows.append([
+            f"Universitas Fiktif {i // 15 + 1}",
+            FIXTURE_PRODI[i % len(FIXTURE_PRODI)],
+            rng.choice(FIXTURE_STRATA),
+            f"Wilayah {rng.randint(1, 16)}",
+            f"{1000 + i}/SK/BAN-PT/Ak/S/{tahun_sk}",
+            str(tahun_sk),
+            rng.choice(FIXTURE_PERINGKAT),
+            kedaluwarsa.isoformat(),
+        ])
+    return rows
+
+def generate_fixture_institution_rows(count, seed=42):
+    '''Membuat baris direktori institusi sintetis (6 kolom) untuk PT di generate_fixture_rows().
+
+    Sebagian nama ditulis dengan variasi seperti di data asli (huruf kapital, singkatan "Univ.",
+    akronim dalam kurung) dan sebagian PT punya SK lama tambahan, untuk menguji join per nama.
+    '''
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        name = f"Universitas Fiktif {i + 1}"
+        variant = i % 10
+        if variant == 3:
+            name = name.upper()
+        elif variant == 5:
+            name = f"Univ. Fiktif {i + 1}"
+        elif variant == 7:
+            name = f"{name} (UF{i + 1})"
+        tahun_sk = rng.randint(2016, 2024)
+        wilayah = f"Wilayah {rng.randint(1, 16)}"
+        for tahun in ([tahun_sk - 5, tahun_sk] if i % 8 == 0 else [tahun_sk]):
+            kedaluwarsa = date(tahun + 5, rng.randint(1, 12), rng.randint(1, 28))
+            rows.append([
+                name,
+                rng.choice(FIXTURE_PERINGKAT),
+                f"{100 + len(rows)}/SK/BAN-PT/Ak/PT/{tahun}",
+                str(tahun),
+                wilayah,
+                kedaluwarsa.isoformat(),
+            ])
+    return rows
+
+def render_page_html(directory='prodi', assets_url=DEFAULT_ASSETS_URL, json_path=None):
+    '''Merender PAGE_TEMPLATE untuk direktori fixture dengan endpoint JSON json_path.'''
+    config = FIXTURE_DIRECTORIES[directory]
+    return PAGE_TEMPLATE.format(assets=assets_url, json_path=json_path or config['json_path'],
+                                title=config['title'],
+                                headers=''.join(f"<th>{header}</th>" for header in config['headers']),
+                                status_column=len(config['headers']), expiry_column=config['expiry_column'])
+
+def load_fixture_rows(path):
+    '''Membaca rekaman JSON: list baris atau payload DataTables dengan kunci "data".'''
+    with open(path, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    return payload if isinstance(payload, list) else payload.get('data', [])
+
+def _cell_text(value):
+    return "" if value is None else str(value)
+
+def query_fixture_rows(rows, params):
+    '''Menerapkan search, column search, order dan paging DataTables server-side ke baris fixture.'''
+    search = params.get('search[value]', '').lower()
+    column_searches = {}
+    for key, value in params.items():
+        if key.startswith('columns[') and key.endswith('][search][value]') and value:
+            column_searches[int(key[len('columns['):key.index(']')])] = value.lower()
+
+    filtered = rows
+    if search:
+        filtered = [row for row in filtered if any(search in _cell_text(cell).lower() for cell in row)]
+    for column, value in column_searches.items():
+        filtered = [row for row in filtered if column < len(row) and value in _cell_text(row[column]).lower()]
+
+    order_column = params.get('order[0][column]')
+    if order_column is not None and int(order_column) < len(rows[0] if rows else []):
+        column = int(order_column)
+        filtered = sorted(filtered, key=lambda row: _cell_text(row[column]),
+                          reverse=params.get('order[0][dir]') == 'desc')
+
+    start = int(params.get('start', 0))
+    length = int(params.get('length', 10))
+    page = filtered[start:] if length < 0 else filtered[start:start + length]
+    return {
+        'draw': int(params.get('draw', 1)),
+        'recordsTotal': len(rows),
+        'recordsFiltered': len(filtered),
+        'data': page,
+    }
+
+def render_table_html(rows, today=None, directory='prodi'):
+    '''Merender baris fixture sebagai outerHTML #table seperti hasil draw DataTables (untuk benchmark parser).'''
+    today = (today or date.today()).isoformat()
+    expiry_column = FIXTURE_DIRECTORIES[directory]['expiry_column']
+    body = []
+    for i, row in enumerate(rows):
+        # Sama dengan render kolom status di PAGE_TEMPLATE
+        status = 'Kedaluwarsa' if _cell_text(row[expiry_column]) < today else 'Masih Berlaku'
+        # DataTables memasukkan data sel sebagai innerHTML, jadi tidak di-escape
+        cells = ''.join(f"<td>{_cell_text(value)}</td>" for value in row)
+        body.append(f'<tr role="row" class="{"odd" if i % 2 == 0 else "even"}">{cells}<td>{status}</td></tr>')
+    if not rows:
+        colspan = len(FIXTURE_DIRECTORIES[directory]['headers']) + 1
+        body.append(f'<tr class="odd"><td valign="top" colspan="{colspan}" class="dataTables_empty">'
+                    'No data available in table</td></tr>')
+    page_html = render_page_html(directory)
+    table_start = page_html.index('<table id="table"')
+    table_html = page_html[table_start:page_html.index('</table>') + len('</table>')]
+    return table_html.replace('<tbody></tbody>', f"<tbody>{''.join(body)}</tbody>")
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    '''Handler HTTP fixture; konfigurasi dibaca dari atribut server.'''
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, content_type, body, headers=None):
+        if 'gzip' in self.headers.get('Accept-Encoding', '') and len(body) > 1024:
+            body = gzip.compress(body)
+            headers = dict(headers or {}, **{'Content-Encoding': 'gzip'})
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, params):
+        path = urlparse(self.path).path
+        if self.server.latency:
+            time.sleep(self.server.latency + random.uniform(0, self.server.jitter))
+
+        with self.server.stats_lock:
+            self.server.request_counts[path] = self.server.request_counts.get(path, 0) + 1
+
+        if path == self.server.page_path:
+            self._send(200, 'text/html; charset=utf-8', self.server.page_html.encode('utf-8'))
+        elif path.startswith(ASSETS_PATH + '/'):
+            self._send_asset(path[len(ASSETS_PATH) + 1:])
+        elif path == self.server.json_path:
+            if self.server.error_rate and random.random() < self.server.error_rate:
+                # Simulasi server yang membatasi laju request
+                self._send(429, 'text/plain', b'Too Many Requests', {'Retry-After': '1'})
+                return
+            payload = query_fixture_rows(self.server.rows, params)
+            self._send(200, 'application/json', json.dumps(payload).encode('utf-8'))
+        else:
+            self._send(404, 'text/plain', b'Not Found')
+
+    def _send_asset(self, relative_path):
+        # Hanya file di dalam ASSETS_DIR yang disajikan (tolak path seperti ../scraper.py)
+        asset_path = os.path.realpath(os.path.join(ASSETS_DIR, relative_path))
+        if not asset_path.startswith(os.path.realpath(ASSETS_DIR) + os.sep) or not os.path.isfile(asset_path):
+            self._send(404, 'text/plain', b'Not Found')
+            return
+        with open(asset_path, 'rb') as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(asset_path)[0] or 'application/octet-stream'
+        self._send(200, content_type, body, {'Cache-Control': 'max-age=86400'})
+
+    def do_GET(self):
+        self._handle(dict(parse_qsl(urlparse(self.path).query, keep_blank_values=True)))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length).decode('utf-8')
+        self._handle(dict(parse_qsl(body, keep_blank_values=True)))
+
+def start_fixture_server(rows=None, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                         page_html=None, assets_url=DEFAULT_ASSETS_URL, json_path=None, verbose=False,
+                         error_rate=0.0, directory='prodi'):
+    '''Menjalankan server fixture di thread latar; mengembalikan (server, base_url).
+
+    directory memilih path halaman, endpoint JSON default dan kolom tabel (lihat FIXTURE_DIRECTORIES).
+    '''
+    config = FIXTURE_DIRECTORIES[directory]
+    if rows is None:
+        rows = generate_fixture_rows(33552) if directory == 'prodi' else generate_fixture_institution_rows(2237)
+    server = ThreadingHTTPServer((host, port), FixtureRequestHandler)
+    server.daemon_threads = True
+    server.rows = rows
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.page_path = config['page_path']
+    server.json_path = json_path or config['json_path']
+    server.page_html = page_html or render_page_html(directory, assets_url, server.json_path)
+    server.verbose = verbose
+    server.request_counts = {}
+    server.stats_lock = threading.Lock()
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    return server, base_url
+
+def record_fixture(output_path, endpoint_cache_path, page_size=1000):
+    '''Merekam seluruh baris dari endpoint AJAX asli ke file JSON untuk replay.'''
+    import scraper
+
+    endpoint = scraper.load_ajax_endpoint(endpoint_cache_path)
+    if not endpoint:
+        raise RuntimeError(f"Endpoint tersimpan '{endpoint_cache_path}' tidak ditemukan, jalankan scraper mode http dahulu")
+
+    rows = []
+    start = 0
+    while True:
+        json_rows, total = scraper.fetch_datatables_page(endpoint, start, page_size, draw=start // page_size + 1)
+        rows.extend(json_rows)
+        start += page_size
+        print(f"    Direkam {len(rows)} dari {total} baris...")
+        if not json_rows or start >= total:
+            break
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({'recorded_at': datetime.now().isoformat(), 'data': rows}, f, ensure_ascii=False)
+    print(f"💾 {len(rows)} baris direkam ke '{output_path}'")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Server fixture lokal pengganti banpt.or.id")
+    subparsers = parser.add_subparsers(dest='command')
+
+    serve_parser = subparsers.add_parser('serve', help="Jalankan server fixture (default)")
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--directory', choices=list(FIXTURE_DIRECTORIES), default='prodi',
+                              help="Direktori yang disajikan (default: prodi)")
+    serve_parser.add_argument('--rows', type=int, default=None,
+                              help="Jumlah baris (prodi) atau PT (institusi) sintetis jika --data tidak diisi")
+    serve_parser.add_argument('--data', default=None, help="File JSON rekaman baris DataTables")
+    serve_parser.add_argument('--page', default=None,
+                              help="File HTML rekaman pencarian_prodi.php/pencarian_institusi.php")
+    serve_parser.add_argument('--latency', type=float, default=0.0, help="Latensi buatan per request (detik)")
+    serve_parser.add_argument('--jitter', type=float, default=0.0, help="Tambahan latensi acak maksimum (detik)")
+    serve_parser.add_argument('--error-rate', type=float, default=0.0,
+                              help="Peluang endpoint JSON membalas 429 (untuk menguji backoff)")
+    serve_parser.add_argument('--assets-url', default=DEFAULT_ASSETS_URL, help=f"Base URL jQuery/DataTables (default: salinan lokal fixture_assets/ di {ASSETS_PATH})")
+    serve_parser.add_argument('--verbose', action='store_true')
+
+    record_parser = subparsers.add_parser('record', help="Rekam data dari endpoint AJAX asli")
+    record_parser.add_argument('--output', default="fixture_prodi.json")
+    record_parser.add_argument('--endpoint-cache', default="banpt_ajax_endpoint.json")
+    record_parser.add_argument('--page-size', type=int, default=1000)
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record_fixture(args.output, args.endpoint_cache, args.page_size)
+    else:
+        if args.command is None:
+            args = serve_parser.parse_args([])
+        page_html = None
+        if args.page:
+            with open(args.page, 'r', encoding='utf-8') as f:
+                page_html = f.read()
+        if args.data:
+            rows = load_fixture_rows(args.data)
+        elif args.directory == 'institusi':
+            rows = generate_fixture_institution_rows(args.rows or 2237)
+        else:
+            rows = generate_fixture_rows(args.rows or 33552)
+        server, base_url = start_fixture_server(rows, port=args.port, latency=args.latency, jitter=args.jitter,
+                                                page_html=page_html, assets_url=args.assets_url, verbose=args.verbose,
+                                                error_rate=args.error_rate, directory=args.directory)
+        print(f"Server fixture berjalan di {base_url}{server.page_path} ({len(rows)} baris, latensi {args.latency}s)")
+        print(f"Endpoint JSON: {base_url}{server.json_path}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            print("\nServer fixture dihentikan.")
+            server.shutdown()
@@ -1,27 +1,544 @@
 '''
-Script untuk melakukan scraping data akreditasi program studi dari website BANPT
+Script untuk melakukan scraping data akreditasi program studi dan perguruan tinggi dari website BANPT
 menggunakan Selenium untuk menangani DataTables yang menggunakan AJAX loading.
+
+Penggunaan:
+    python -m scraper scrape --engine http --filter strata=S2 -o s2.csv
+    python -m scraper resume -o banpt_akreditasi_prodi.csv
+    python -m scraper diff --db banpt_akreditasi_prodi.sqlite -o delta.jsonl
+    python -m scraper scrape --engine selenium --snapshot-dir snapshots/
+    python -m scraper parse snapshots/ -o dari_arsip.csv
+    python -m scraper scrape --directory institusi
+    python -m scraper join banpt_akreditasi_prodi.csv banpt_akreditasi_institusi.csv
+    python -m scraper bench crawl --engines http
+atau dari Python lewat kelas Scraper.
 '''
+import argparse
 import csv
+import math
+import sys
+import gzip
+import http.client
+import os
+import re
+import sqlite3
 import time
 import json
-from datetime import datetime
+import zlib
+import hashlib
+import html
+import importlib.util
+import io
+import queue
+import threading
+import unicodedata
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache, partial, total_ordering, wraps
+from html.parser import HTMLParser
+from itertools import count, islice, product, repeat
+from urllib.parse import urlencode, urljoin, urlsplit
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException, WebDriverException
+try:
+    import brotli  # Opsional: dekompresi respons Content-Encoding: br
+except ImportError:
+    brotli = None
 
-from bs4 import BeautifulSoup
+# Selenium diimpor secara lazy di dalam fungsi agar HttpEngine tidak perlu memuat paket browser
 
 # Common User-Agent string to mimic a real browser
 COMMON_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36"
 
+BANPT_PRODI_URL = "https://www.banpt.or.id/direktori/prodi/pencarian_prodi.php"
+BANPT_INSTITUSI_URL = "https://www.banpt.or.id/direktori/institusi/pencarian_institusi.php"
+
+# Urutan 8 kolom data aktual pada tabel #table
+PRODI_COLUMNS = [
+    'perguruan_tinggi',
+    'program_studi',
+    'strata',
+    'wilayah',
+    'no_sk',
+    'tahun_sk',
+    'peringkat',
+    'tanggal_kedaluwarsa',
+]
+
+# Urutan kolom output standar
+ROW_FIELDNAMES = PRODI_COLUMNS + ['status_kedaluwarsa', 'scraped_at']
+
+# Kolom bernilai berulang yang disimpan sebagai kode kamus (dictionary encoding) di RecordBatch
+CATEGORICAL_FIELDS = ('perguruan_tinggi', 'program_studi', 'strata', 'wilayah', 'tahun_sk', 'peringkat',
+                      'tanggal_kedaluwarsa', 'status_kedaluwarsa', 'scraped_at')
+
+# Kolom yang mengidentifikasi satu baris akreditasi secara unik
+ROW_KEY_FIELDS = ('perguruan_tinggi', 'program_studi', 'strata', 'no_sk')
+
+# Urutan kolom data tabel direktori akreditasi institusi (nama kolom sama dengan prodi agar
+# normalisasi dan join bisa dipakai bersama)
+INSTITUSI_COLUMNS = [
+    'perguruan_tinggi',
+    'peringkat',
+    'no_sk',
+    'tahun_sk',
+    'wilayah',
+    'tanggal_kedaluwarsa',
+]
+
+class DirectorySchema:
+    '''Deskripsi deklaratif satu direktori DataTables BAN-PT: URL, id tabel dan peta kolom.
+
+    columns adalah nama field untuk kolom data sesuai urutan tabel (juga urutan array JSON
+    endpoint), rendered_fields kolom yang hanya ada sebagai hasil render DataTables, dan
+    key_fields kolom yang mengidentifikasi satu baris secara unik (dedup dan rekonsiliasi).
+    table_id adalah id elemen <table> DataTables; elemen pendampingnya (info, tombol Next,
+    dropdown panjang halaman) mengikuti penamaan DataTables <table_id>_info dan seterusnya.
+    '''
+    
+    def __init__(self, name, url, columns, key_fields, table_id='table', rendered_fields=('status_kedaluwarsa',),
+                 label=None, endpoint_cache_filename=None):
+        self.name = name
+        self.url = url
+        self.columns = list(columns)
+        self.key_fields = tuple(key_fields)
+        self.table_id = table_id
+        self.rendered_fields = list(rendered_fields)
+        self.label = label or name
+        self.fieldnames = self.columns + self.rendered_fields + ['scraped_at']
+        # Jumlah kolom tabel yang ditampilkan (data + hasil render), tanpa scraped_at
+        self.width = len(self.columns) + len(self.rendered_fields)
+        self.output_filename = f"banpt_akreditasi_{name}.csv"
+        self.endpoint_cache_filename = endpoint_cache_filename or f"banpt_ajax_endpoint_{name}.json"
+    
+    def column_index(self, name):
+        '''Indeks kolom tabel untuk field name (ValueError jika bukan kolom data direktori ini).'''
+        if name not in self.columns:
+            raise ValueError(f"Kolom tidak dikenal di direktori {self.name}: {name} "
+                             f"(pilihan: {', '.join(self.columns)})")
+        return self.columns.index(name)
+    
+    def __repr__(self):
+        return f"DirectorySchema({self.name!r})"
+
+PRODI_DIRECTORY = DirectorySchema('prodi', BANPT_PRODI_URL, PRODI_COLUMNS, ROW_KEY_FIELDS, label="program studi",
+                                  endpoint_cache_filename="banpt_ajax_endpoint.json")
+INSTITUSI_DIRECTORY = DirectorySchema('institusi', BANPT_INSTITUSI_URL, INSTITUSI_COLUMNS,
+                                      ('perguruan_tinggi', 'no_sk'), label="perguruan tinggi")
+
+DIRECTORIES = {directory.name: directory for directory in (PRODI_DIRECTORY, INSTITUSI_DIRECTORY)}
+
+def get_directory(directory=None):
+    '''DirectorySchema dari nama atau objeknya; None berarti direktori prodi.'''
+    if directory is None:
+        return PRODI_DIRECTORY
+    if isinstance(directory, DirectorySchema):
+        return directory
+    if directory not in DIRECTORIES:
+        raise ValueError(f"Direktori tidak dikenal: {directory} (pilihan: {', '.join(DIRECTORIES)})")
+    return DIRECTORIES[directory]
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+def clean_cell_text(value):
+    '''Membersihkan nilai sel dari JSON DataTables (tag HTML, entity, spasi).'''
+    if value is None:
+        return ""
+    text = _HTML_TAG_RE.sub('', str(value))
+    return html.unescape(text).strip()
+
+def build_row_data(cell_texts, scraped_at=None, directory=None):
+    '''Memetakan daftar teks sel ke dict baris dengan skema direktori (default prodi).'''
+    # Kolom data diikuti kolom hasil render JavaScript DataTables (mis. Status Kedaluwarsa)
+    directory = get_directory(directory)
+    row_data = {}
+    for i, column in enumerate(directory.columns + directory.rendered_fields):
+        row_data[column] = cell_texts[i] if len(cell_texts) > i else ""
+    row_data['scraped_at'] = scraped_at or datetime.now().isoformat()
+    return row_data
+
+class RecordBatch:
+    '''Kumpulan baris dalam bentuk kolumnar.
+
+    Kolom CATEGORICAL_FIELDS disimpan sebagai array kode int32 ke kamus nilai unik (string
+    di-intern), kolom lain sebagai list string. scraped_at ikut di-encode sehingga satu halaman
+    hanya menyimpan satu timestamp. Iterasi tetap menghasilkan dict baris untuk konsumen lama.
+    Setelah normalize_batch, kamus kolom NORMALIZED_FIELD_TYPES berisi nilai bertipe.
+    skipped_rows mencatat baris tabel yang dilewati saat ekstraksi karena data utamanya kosong.
+    '''
+    
+    def __init__(self, fieldnames=None):
+        self.fieldnames = list(fieldnames or ROW_FIELDNAMES)
+        self.normalized = False
+        self.skipped_rows = 0
+        self._columns = {}
+        self._dictionaries = {}
+        self._lookups = {}
+        self._length = 0
+        for name in self.fieldnames:
+            if name in CATEGORICAL_FIELDS:
+                self._columns[name] = array('i')
+                self._dictionaries[name] = []
+                self._lookups[name] = {}
+            else:
+                self._columns[name] = []
+    
+    @classmethod
+    def from_cells(cls, cell_rows, scraped_at=None, directory=None):
+        '''Membuat batch dari teks sel per baris (urutan kolom tabel), baris tanpa dua kolom pertama dilewati.'''
+        directory = get_directory(directory)
+        batch = cls(directory.fieldnames)
+        scraped_at = scraped_at or datetime.now().isoformat()
+        # Kolom hasil render (mis. Status Kedaluwarsa) hanya ada jika di-render JavaScript DataTables
+        width = directory.width
+        for cell_texts in cell_rows:
+            values = list(cell_texts[:width])
+            values.extend([""] * (width - len(values)))
+            if not (values[0] or values[1]):
+                batch.skipped_rows += 1
+                continue
+            values.append(scraped_at)
+            batch.append(values)
+        return batch
+    
+    @classmethod
+    def from_rows(cls, rows, fieldnames=None):
+        '''Membuat batch dari list dict baris; batch yang sudah kolumnar dikembalikan apa adanya.'''
+        if isinstance(rows, RecordBatch):
+            return rows
+        batch = cls(fieldnames)
+        for row in rows:
+            batch.append([row.get(name, "") for name in batch.fieldnames])
+        return batch
+    
+    @classmethod
+    def concat(cls, batches, fieldnames=None):
+        '''Menggabungkan beberapa batch (atau list dict baris) menjadi satu batch.'''
+        result = cls(fieldnames)
+        for batch in batches:
+            result.extend(batch)
+        return result
+    
+    def _encode(self, name, value):
+        lookup = self._lookups[name]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self._dictionaries[name])
+            self._dictionaries[name].append(sys.intern(value) if isinstance(value, str) else value)
+        return code
+    
+    def append(self, values):
+        '''Menambah satu baris dari nilai berurutan sesuai fieldnames.'''
+        columns = self._columns
+        lookups = self._lookups
+        for name, value in zip(self.fieldnames, values):
+            lookup = lookups.get(name)
+            if lookup is None:
+                columns[name].append(value)
+                continue
+            code = lookup.get(value)
+            columns[name].append(self._encode(name, value) if code is None else code)
+        self._length += 1
+    
+    def extend(self, other):
+        '''Menambahkan seluruh baris batch lain; kode kamusnya dipetakan ulang ke kamus batch ini.'''
+        other = RecordBatch.from_rows(other, self.fieldnames)
+        if not self._length:
+            self.normalized = other.normalized
+        for name in self.fieldnames:
+            column = self._columns[name]
+            if name in self._lookups and name in other._lookups:
+                remap = [self._encode(name, value) for value in other._dictionaries[name]]
+                column.extend(remap[code] for code in other._columns[name])
+            elif name in self._lookups:
+                column.extend(self._encode(name, value) for value in other._iter_column(name))
+            else:
+                column.extend(other._iter_column(name))
+        self._length += len(other)
+    
+    def take(self, indices):
+        '''Batch baru berisi baris pada indeks yang diberikan (kamus dipakai bersama).'''
+        batch = RecordBatch(self.fieldnames)
+        batch.normalized = self.normalized
+        indices = list(indices)
+        for name, column in self._columns.items():
+            if name in self._lookups:
+                batch._columns[name] = array('i', [column[i] for i in indices])
+                batch._dictionaries[name] = self._dictionaries[name]
+                batch._lookups[name] = self._lookups[name]
+            else:
+                batch._columns[name] = [column[i] for i in indices]
+        batch._length = len(indices)
+        return batch
+    
+    def map_categories(self, name, func):
+        '''Menerapkan func sekali per nilai unik kolom kategorikal lalu memetakan ulang kodenya.'''
+        self.derive_categories(name, name, func)
+    
+    def derive_categories(self, name, source, func):
+        '''Mengisi kolom kategorikal name dengan func(nilai kolom source), dihitung sekali per nilai unik.'''
+        dictionary = []
+        lookup = {}
+        remap = []
+        for value in self._dictionaries[source]:
+            mapped = func(value)
+            code = lookup.get(mapped)
+            if code is None:
+                code = lookup[mapped] = len(dictionary)
+                dictionary.append(mapped)
+            remap.append(code)
+        # Kamus lama bisa dipakai bersama batch hasil take(), jadi diganti bukan diubah di tempat
+        self._columns[name] = array('i', [remap[code] for code in self._columns[source]])
+        self._dictionaries[name] = dictionary
+        self._lookups[name] = lookup
+    
+    def _iter_column(self, name):
+        if name not in self._columns:
+            return repeat("", self._length)
+        if name in self._lookups:
+            return map(self._dictionaries[name].__getitem__, self._columns[name])
+        return iter(self._columns[name])
+    
+    def column(self, name):
+        '''Nilai satu kolom sebagai list string.'''
+        return list(self._iter_column(name))
+    
+    def categories(self, name):
+        '''Kamus nilai unik kolom kategorikal (urutan sesuai kode).'''
+        return list(self._dictionaries[name])
+    
+    def iter_tuples(self, fieldnames=None):
+        '''Menghasilkan tuple nilai per baris untuk kolom yang diminta tanpa membuat dict.'''
+        return zip(*[self._iter_column(name) for name in (fieldnames or self.fieldnames)])
+    
+    def __len__(self):
+        return self._length
+    
+    def __iter__(self):
+        for values in self.iter_tuples():
+            yield dict(zip(self.fieldnames, values))
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(self._length)[index])
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Indeks baris di luar jangkauan")
+        row = {}
+        for name in self.fieldnames:
+            value = self._columns[name][index]
+            row[name] = self._dictionaries[name][value] if name in self._lookups else value
+        return row
+    
+    def to_arrow(self):
+        '''Konversi ke pyarrow.Table; array kode dibungkus tanpa salin sebagai DictionaryArray.'''
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise RuntimeError("Konversi ke Arrow membutuhkan paket 'pyarrow' (pip install pyarrow)")
+        value_types = {'int': pa.int32(), 'date': pa.date32()}
+        arrays = []
+        for name in self.fieldnames:
+            if name in self._lookups:
+                dictionary = self._dictionaries[name]
+                value_type = value_types.get(NORMALIZED_FIELD_TYPES.get(name)) if self.normalized else None
+                if value_type is not None and any(isinstance(value, str) for value in dictionary):
+                    # Teks yang gagal diurai normalize_batch: kolom ditulis sebagai string
+                    value_type = None
+                if value_type is None:
+                    value_type = pa.string()
+                    dictionary = [None if value is None else str(value) for value in dictionary]
+                # Buffer array kode dipinjam langsung, batch tidak bisa di-append selama buffer dipakai
+                indices = pa.Array.from_buffers(pa.int32(), self._length, [None, pa.py_buffer(self._columns[name])])
+                arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(dictionary, value_type)))
+            else:
+                arrays.append(pa.array(self._columns[name], pa.string()))
+        return pa.Table.from_arrays(arrays, names=self.fieldnames)
+    
+    def to_pandas(self):
+        '''Konversi ke pandas.DataFrame, kolom kategorikal menjadi pd.Categorical dari kode yang sama.'''
+        try:
+            import numpy as np
+            import pandas as pd
+        except ImportError:
+            raise RuntimeError("Konversi ke pandas membutuhkan paket 'pandas' (pip install pandas)")
+        data = {}
+        for name in self.fieldnames:
+            if name in self._lookups:
+                codes = np.frombuffer(self._columns[name], dtype=np.intc)
+                categories = self._dictionaries[name]
+                if self.normalized and NORMALIZED_FIELD_TYPES.get(name) == 'peringkat':
+                    # Kategori berurutan sesuai Peringkat, nilai di luar enum menjadi NaN
+                    order = list(Peringkat)
+                    remap = np.array([order.index(value) if isinstance(value, Peringkat) else -1
+                                      for value in categories] or [-1], dtype=np.intc)
+                    data[name] = pd.Categorical.from_codes(remap[codes], categories=[str(p) for p in order],
+                                                           ordered=True)
+                    continue
+                if None in categories:
+                    # pandas tidak menerima kategori null, kode nilai None diganti -1 (NaN)
+                    null_code = categories.index(None)
+                    categories = categories[:null_code] + categories[null_code + 1:]
+                    codes = np.where(codes == null_code, -1, np.where(codes > null_code, codes - 1, codes))
+                data[name] = pd.Categorical.from_codes(codes, categories=categories)
+            else:
+                data[name] = self._columns[name]
+        return pd.DataFrame(data, columns=self.fieldnames)
+
+@total_ordering
+class Peringkat(Enum):
+    '''Peringkat akreditasi berurutan dari terendah ke tertinggi.
+
+    Peringkat lama A/B/C diletakkan tepat di bawah padanannya pada sistem IAPS 4.0
+    (Unggul/Baik Sekali/Baik) agar perbandingan tetap total.
+    '''
+    TIDAK_TERAKREDITASI = "Tidak Terakreditasi"
+    TERAKREDITASI_SEMENTARA = "Terakreditasi Sementara"
+    C = "C"
+    BAIK = "Baik"
+    B = "B"
+    BAIK_SEKALI = "Baik Sekali"
+    A = "A"
+    UNGGUL = "Unggul"
+    
+    @property
+    def rank(self):
+        return _PERINGKAT_RANKS[self]
+    
+    def __lt__(self, other):
+        if not isinstance(other, Peringkat):
+            return NotImplemented
+        return self.rank < other.rank
+    
+    def __str__(self):
+        return self.value
+    
+    @classmethod
+    def parse(cls, value):
+        '''Peringkat dari teks tampilan (tidak peka huruf/spasi); teks tak dikenal dikembalikan apa adanya.'''
+        if isinstance(value, Peringkat) or not value:
+            return value
+        text = ' '.join(str(value).split())
+        return _PERINGKAT_ALIASES.get(text.lower(), text)
+
+_PERINGKAT_RANKS = {member: rank for rank, member in enumerate(Peringkat)}
+_PERINGKAT_ALIASES = {member.value.lower(): member for member in Peringkat}
+_PERINGKAT_ALIASES.update({
+    'terakreditasi a': Peringkat.A,
+    'terakreditasi b': Peringkat.B,
+    'terakreditasi c': Peringkat.C,
+    'baik sekali (b)': Peringkat.BAIK_SEKALI,
+})
+
+# Tipe nilai kolom setelah normalize_batch (kolom lain tetap string tampilan)
+NORMALIZED_FIELD_TYPES = {'tahun_sk': 'int', 'tanggal_kedaluwarsa': 'date', 'peringkat': 'peringkat'}
+
+STATUS_MASIH_BERLAKU = "Masih Berlaku"
+STATUS_KEDALUWARSA = "Kedaluwarsa"
+
+_BULAN = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'mei': 5, 'may': 5, 'jun': 6, 'jul': 7,
+    'agu': 8, 'agt': 8, 'aug': 8, 'sep': 9, 'okt': 10, 'oct': 10, 'nov': 11, 'des': 12, 'dec': 12,
+}
+_DATE_ISO_RE = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})')
+_DATE_DMY_RE = re.compile(r'^(\d{1,2})[-/.](\d{1,2})[-/.](\d{4})$')
+_DATE_TEXT_RE = re.compile(r'^(\d{1,2})\s+([A-Za-z]+)\.?\s+(\d{4})$')
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+
+def parse_date_text(value):
+    '''Mengurai tanggal tampilan (ISO, DD-MM-YYYY, DD/MM/YYYY, "24 Januari 2021") menjadi date; None jika gagal.'''
+    if isinstance(value, date) or not value:
+        return value or None
+    text = value.strip()
+    try:
+        match = _DATE_ISO_RE.match(text)
+        if match:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+        match = _DATE_DMY_RE.match(text)
+        if match:
+            return date(int(match.group(3)), int(match.group(2)), int(match.group(1)))
+        match = _DATE_TEXT_RE.match(text)
+        if match and match.group(2)[:3].lower() in _BULAN:
+            return date(int(match.group(3)), _BULAN[match.group(2)[:3].lower()], int(match.group(1)))
+    except ValueError:
+        pass
+    return None
+
+def parse_year(value):
+    '''Tahun SK sebagai int (angka empat digit pertama pada teks); None jika tidak ada.'''
+    if isinstance(value, int) or not value:
+        return value or None
+    match = _YEAR_RE.search(value)
+    return int(match.group(0)) if match else None
+
+def parse_or_keep(parser, value):
+    '''parser(value), atau value apa adanya jika teks tidak kosong gagal diurai (seperti Peringkat.parse).'''
+    parsed = parser(value)
+    return value if parsed is None and value else parsed
+
+def expiry_status(expiry_date, today):
+    '''Status kedaluwarsa dihitung lokal dari tanggal kedaluwarsa (sama dengan render kolom di situs).'''
+    if not isinstance(expiry_date, date):
+        # Tanggal kosong atau teks yang gagal diurai
+        return ""
+    return STATUS_KEDALUWARSA if expiry_date < today else STATUS_MASIH_BERLAKU
+
+def format_cell_value(value):
+    '''Teks output sebuah nilai sel bertipe (date ke ISO, None ke string kosong).'''
+    if value is None:
+        return ""
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+def normalize_batch(batch, today=None):
+    '''Mengubah kolom tampilan menjadi nilai bertipe, tiap nilai unik hanya diurai sekali.
+
+    tahun_sk menjadi int, tanggal_kedaluwarsa menjadi date, peringkat menjadi Peringkat dan
+    status_kedaluwarsa dihitung ulang dari tanggal_kedaluwarsa terhadap today (default hari ini).
+    Teks yang gagal diurai disimpan apa adanya dan jumlah barisnya dihitung di counter
+    RUN_METRICS parse_failures_<kolom>.
+    '''
+    batch = RecordBatch.from_rows(batch)
+    if batch.normalized:
+        return batch
+    today = today or date.today()
+    for name, parser in (('tahun_sk', parse_year), ('tanggal_kedaluwarsa', parse_date_text)):
+        failed = set()
+        
+        def parse(value, parser=parser, failed=failed):
+            parsed = parser(value)
+            if parsed is None and value:
+                failed.add(value)
+                return value
+            return parsed
+        
+        batch.map_categories(name, parse)
+        if failed:
+            RUN_METRICS.incr(f'parse_failures_{name}', sum(1 for value in batch.column(name) if value in failed))
+    batch.map_categories('peringkat', Peringkat.parse)
+    batch.derive_categories('status_kedaluwarsa', 'tanggal_kedaluwarsa', lambda value: expiry_status(value, today))
+    batch.normalized = True
+    return batch
+
+def iter_normalized_pages(pages, today=None):
+    '''Menormalisasi setiap halaman dari generator sebelum diteruskan ke writer atau indeks.'''
+    try:
+        for page_data in pages:
+            yield normalize_batch(page_data, today)
+    finally:
+        if hasattr(pages, 'close'):
+            pages.close()
+
 def setup_driver(webdriver_executable_path, headless=False):
     '''Inisialisasi Selenium WebDriver.'''
     try:
+        from selenium import webdriver
+        
         # Setup Chrome options
         options = webdriver.ChromeOptions()
         options.add_argument(f"user-agent={COMMON_USER_AGENT}")
@@ -44,73 +561,381 @@ def setup_driver(webdriver_executable_path, headless=False):
             driver = webdriver.Chrome(options=options)
         
         print("ChromeDriver berhasil diinisialisasi.")
-        return driver
+        return instrument_driver(driver)
     except Exception as e:
         print(f"Error saat inisialisasi ChromeDriver: {e}")
         print("Pastikan ChromeDriver sudah terinstal dan path-nya benar atau ada di PATH sistem.")
         return None
 
-def wait_for_table_data(driver, max_retries=3):
+# Batas atas bucket histogram waktu tunggu (detik)
+WAIT_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 20]
+
+class WaitHistogram:
+    '''Histogram durasi tunggu per jenis operasi untuk ringkasan run.'''
+    
+    def __init__(self, buckets=None):
+        self.buckets = list(buckets or WAIT_BUCKETS)
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(self.buckets) + 1)
+            self.total_seconds = 0.0
+            self.timeouts = 0
+            self.by_label = {}
+    
+    def record(self, label, seconds, timed_out=False):
+        with self._lock:
+            self._record(label, seconds, timed_out)
+    
+    def _record(self, label, seconds, timed_out):
+        index = len(self.buckets)
+        for i, upper in enumerate(self.buckets):
+            if seconds <= upper:
+                index = i
+                break
+        self.counts[index] += 1
+        self.total_seconds += seconds
+        if timed_out:
+            self.timeouts += 1
+        count, total = self.by_label.get(label, (0, 0.0))
+        self.by_label[label] = (count + 1, total + seconds)
+    
+    def report(self):
+        '''Isi histogram sebagai dict untuk laporan run JSON.'''
+        with self._lock:
+            return {
+                'buckets': self.buckets,
+                'counts': list(self.counts),
+                'total_seconds': self.total_seconds,
+                'timeouts': self.timeouts,
+                'by_label': {label: {'count': count, 'total_seconds': total}
+                             for label, (count, total) in self.by_label.items()},
+            }
+    
+    def print_summary(self):
+        waits = sum(self.counts)
+        if not waits:
+            return
+        print(f"⏳ Waktu tunggu: {waits} kali, total {self.total_seconds:.1f} detik, {self.timeouts} timeout")
+        lower = 0
+        for i, count in enumerate(self.counts):
+            label = f"{lower}-{self.buckets[i]}s" if i < len(self.buckets) else f">{self.buckets[-1]}s"
+            if i < len(self.buckets):
+                lower = self.buckets[i]
+            bar = '#' * max(1, round(40 * count / waits)) if count else ''
+            print(f"    {label:>10} {count:5d} {bar}")
+        for label, (count, total) in sorted(self.by_label.items()):
+            print(f"    {label}: {count} kali, rata-rata {total / count:.2f} detik")
+
+WAIT_HISTOGRAM = WaitHistogram()
+
+def format_duration(seconds):
+    '''Durasi ringkas untuk log, mis. "45d", "3m 12d" atau "1j 05m".'''
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}d"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}d"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}j {minutes:02d}m"
+
+class RunMetrics:
+    '''Span bernama (durasi per tahap) dan counter untuk satu run scraping, aman dipakai antar thread.
+
+    Span bisa bersarang (mis. paginate mencakup wait), jadi totalnya tidak untuk dijumlahkan.
+    '''
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now().isoformat()
+            self._started = time.perf_counter()
+            self.spans = {}
+            self.counters = {}
+    
+    @contextmanager
+    def span(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+    
+    def observe(self, name, seconds):
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                self.spans[name] = {'count': 1, 'total_seconds': seconds, 'min_seconds': seconds,
+                                    'max_seconds': seconds}
+                return
+            stats['count'] += 1
+            stats['total_seconds'] += seconds
+            stats['min_seconds'] = min(stats['min_seconds'], seconds)
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+    
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def elapsed(self):
+        return time.perf_counter() - self._started
+    
+    def print_progress(self, rows, page=None, total_pages=None, pages_done=None):
+        '''Baris progres: halaman, baris, baris/detik dan ETA dari kecepatan aktual run ini.'''
+        elapsed = self.elapsed()
+        parts = []
+        if page is not None and total_pages:
+            parts.append(f"halaman {page}/{total_pages} ({100 * page / total_pages:.1f}%)")
+        parts.append(f"{rows} baris")
+        parts.append(f"{rows / elapsed if elapsed else 0.0:.1f} baris/detik")
+        if page is not None and total_pages and pages_done:
+            parts.append(f"ETA {format_duration(elapsed / pages_done * max(0, total_pages - page))}")
+        print(f"    ⏱️  Progres: {', '.join(parts)}")
+    
+    def report(self):
+        '''Ringkasan span dan counter sebagai dict untuk laporan run JSON.'''
+        with self._lock:
+            elapsed = self.elapsed()
+            spans = {}
+            for name, stats in self.spans.items():
+                spans[name] = dict(stats, mean_seconds=stats['total_seconds'] / stats['count'])
+            rows = self.counters.get('rows', 0)
+            return {
+                'started_at': self.started_at,
+                'elapsed_seconds': elapsed,
+                'rows_per_second': rows / elapsed if elapsed else 0.0,
+                'counters': dict(self.counters),
+                'spans': spans,
+            }
+    
+    def print_summary(self):
+        report = self.report()
+        print(f"📈 Run {format_duration(report['elapsed_seconds'])}, {report['rows_per_second']:.1f} baris/detik")
+        for name, stats in sorted(report['spans'].items()):
+            print(f"    {name}: {stats['count']} kali, total {stats['total_seconds']:.2f} detik, "
+                  f"rata-rata {stats['mean_seconds']:.3f} detik, maks {stats['max_seconds']:.2f} detik")
+        if report['counters']:
+            print("    " + ", ".join(f"{name}={value}" for name, value in sorted(report['counters'].items())))
+
+RUN_METRICS = RunMetrics()
+
+def reset_run_metrics():
+    '''Mengosongkan RUN_METRICS dan WAIT_HISTOGRAM agar laporan run berikutnya hanya berisi run itu sendiri.'''
+    RUN_METRICS.reset()
+    WAIT_HISTOGRAM.reset()
+
+def spanned(name):
+    '''Decorator: mencatat setiap pemanggilan fungsi sebagai span name di RUN_METRICS.'''
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with RUN_METRICS.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def instrument_driver(driver):
+    '''Menghitung setiap round-trip WebDriver (termasuk dari WebElement) ke counter webdriver_calls.'''
+    original_execute = driver.execute
+    
+    def counting_execute(driver_command, params=None):
+        RUN_METRICS.incr('webdriver_calls')
+        return original_execute(driver_command, params)
+    
+    driver.execute = counting_execute
+    return driver
+
+@contextmanager
+def profile_run(profiler=None, output_path=None):
+    '''Menjalankan blok dengan profiler opsional: 'cprofile' (stdlib, thread utama) atau 'pyinstrument'.'''
+    if not profiler:
+        yield
+        return
+    if profiler == 'cprofile':
+        import cProfile
+        import pstats
+        
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            output_path = output_path or "scraper.prof"
+            profile.dump_stats(output_path)
+            print(f"🔬 Profil cProfile disimpan ke '{output_path}' (buka dengan python -m pstats atau snakeviz)")
+            pstats.Stats(profile).sort_stats('cumulative').print_stats(15)
+    elif profiler == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise RuntimeError("Profiler pyinstrument membutuhkan paket 'pyinstrument' (pip install pyinstrument)")
+        profile = Profiler()
+        profile.start()
+        try:
+            yield
+        finally:
+            profile.stop()
+            output_path = output_path or "scraper-profile.html"
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(profile.output_html())
+            print(f"🔬 Profil pyinstrument disimpan ke '{output_path}'")
+    else:
+        raise ValueError(f"Profiler tidak dikenal: {profiler} (pilihan: cprofile, pyinstrument)")
+
+# Pasang listener draw.dt/xhr.dt sekali per halaman dan kembalikan status tabel (arguments[0] = id tabel)
+TABLE_DRAW_STATE_JS = """
+    var tableId = arguments[0];
+    if (!window.__dtWaitState) {
+        window.__dtWaitState = {draws: 0, xhrs: 0};
+        if (typeof $ !== 'undefined' && $.fn.dataTable) {
+            $('#' + tableId).on('draw.dt', function() { window.__dtWaitState.draws++; });
+            $('#' + tableId).on('xhr.dt', function() { window.__dtWaitState.xhrs++; });
+        }
+    }
+    var processing = document.getElementById(tableId + '_processing');
+    var busy = !!processing && window.getComputedStyle(processing).display !== 'none'
+        && window.getComputedStyle(processing).visibility !== 'hidden';
+    var info = document.getElementById(tableId + '_info');
+    var table = document.getElementById(tableId);
+    var tbody = table ? table.querySelector('tbody') : null;
+    return {
+        draws: window.__dtWaitState.draws,
+        xhrs: window.__dtWaitState.xhrs,
+        busy: busy,
+        info: info ? info.textContent : '',
+        rows: tbody ? tbody.querySelectorAll('tr').length : 0,
+        empty: !tbody || tbody.textContent.indexOf('No data available in table') !== -1
+    };
+"""
+
+def get_table_draw_state(driver, table_id='table'):
+    '''Mengambil status draw DataTables tabel table_id (sekaligus memasang listener event).'''
+    return driver.execute_script(TABLE_DRAW_STATE_JS, table_id)
+
+@spanned('wait')
+def wait_for_table_draw(driver, previous_state, timeout=20, label="draw", table_id='table'):
+    '''Menunggu draw.dt berikutnya atau perubahan #table_info, dengan timeout sebagai batas atas.'''
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+    
+    started = time.perf_counter()
+    
+    def table_redrawn(d):
+        state = get_table_draw_state(d, table_id)
+        if state['busy']:
+            return False
+        if state['draws'] > previous_state['draws'] or state['info'] != previous_state['info']:
+            return state
+        return False
+    
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(table_redrawn)
+        WAIT_HISTOGRAM.record(label, time.perf_counter() - started)
+        return True
+    except TimeoutException:
+        WAIT_HISTOGRAM.record(label, time.perf_counter() - started, timed_out=True)
+        print(f"    Warning: Tabel tidak di-draw ulang dalam {timeout} detik ({label})")
+        return False
+
+@spanned('wait')
+def wait_for_table_ready(driver, timeout=20, label="load", table_id='table'):
+    '''Menunggu tbody berisi data dan indikator #table_processing tersembunyi.'''
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+    
+    started = time.perf_counter()
+    
+    def table_ready(d):
+        state = get_table_draw_state(d, table_id)
+        return state if state['rows'] > 0 and not state['busy'] and not state['empty'] else False
+    
+    try:
+        state = WebDriverWait(driver, timeout, poll_frequency=0.1).until(table_ready)
+        WAIT_HISTOGRAM.record(label, time.perf_counter() - started)
+        return state
+    except TimeoutException:
+        WAIT_HISTOGRAM.record(label, time.perf_counter() - started, timed_out=True)
+        return None
+
+def wait_for_table_data(driver, max_retries=3, timeout=20, table_id='table'):
     '''Menunggu data tabel dimuat dan retry jika perlu.'''
-    wait = WebDriverWait(driver, 20)
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    
+    wait = WebDriverWait(driver, timeout)
     
     for attempt in range(max_retries):
         try:
             print(f"    Percobaan {attempt + 1}: Menunggu tabel data dimuat...")
             
             # Tunggu tabel muncul
-            table = wait.until(EC.presence_of_element_located((By.ID, "table")))
+            wait.until(EC.presence_of_element_located((By.ID, table_id)))
             
-            # Tunggu sebentar agar AJAX selesai loading
-            time.sleep(3)
+            # Tunggu AJAX selesai: baris terisi dan indikator processing hilang
+            state = wait_for_table_ready(driver, timeout=timeout, table_id=table_id)
             
-            # Cek apakah ada data di dalam tbody
-            tbody = table.find_element(By.TAG_NAME, "tbody")
-            rows = tbody.find_elements(By.TAG_NAME, "tr")
-            
-            if len(rows) > 0 and "No data available in table" not in tbody.text:
-                print(f"    Berhasil! Ditemukan {len(rows)} baris data.")
+            if state:
+                print(f"    Berhasil! Ditemukan {state['rows']} baris data.")
                 return True
             else:
                 print(f"    Percobaan {attempt + 1}: Tabel kosong atau belum dimuat. Refresh halaman...")
+                RUN_METRICS.incr('retries')
+                RUN_METRICS.incr('refreshes')
                 driver.refresh()
-                time.sleep(5)
                 
         except Exception as e:
             print(f"    Percobaan {attempt + 1} gagal: {e}")
+            RUN_METRICS.incr('retries')
             if attempt < max_retries - 1:
+                RUN_METRICS.incr('refreshes')
                 driver.refresh()
-                time.sleep(5)
     
     print("    Gagal memuat data tabel setelah beberapa percobaan.")
     return False
 
-def set_table_entries_to_100(driver):
+def set_table_entries_to_100(driver, table_id='table'):
     '''Mengatur dropdown jumlah entries ke 100.'''
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait, Select
+    
     try:
         wait = WebDriverWait(driver, 10)
         
         # Cari dropdown untuk entries
-        entries_select = wait.until(EC.element_to_be_clickable((By.NAME, "table_length")))
+        entries_select = wait.until(EC.element_to_be_clickable((By.NAME, f"{table_id}_length")))
         
         # Pilih 100 entries
+        previous_state = get_table_draw_state(driver, table_id)
         select = Select(entries_select)
         select.select_by_value("100")
         
         print("    Berhasil mengatur jumlah entries ke 100.")
         
         # Tunggu tabel di-update
-        time.sleep(3)
+        wait_for_table_draw(driver, previous_state, timeout=10, label="page_length", table_id=table_id)
         return True
         
     except Exception as e:
         print(f"    Error saat mengatur entries: {e}")
         return False
 
-def extract_table_data(driver):
-    '''Mengekstrak data dari tabel yang sedang dimuat.'''
+def extract_table_data_per_row(driver, counter, directory=None):
+    '''Fallback ekstraksi per baris (satu panggilan WebDriver per <tr>).'''
+    from selenium.webdriver.common.by import By
+    
+    directory = get_directory(directory)
     try:
-        table = driver.find_element(By.ID, "table")
+        counter['webdriver_calls'] += 3
+        table = driver.find_element(By.ID, directory.table_id)
         tbody = table.find_element(By.TAG_NAME, "tbody")
         rows = tbody.find_elements(By.TAG_NAME, "tr")
         
@@ -120,6 +945,7 @@ def extract_table_data(driver):
         
         # Verifikasi struktur header tabel
         try:
+            counter['webdriver_calls'] += 2
             thead = table.find_element(By.TAG_NAME, "thead")
             header_cells = thead.find_elements(By.TAG_NAME, "th")
             print(f"    Tabel memiliki {len(header_cells)} kolom header")
@@ -129,6 +955,7 @@ def extract_table_data(driver):
         for i, row in enumerate(rows):
             # Cari semua td dan juga yang mungkin tersembunyi
             cells = row.find_elements(By.TAG_NAME, "td")
+            counter['webdriver_calls'] += 1
             
             # Progress indicator setiap 25 baris
             if i > 0 and i % 25 == 0:
@@ -136,16 +963,19 @@ def extract_table_data(driver):
             
             if len(cells) >= 7:  # Minimal 7 kolom (untuk memastikan ada kolom peringkat)
                 # Cek apakah baris kosong atau loading
-                if "No data available" in row.text or "Loading" in row.text:
+                row_text = row.text
+                counter['webdriver_calls'] += 1
+                if "No data available" in row_text or "Loading" in row_text:
                     continue
                 
                 # Ekstrak menggunakan JavaScript untuk mendapatkan semua kolom termasuk yang tersembunyi
                 try:
+                    counter['webdriver_calls'] += 1
                     all_cell_texts = driver.execute_script("""
                         var row = arguments[0];
                         
                         // Coba ambil dari DataTables API jika memungkinkan
-                        var table = $('#table').DataTable();
+                        var table = $('#' + arguments[1]).DataTable();
                         var rowData = table.row(row).data();
                         
                         if (rowData && rowData.length >= 8) {
@@ -192,28 +1022,9 @@ def extract_table_data(driver):
                         }
                         
                         return texts;
-                    """, row)
-                    
-                    # Berdasarkan analisis HTML, tabel memiliki 8 kolom data
-                    # Kolom ke-9 (Status Kedaluwarsa) adalah hasil render JavaScript DataTables
-                    
-                    # Mapping berdasarkan 8 kolom aktual + 1 kolom yang di-render JavaScript
-                    row_data = {
-                        'perguruan_tinggi': all_cell_texts[0] if len(all_cell_texts) > 0 else "",
-                        'program_studi': all_cell_texts[1] if len(all_cell_texts) > 1 else "",
-                        'strata': all_cell_texts[2] if len(all_cell_texts) > 2 else "",
-                        'wilayah': all_cell_texts[3] if len(all_cell_texts) > 3 else "",
-                        'no_sk': all_cell_texts[4] if len(all_cell_texts) > 4 else "",
-                        'tahun_sk': all_cell_texts[5] if len(all_cell_texts) > 5 else "",
-                        'peringkat': all_cell_texts[6] if len(all_cell_texts) > 6 else "",
-                        'tanggal_kedaluwarsa': all_cell_texts[7] if len(all_cell_texts) > 7 else "",
-                        'status_kedaluwarsa': "",  # Akan diisi dari kolom computed jika ada
-                        'scraped_at': datetime.now().isoformat()
-                    }
+                    """, row, directory.table_id)
                     
-                    # Coba ambil status kedaluwarsa dari kolom yang di-render JavaScript (jika ada)
-                    if len(all_cell_texts) > 8:
-                        row_data['status_kedaluwarsa'] = all_cell_texts[8]
+                    row_data = build_row_data(all_cell_texts, directory=directory)
                     
                     # Konfirmasi ekstraksi data pertama
                     if len(extracted_data) == 0 and row_data['perguruan_tinggi']:
@@ -222,21 +1033,12 @@ def extract_table_data(driver):
                 except Exception as e:
                     print(f"    Warning: Gagal ekstrak dengan JavaScript: {e}, fallback ke metode biasa")
                     # Fallback ke metode biasa jika JavaScript gagal
-                    row_data = {
-                        'perguruan_tinggi': cells[0].text.strip() if len(cells) > 0 else "",
-                        'program_studi': cells[1].text.strip() if len(cells) > 1 else "",
-                        'strata': cells[2].text.strip() if len(cells) > 2 else "",
-                        'wilayah': cells[3].text.strip() if len(cells) > 3 else "",
-                        'no_sk': cells[4].text.strip() if len(cells) > 4 else "",
-                        'tahun_sk': cells[5].text.strip() if len(cells) > 5 else "",
-                        'peringkat': cells[6].text.strip() if len(cells) > 6 else "",
-                        'tanggal_kedaluwarsa': cells[7].text.strip() if len(cells) > 7 else "",
-                        'status_kedaluwarsa': cells[8].text.strip() if len(cells) > 8 else "",  # Coba ambil jika ada
-                        'scraped_at': datetime.now().isoformat()
-                    }
+                    counter['webdriver_calls'] += len(cells)
+                    row_data = build_row_data([cell.text.strip() for cell in cells], directory=directory)
                 
                 # Skip baris jika data utama kosong
                 if not any([row_data['perguruan_tinggi'], row_data['program_studi']]):
+                    counter['skipped_rows'] += 1
                     continue
                 
                 extracted_data.append(row_data)
@@ -248,24 +1050,369 @@ def extract_table_data(driver):
         print(f"    Error saat ekstraksi data: {e}")
         return []
 
-def get_total_pages(driver):
+# Ambil seluruh baris halaman aktif dalam satu round-trip WebDriver (arguments[0] = id tabel)
+EXTRACT_PAGE_ROWS_JS = """
+    var selector = '#' + arguments[0];
+    if (typeof $ === 'undefined' || !$.fn.dataTable || !$.fn.dataTable.isDataTable(selector)) {
+        return null;
+    }
+    var table = $(selector).DataTable();
+    var columnCount = table.columns().count();
+    var helper = document.createElement('div');
+    var toText = function(value) {
+        if (value === null || value === undefined) { return ''; }
+        helper.innerHTML = String(value);
+        return helper.textContent.trim();
+    };
+    var result = [];
+    table.rows({page: 'current'}).every(function(rowIdx) {
+        var data = this.data();
+        var values = Array.isArray(data) ? data.slice() : Object.keys(data).map(function(k) { return data[k]; });
+        var texts = values.map(toText);
+        // Kolom seperti Status Kedaluwarsa hanya ada sebagai hasil render DataTables
+        for (var column = texts.length; column < columnCount; column++) {
+            try {
+                texts.push(toText(table.cell(rowIdx, column).render('display')));
+            } catch (e) {
+                texts.push('');
+            }
+        }
+        result.push(texts);
+    });
+    return result;
+"""
+
+@spanned('extract')
+def extract_table_data(driver, directory=None):
+    '''Mengekstrak data dari tabel yang sedang dimuat (kolom sesuai directory, default prodi).'''
+    started = time.perf_counter()
+    counter = {'webdriver_calls': 0, 'skipped_rows': 0}
+    directory = get_directory(directory)
+    
+    try:
+        counter['webdriver_calls'] += 1
+        page_rows = driver.execute_script(EXTRACT_PAGE_ROWS_JS, directory.table_id)
+    except Exception as e:
+        print(f"    Warning: Ekstraksi massal gagal: {e}, fallback ke ekstraksi per baris")
+        page_rows = None
+    
+    if page_rows is not None:
+        # Baris dengan data utama kosong dilewati oleh RecordBatch.from_cells
+        extracted_data = RecordBatch.from_cells(page_rows, directory=directory)
+        
+        if extracted_data:
+            example = extracted_data[0]
+            print(f"    Berhasil mengekstrak data. Contoh: {' - '.join(example[name] for name in extracted_data.fieldnames[:2])}")
+    else:
+        extracted_data = RecordBatch.from_rows(extract_table_data_per_row(driver, counter, directory),
+                                               directory.fieldnames)
+        extracted_data.skipped_rows = counter['skipped_rows']
+    
+    elapsed = time.perf_counter() - started
+    RUN_METRICS.incr('extract_webdriver_calls', counter['webdriver_calls'])
+    print(f"    Ekstraksi: {len(extracted_data)} data, {counter['webdriver_calls']} panggilan WebDriver, {elapsed:.2f} detik")
+    return extracted_data
+
+def print_extraction_summary():
+    '''Menampilkan ringkasan statistik ekstraksi per halaman (dari span extract di RUN_METRICS).'''
+    report = RUN_METRICS.report()
+    stats = report['spans'].get('extract')
+    if not stats:
+        return
+    pages = stats['count']
+    total_calls = report['counters'].get('extract_webdriver_calls', 0)
+    total_seconds = stats['total_seconds']
+    print(f"⏱️  Ekstraksi {pages} halaman: rata-rata {total_calls / pages:.1f} panggilan WebDriver "
+          f"dan {total_seconds / pages:.2f} detik per halaman")
+
+# Ambil outerHTML #table apa adanya (tanpa parsing di browser) beserta jumlah baris datanya (arguments[0] = id tabel)
+TABLE_SNAPSHOT_JS = """
+    var table = document.getElementById(arguments[0]);
+    if (!table) {
+        return null;
+    }
+    var rows = table.querySelectorAll('tbody > tr').length;
+    var empty = table.querySelectorAll('tbody > tr > td.dataTables_empty').length;
+    return [table.outerHTML, rows - empty];
+"""
+
+_SNAPSHOT_SCRAPED_AT_RE = re.compile(r'^<!-- scraped_at: (\S+) -->\n?')
+
+class TableSnapshot:
+    '''outerHTML #table satu halaman yang diparse belakangan (di process pool atau dari arsip).
+
+    len() adalah jumlah baris data menurut DOM sehingga TableNavigator tetap bisa mencocokkan
+    halaman dengan #table_info tanpa menunggu parsing. Snapshot yang disimpan memuat waktu
+    scraping di komentar baris pertama; file halaman lengkap (mis. "Save Page As") juga bisa dimuat.
+    '''
+    
+    def __init__(self, html_text, row_count=None, scraped_at=None):
+        self.html = html_text
+        self.row_count = row_count
+        self.scraped_at = scraped_at or datetime.now().isoformat()
+    
+    def __len__(self):
+        return self.row_count or 0
+    
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"<!-- scraped_at: {self.scraped_at} -->\n")
+            f.write(self.html)
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            html_text = f.read()
+        match = _SNAPSHOT_SCRAPED_AT_RE.match(html_text)
+        if match:
+            return cls(html_text[match.end():], scraped_at=match.group(1))
+        return cls(html_text, scraped_at=datetime.fromtimestamp(os.path.getmtime(path)).isoformat())
+
+@spanned('extract')
+def capture_table_snapshot(driver, directory=None):
+    '''Mengambil outerHTML #table halaman aktif dalam satu panggilan WebDriver; parsing dilakukan terpisah.'''
+    RUN_METRICS.incr('extract_webdriver_calls')
+    table_id = get_directory(directory).table_id
+    result = driver.execute_script(TABLE_SNAPSHOT_JS, table_id)
+    if not result:
+        print(f"    Warning: Elemen #{table_id} tidak ditemukan untuk snapshot")
+        return TableSnapshot("", 0)
+    html_text, row_count = result
+    print(f"    Snapshot: {row_count} baris, {len(html_text) / 1024:.0f} KB HTML")
+    return TableSnapshot(html_text, row_count)
+
+class _TableHtmlParser(HTMLParser):
+    '''Parser stdlib: teks setiap <td> per baris <tbody>, dikelompokkan per <table> beserta id-nya.'''
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self._open_tables = []
+        self._in_body = False
+        self._row = None
+        self._cell = None
+        self._empty_row = False
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self.tables.append((dict(attrs).get('id'), []))
+            self._open_tables.append(len(self.tables) - 1)
+        elif not self._open_tables:
+            return
+        elif tag == 'tbody':
+            self._in_body = True
+        elif tag == 'tr' and self._in_body:
+            self._row = []
+            self._empty_row = False
+        elif tag == 'td' and self._row is not None:
+            if 'dataTables_empty' in (dict(attrs).get('class') or ''):
+                self._empty_row = True
+            self._cell = []
+    
+    def handle_endtag(self, tag):
+        if tag == 'td' and self._cell is not None:
+            self._row.append(''.join(self._cell).strip())
+            self._cell = None
+        elif tag == 'tr' and self._row is not None:
+            if not self._empty_row:
+                self.tables[self._open_tables[-1]][1].append(self._row)
+            self._row = None
+        elif tag == 'tbody':
+            self._in_body = False
+        elif tag == 'table' and self._open_tables:
+            self._open_tables.pop()
+    
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+def _parse_cells_stdlib(html_text, table_id='table'):
+    parser = _TableHtmlParser()
+    parser.feed(html_text)
+    parser.close()
+    for parsed_id, rows in parser.tables:
+        if parsed_id == table_id:
+            return rows
+    return parser.tables[0][1] if parser.tables else []
+
+def _parse_cells_lxml(html_text, table_id='table'):
+    from lxml import html as lxml_html
+    
+    document = lxml_html.fromstring(html_text)
+    tables = document.xpath('//table[@id=$table_id]', table_id=table_id) or document.xpath('//table')
+    if not tables:
+        return []
+    rows = []
+    for tr in tables[0].xpath('./tbody/tr'):
+        cells = tr.xpath('./td')
+        if any('dataTables_empty' in (td.get('class') or '') for td in cells):
+            continue
+        rows.append([td.text_content().strip() for td in cells])
+    return rows
+
+def _parse_cells_selectolax(html_text, table_id='table'):
+    from selectolax.parser import HTMLParser as SelectolaxParser
+    
+    tree = SelectolaxParser(html_text)
+    table = tree.css_first(f'table#{table_id}') or tree.css_first('table')
+    if table is None:
+        return []
+    rows = []
+    for tr in table.css('tbody > tr'):
+        cells = tr.css('td')
+        if any('dataTables_empty' in (td.attributes.get('class') or '') for td in cells):
+            continue
+        rows.append([td.text(deep=True).strip() for td in cells])
+    return rows
+
+# Backend parser HTML, urut dari yang tercepat; selectolax dan lxml opsional
+HTML_PARSERS = {
+    'selectolax': ('selectolax', _parse_cells_selectolax),
+    'lxml': ('lxml', _parse_cells_lxml),
+    'html.parser': (None, _parse_cells_stdlib),
+}
+
+@lru_cache(maxsize=None)
+def available_html_parsers():
+    '''Nama parser HTML yang terpasang di environment ini, urut dari yang tercepat.'''
+    return [name for name, (module, _) in HTML_PARSERS.items()
+            if module is None or importlib.util.find_spec(module) is not None]
+
+def parse_table_html(html_text, parser=None, scraped_at=None, directory=None):
+    '''Memparse outerHTML #table (atau halaman tersimpan) menjadi RecordBatch berkolom directory.
+
+    parser None memakai backend tercepat yang terpasang; teks sel di-strip seperti
+    textContent.trim() pada ekstraksi JavaScript sehingga hasilnya sama.
+    '''
+    if parser is None:
+        parser = available_html_parsers()[0]
+    if parser not in HTML_PARSERS:
+        raise ValueError(f"Parser HTML tidak dikenal: {parser} (pilihan: {', '.join(HTML_PARSERS)})")
+    module, parse_cells = HTML_PARSERS[parser]
+    if parser not in available_html_parsers():
+        raise RuntimeError(f"Parser {parser} membutuhkan paket {module}: pip install {module}")
+    directory = get_directory(directory)
+    return RecordBatch.from_cells(parse_cells(html_text, directory.table_id), scraped_at, directory)
+
+def _parse_snapshot_html(html_text, parser, scraped_at, directory=None):
+    # Dijalankan di worker process; durasi dikembalikan karena RUN_METRICS tidak dibagi antar proses
+    started = time.perf_counter()
+    batch = parse_table_html(html_text, parser, scraped_at, directory)
+    return batch, time.perf_counter() - started
+
+def parse_snapshot_file(path, parser=None, directory=None):
+    '''Memparse satu file snapshot/halaman tersimpan menjadi RecordBatch.'''
+    snapshot = TableSnapshot.load(path)
+    return parse_table_html(snapshot.html, parser, snapshot.scraped_at, directory)
+
+def iter_snapshot_files(paths):
+    '''File *.html/*.htm dari daftar path; direktori diperluas dan diurutkan berdasarkan nama.'''
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for name in sorted(os.listdir(path)):
+            if name.endswith(('.html', '.htm')):
+                yield os.path.join(path, name)
+
+def iter_parsed_snapshot_files(paths, workers=None, parser=None, directory=None):
+    '''Memparse ulang arsip snapshot secara massal; RecordBatch per file sesuai urutan file.
+
+    Setiap worker process membaca filenya sendiri sehingga HTML tidak dikirim lewat pipe.
+    workers=0 memparse di proses ini (berguna untuk debugging).
+    '''
+    files = list(iter_snapshot_files(paths))
+    print(f"Memparse {len(files)} file snapshot...")
+    if workers == 0:
+        for path in files:
+            yield parse_snapshot_file(path, parser, directory)
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(parse_snapshot_file, files, repeat(parser), repeat(directory),
+                                chunksize=max(1, len(files) // (workers * 4)))
+
+def iter_parsed_snapshots(pages, progress=None, executor=None, parser=None, filters=None, snapshot_dir=None,
+                          window=2, directory=None):
+    '''Memparse TableSnapshot dari generator halaman Selenium sambil browser lanjut ke halaman berikutnya.
+
+    Hingga window halaman diparse bersamaan di executor (ProcessPoolExecutor; None = di proses
+    ini). Halaman di-yield berurutan dan progress dikembalikan ke keadaan halaman yang di-yield
+    agar checkpoint tidak mendahului baris yang sudah ditulis. filters disaring setelah parsing.
+    Jika snapshot_dir diisi, setiap snapshot juga diarsipkan untuk diparse ulang nanti.
+    '''
+    if progress is None:
+        progress = {}
+    if snapshot_dir:
+        os.makedirs(snapshot_dir, exist_ok=True)
+    pending = deque()
+    
+    def finish():
+        future, state = pending.popleft()
+        batch, seconds = future.result()
+        RUN_METRICS.observe('parse', seconds)
+        progress.update(state)
+        return filter_rows(batch, filters)
+    
+    try:
+        for snapshot in pages:
+            state = {key: progress[key] for key in ('page', 'page_range', 'completed') if key in progress}
+            if snapshot_dir:
+                snapshot.save(os.path.join(snapshot_dir, f"snapshot-{progress.get('filter_index', 0):03d}-"
+                                                         f"{progress.get('page', 0):05d}.html"))
+            if executor is None:
+                future = Future()
+                future.set_result(_parse_snapshot_html(snapshot.html, parser, snapshot.scraped_at, directory))
+            else:
+                future = executor.submit(_parse_snapshot_html, snapshot.html, parser, snapshot.scraped_at, directory)
+            pending.append((future, state))
+            if len(pending) >= window:
+                yield finish()
+        while pending:
+            yield finish()
+    finally:
+        for future, _ in pending:
+            future.cancel()
+        if hasattr(pages, 'close'):
+            pages.close()
+
+_TABLE_INFO_NUMBER_RE = re.compile(r'\d[\d,.]*')
+
+def parse_table_info(info_text):
+    '''Mem-parsing teks #table_info menjadi dict start/end/total (None jika tidak dikenali).'''
+    # Format: "Showing 1 to 100 of 21,034 entries (filtered from 33,552 total entries)"
+    numbers = [int(n.replace(",", "").replace(".", "")) for n in _TABLE_INFO_NUMBER_RE.findall(info_text or "")]
+    if len(numbers) < 3:
+        return None
+    return {
+        'text': info_text,
+        'start': numbers[0],
+        'end': numbers[1],
+        'total': numbers[2],
+        'total_unfiltered': numbers[3] if len(numbers) > 3 else numbers[2],
+    }
+
+def read_table_info(driver, table_id='table'):
+    '''Membaca dan mem-parsing #table_info (info paging tabel table_id) dari halaman aktif.'''
+    info_text = driver.execute_script(
+        "var info = document.getElementById(arguments[0] + '_info'); return info ? info.textContent : '';", table_id)
+    return parse_table_info(info_text)
+
+def get_total_pages(driver, page_size=100, table_id='table'):
     '''Mendapatkan jumlah total halaman.'''
+    from selenium.webdriver.common.by import By
+    
     try:
         # Cari info pagination
-        pagination_info = driver.find_element(By.ID, "table_info").text
-        # Format: "Showing 1 to 100 of 21,034 entries (filtered from 33,552 total entries)"
+        pagination_info = driver.find_element(By.ID, f"{table_id}_info").text
+        table_info = parse_table_info(pagination_info)
         
         # Extract total entries
-        if "entries" in pagination_info:
-            parts = pagination_info.split()
-            for i, part in enumerate(parts):
-                if part == "of":
-                    total_entries_str = parts[i + 1].replace(",", "")
-                    total_entries = int(total_entries_str)
-                    # Asumsi 100 entries per halaman
-                    total_pages = (total_entries + 99) // 100  # Ceiling division
-                    print(f"    Total entries: {total_entries}, Total halaman: {total_pages}")
-                    return total_pages
+        if table_info:
+            total_entries = table_info['total']
+            total_pages = (total_entries + page_size - 1) // page_size  # Ceiling division
+            print(f"    Total entries: {total_entries}, Total halaman: {total_pages}")
+            return total_pages
         
         return 1
         
@@ -273,15 +1420,19 @@ def get_total_pages(driver):
         print(f"    Error mendapatkan info pagination: {e}")
         return 1
 
-def go_to_next_page(driver):
+@spanned('paginate')
+def go_to_next_page(driver, timeout=20, table_id='table'):
     '''Navigasi ke halaman berikutnya.'''
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    
     try:
         wait = WebDriverWait(driver, 10)
         
         # Coba beberapa selector untuk tombol Next
         next_selectors = [
-            "#table_next a",  # Link di dalam tombol Next
-            "#table_next",    # Tombol Next itu sendiri 
+            f"#{table_id}_next a",  # Link di dalam tombol Next
+            f"#{table_id}_next",    # Tombol Next itu sendiri
             ".paginate_button.next a",  # Selector alternatif
             "a[data-dt-idx]:contains('Next')",  # Berdasarkan text
         ]
@@ -311,7 +1462,7 @@ def go_to_next_page(driver):
         
         # Scroll ke tombol jika perlu
         driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-        time.sleep(1)
+        previous_state = get_table_draw_state(driver, table_id)
         
         # Klik tombol Next menggunakan JavaScript sebagai fallback
         try:
@@ -323,26 +1474,21 @@ def go_to_next_page(driver):
         print("    Navigasi ke halaman berikutnya...")
         
         # Tunggu tabel di-update dengan indikator loading
-        time.sleep(3)
-        
-        return True
+        return wait_for_table_draw(driver, previous_state, timeout=timeout, label="next_page", table_id=table_id)
         
     except Exception as e:
         print(f"    Error navigasi ke halaman berikutnya: {e}")
         return False
 
-def scrape_banpt_prodi_directory(driver, max_pages=None):
-    '''Scraping utama untuk direktori program studi BANPT.'''
-    banpt_url = "https://www.banpt.or.id/direktori/prodi/pencarian_prodi.php"
-    all_data = []
-    
+@spanned('navigate')
+def prepare_table(driver, url=BANPT_PRODI_URL, timeout=20, table_id='table'):
+    '''Membuka halaman direktori dan menyiapkan tabel (zoom, 100 entries, semua kolom tampil).'''
     try:
-        print(f"Navigasi ke: {banpt_url}")
-        driver.get(banpt_url)
+        print(f"Navigasi ke: {url}")
+        driver.get(url)
         
         # Maksimalkan window dan atur zoom untuk memastikan semua kolom terlihat
         driver.maximize_window()
-        time.sleep(2)
         
         # Set zoom level ke 50% menggunakan JavaScript
         try:
@@ -366,33 +1512,34 @@ def scrape_banpt_prodi_directory(driver, max_pages=None):
                 }
             """)
             print("    Mengatur zoom ke 50% untuk menampilkan semua kolom...")
-            time.sleep(3)
         except Exception as e:
             print(f"    Warning: Gagal mengatur zoom: {e}")
         
         # Tunggu dan pastikan data tabel dimuat
-        if not wait_for_table_data(driver):
+        if not wait_for_table_data(driver, timeout=timeout, table_id=table_id):
             print("Gagal memuat data tabel.")
-            return all_data
+            return False
         
         # Set jumlah entries ke 100
-        if not set_table_entries_to_100(driver):
+        if not set_table_entries_to_100(driver, table_id):
             print("Gagal mengatur entries, melanjutkan dengan setting default.")
         
         # Coba disable responsive untuk memastikan semua kolom tampil
         try:
-            driver.execute_script("""
+            previous_state = get_table_draw_state(driver, table_id)
+            redraw_triggered = driver.execute_script("""
+                var selector = '#' + arguments[0];
                 // Manipulasi CSS untuk memaksa semua kolom tampil
                 $('head').append('<style type="text/css">' +
-                    '#table { width: auto !important; table-layout: auto !important; }' +
-                    '#table td, #table th { display: table-cell !important; visibility: visible !important; }' +
+                    selector + ' { width: auto !important; table-layout: auto !important; }' +
+                    selector + ' td, ' + selector + ' th { display: table-cell !important; visibility: visible !important; }' +
                     '.dtr-hidden { display: table-cell !important; }' +
-                    '@media screen { #table td, #table th { display: table-cell !important; } }' +
+                    '@media screen { ' + selector + ' td, ' + selector + ' th { display: table-cell !important; } }' +
                     '</style>');
                 
                 // Coba disable responsive DataTables
                 if (typeof $.fn.dataTable !== 'undefined') {
-                    var table = $('#table').DataTable();
+                    var table = $(selector).DataTable();
                     if (table.responsive) {
                         table.responsive.disable();
                         table.columns.adjust().draw();
@@ -400,7 +1547,7 @@ def scrape_banpt_prodi_directory(driver, max_pages=None):
                 }
                 
                 // Paksa tampilkan semua kolom yang mungkin tersembunyi
-                $('#table td, #table th').each(function() {
+                $(selector + ' td, ' + selector + ' th').each(function() {
                     $(this).show();
                     $(this).css({
                         'display': 'table-cell',
@@ -411,74 +1558,2039 @@ def scrape_banpt_prodi_directory(driver, max_pages=None):
                 
                 // Trigger window resize untuk memaksa recalculation
                 $(window).trigger('resize');
-            """)
+                
+                return typeof table !== 'undefined' && !!table.responsive;
+            """, table_id)
             print("    Mematikan responsive dan memaksa semua kolom tampil...")
-            time.sleep(3)
+            if redraw_triggered:
+                wait_for_table_draw(driver, previous_state, timeout=5, label="responsive", table_id=table_id)
         except Exception as e:
             print(f"    Warning: Gagal manipulasi responsive: {e}")
         
-        # Tunggu data dimuat ulang setelah perubahan entries
-        time.sleep(5)
-        if not wait_for_table_data(driver, max_retries=2):
+        # Pastikan data sudah dimuat ulang setelah perubahan entries
+        if not wait_for_table_data(driver, max_retries=2, timeout=timeout, table_id=table_id):
             print("Gagal memuat ulang data tabel setelah mengatur entries.")
-            return all_data
+            return False
+        
+        return True
+    
+    except Exception as e:
+        print(f"Error saat menyiapkan tabel: {e}")
+        return False
+
+def _track_total_entries(progress, total_entries, table_info_text=None):
+    '''Mencatat total entri ke progress dan melaporkan jika berbeda dari checkpoint sebelumnya.'''
+    previous_total = progress.get('total_entries')
+    if previous_total is not None and previous_total != total_entries:
+        print(f"    ⚠️  Jumlah entri berubah sejak checkpoint: {previous_total} -> {total_entries}")
+        progress['total_entries_changed'] = [previous_total, total_entries]
+    progress['total_entries'] = total_entries
+    progress['table_info'] = table_info_text
+
+# Kunci khusus dict filter untuk pencarian teks bebas (kotak search DataTables)
+SEARCH_FILTER_KEY = 'search'
+
+def expand_filters(filters, directory=None):
+    '''Memvalidasi dict filter terhadap kolom directory lalu menguraikannya menjadi list kombinasi bernilai tunggal.
+
+    filters berupa {nama_kolom: nilai atau list nilai, 'search': teks bebas}. Kolom dengan list
+    nilai di-crawl satu kombinasi per kali karena pencarian kolom DataTables hanya menerima satu teks.
+    '''
+    columns = get_directory(directory).columns
+    keys = []
+    choices = []
+    for key, value in (filters or {}).items():
+        if key != SEARCH_FILTER_KEY and key not in columns:
+            raise ValueError(f"Kolom filter tidak dikenal: {key} (pilihan: {', '.join(columns)}, {SEARCH_FILTER_KEY})")
+        values = [value] if isinstance(value, str) else list(value)
+        values = [text.strip() for text in values if text and text.strip()]
+        if values:
+            keys.append(key)
+            choices.append(values)
+    return [dict(zip(keys, combination)) for combination in product(*choices)]
+
+def parse_filter_args(filter_args, search=None, directory=None):
+    '''Mengubah argumen "kolom=nilai" (boleh berulang untuk list nilai) dan teks search menjadi dict filter.'''
+    filters = {}
+    for argument in filter_args or []:
+        column, separator, value = argument.partition('=')
+        if not separator:
+            raise ValueError(f"Format filter harus kolom=nilai: {argument}")
+        filters.setdefault(column.strip(), []).append(value)
+    if search:
+        filters[SEARCH_FILTER_KEY] = search
+    expand_filters(filters, directory)
+    return filters
+
+def describe_filters(filters):
+    '''Ringkasan satu kombinasi filter untuk log.'''
+    if not filters:
+        return "tanpa filter"
+    return ", ".join(f"{key}={value!r}" for key, value in filters.items())
+
+def _filter_text(value):
+    return ' '.join(format_cell_value(value).split()).lower()
+
+def filter_rows(rows, filters, local_search=False):
+    '''Menyaring ulang baris hasil pushdown dengan kecocokan persis per kolom (tanpa beda huruf besar/kecil).
+
+    Pencarian kolom DataTables server-side bersifat "mengandung" (mis. "Wilayah 1" juga cocok
+    dengan "Wilayah 12"). Teks search hanya disaring lokal jika local_search=True, yaitu untuk
+    tabel client-side yang tidak memproses parameter search.
+    '''
+    if not filters:
+        return rows
+    batch = RecordBatch.from_rows(rows)
+    column_targets = [(batch.fieldnames.index(name), _filter_text(value))
+                      for name, value in filters.items() if name != SEARCH_FILTER_KEY]
+    search = _filter_text(filters.get(SEARCH_FILTER_KEY, "")) if local_search else ""
+    if not column_targets and not search:
+        return batch
+    
+    # Hasil perbandingan di-cache per nilai karena kolom filter umumnya kategorikal
+    matches = {}
+    keep = []
+    for i, values in enumerate(batch.iter_tuples()):
+        for index, target in column_targets:
+            key = (index, values[index])
+            matched = matches.get(key)
+            if matched is None:
+                matched = matches[key] = _filter_text(values[index]) == target
+            if not matched:
+                break
+        else:
+            if not search or any(search in _filter_text(value) for value in values):
+                keep.append(i)
+    return batch if len(keep) == len(batch) else batch.take(keep)
+
+def row_key_digest(key):
+    '''Digest 8 byte dari nilai kolom kunci sebuah baris, untuk indeks dedup saat streaming.'''
+    content = '\x1f'.join(format_cell_value(value) for value in key)
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).digest()
+
+def add_offset_range(ranges, start, end):
+    '''Menambahkan rentang [start, end) ke list rentang terurut, menggabungkan yang bersinggungan.'''
+    if end <= start:
+        return ranges
+    # Jalur umum: halaman datang berurutan sehingga cukup memperpanjang atau menambah rentang terakhir
+    if not ranges or start > ranges[-1][1]:
+        if not ranges or start > ranges[-1][0]:
+            ranges.append([start, end])
+            return ranges
+    elif start >= ranges[-1][0]:
+        ranges[-1][1] = max(ranges[-1][1], end)
+        return ranges
+    merged = []
+    for range_start, range_end in sorted(ranges + [[start, end]]):
+        if merged and range_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], range_end)
+        else:
+            merged.append([range_start, range_end])
+    ranges[:] = merged
+    return ranges
+
+def missing_offset_ranges(ranges, end):
+    '''Rentang [start, end) di antara 0 dan end yang tidak tercakup ranges (terurut, tidak tumpang tindih).'''
+    missing = []
+    position = 0
+    for range_start, range_end in ranges:
+        if range_start >= end:
+            break
+        if range_start > position:
+            missing.append([position, range_start])
+        position = max(position, range_end)
+    if position < end:
+        missing.append([position, end])
+    return missing
+
+def describe_offset_ranges(ranges, limit=5):
+    '''Teks ringkas rentang offset 0-based, mis. "100-199, 500-999 (+3 rentang lagi)".'''
+    parts = [f"{start}-{'akhir' if end is None else end - 1}" for start, end in ranges[:limit]]
+    if len(ranges) > limit:
+        parts.append(f"(+{len(ranges) - limit} rentang lagi)")
+    return ", ".join(parts)
+
+class ReconciliationTracker:
+    '''Indeks dedup berbasis hash dan cakupan offset per kombinasi filter selama streaming.
+
+    Setiap halaman mencatat rentang offset mentahnya (progress['page_range'] dari engine)
+    terhadap total entri tabel; baris yang kuncinya (key_fields) sudah pernah terlihat,
+    misalnya karena data bergeser antar halaman saat crawl, dibuang sebelum ditulis.
+    report() merangkum entri yang diharapkan vs diterima vs duplikat beserta rentang yang hilang.
+    '''
+    
+    def __init__(self, max_pages=None, key_fields=ROW_KEY_FIELDS):
+        self.max_pages = max_pages
+        self.key_fields = tuple(key_fields)
+        self.seen = set()
+        self.combinations = {}
+        self.received = 0
+        self.collected = 0
+        self.duplicates = 0
+        self.filtered_out = 0
+    
+    @classmethod
+    def from_report(cls, report):
+        '''Memulihkan cakupan dan hitungan dari report() sebelumnya (indeks dedup diisi lewat seed_keys).'''
+        tracker = cls(report.get('max_pages'), report.get('key_fields') or ROW_KEY_FIELDS)
+        tracker.received = report.get('received_rows', 0)
+        tracker.collected = report.get('unique_rows', 0)
+        tracker.duplicates = report.get('duplicate_rows', 0)
+        tracker.filtered_out = report.get('filtered_out_rows', 0)
+        for combination in report.get('combinations', []):
+            tracker.combinations[combination['filter_index']] = {
+                'filters': combination.get('filters') or {},
+                'total_entries': combination.get('total_entries'),
+                'page_size': combination.get('page_size'),
+                'covered': [list(r) for r in combination.get('covered') or []],
+                'tracked': combination.get('missing') is not None,
+            }
+        return tracker
+    
+    def register(self, filter_index, filters=None):
+        return self.combinations.setdefault(filter_index, {
+            'filters': filters or {}, 'total_entries': None, 'page_size': None, 'covered': [], 'tracked': False,
+        })
+    
+    def seed_keys(self, keys):
+        '''Mengisi indeks dedup dari kunci baris yang sudah ada di output (mis. saat resume).'''
+        before = len(self.seen)
+        for key in keys:
+            self.seen.add(row_key_digest(key))
+        return len(self.seen) - before
+    
+    def add_page(self, page_data, filter_index, page_range=None, progress=None):
+        '''Mencatat satu halaman lalu mengembalikan RecordBatch tanpa baris yang sudah pernah terlihat.'''
+        state = self.register(filter_index)
+        if progress:
+            if progress.get('total_entries') is not None:
+                state['total_entries'] = progress['total_entries']
+            state['page_size'] = progress.get('page_size', state['page_size'])
+        
+        rows = RecordBatch.from_rows(page_data)
+        if page_range is not None:
+            start, end = page_range
+            add_offset_range(state['covered'], start, end)
+            state['tracked'] = True
+            self.received += end - start
+            self.filtered_out += max(0, end - start - len(rows))
+        else:
+            self.received += len(rows)
+        
+        unique_indices = []
+        for i, key in enumerate(rows.iter_tuples(self.key_fields)):
+            digest = row_key_digest(key)
+            if digest in self.seen:
+                continue
+            self.seen.add(digest)
+            unique_indices.append(i)
+        self.duplicates += len(rows) - len(unique_indices)
+        self.collected += len(unique_indices)
+        return rows if len(unique_indices) == len(rows) else rows.take(unique_indices)
+    
+    def _expected_end(self, state):
+        total = state['total_entries']
+        if total is not None and self.max_pages and state['page_size']:
+            return min(total, self.max_pages * state['page_size'])
+        return total
+    
+    def missing_ranges(self):
+        '''List (filter_index, filters, rentang) yang belum tercakup; end None berarti sampai akhir tabel.'''
+        result = []
+        for index in sorted(self.combinations):
+            state = self.combinations[index]
+            expected_end = self._expected_end(state)
+            if expected_end is None or not state['tracked']:
+                # Kombinasi belum pernah dijangkau sehingga total entrinya belum diketahui
+                ranges = [[0, None]]
+            else:
+                ranges = missing_offset_ranges(state['covered'], expected_end)
+            if ranges:
+                result.append((index, state['filters'], ranges))
+        return result
+    
+    def report(self):
+        combinations = []
+        expected = 0
+        missing_rows = 0
+        complete = True
+        for index in sorted(self.combinations):
+            state = self.combinations[index]
+            expected_end = self._expected_end(state)
+            missing = None
+            if state['tracked'] and expected_end is not None:
+                missing = missing_offset_ranges(state['covered'], expected_end)
+                missing_rows += sum(end - start for start, end in missing)
+            if missing is None or missing:
+                complete = False
+            expected += expected_end or 0
+            combinations.append({
+                'filter_index': index,
+                'filters': state['filters'],
+                'total_entries': state['total_entries'],
+                'page_size': state['page_size'],
+                'covered': state['covered'],
+                'missing': missing,
+            })
+        return {
+            'expected_entries': expected,
+            'received_rows': self.received,
+            'unique_rows': self.collected,
+            'duplicate_rows': self.duplicates,
+            'filtered_out_rows': self.filtered_out,
+            'missing_rows': missing_rows,
+            'complete': complete,
+            'max_pages': self.max_pages,
+            'key_fields': list(self.key_fields),
+            'combinations': combinations,
+        }
+    
+    def print_summary(self):
+        report = self.report()
+        print(f"🧮 Rekonsiliasi: {report['expected_entries']} entri diharapkan, {report['received_rows']} diterima, "
+              f"{report['unique_rows']} unik, {report['duplicate_rows']} duplikat dibuang, "
+              f"{report['filtered_out_rows']} tersaring/kosong")
+        for combination in report['combinations']:
+            label = describe_filters(combination['filters'])
+            if combination['missing'] is None:
+                print(f"    ⚠️  Cakupan offset kombinasi {combination['filter_index'] + 1} ({label}) tidak tercatat")
+            elif combination['missing']:
+                count = sum(end - start for start, end in combination['missing'])
+                print(f"    ⚠️  Kombinasi {combination['filter_index'] + 1} ({label}): {count} baris hilang di offset "
+                      f"{describe_offset_ranges(combination['missing'])}")
+        if report['complete']:
+            print("    ✅ Semua offset tercakup tanpa celah.")
+        else:
+            print("    Jalankan ulang dengan --refetch-missing untuk mengambil hanya rentang yang hilang.")
+
+def iter_filter_combinations(iter_pages, filters=None, max_pages=None, start_page=1, progress=None, order=None,
+                             tracker=None, directory=None):
+    '''Menjalankan iter_pages sekali per kombinasi filter (lihat expand_filters) secara berurutan.
+
+    progress['filter_index'] mencatat kombinasi aktif. Saat satu kombinasi selesai, checkpoint
+    langsung menunjuk awal kombinasi berikutnya sehingga --resume tidak mengulang halaman.
+    max_pages berlaku per kombinasi. Jika tracker (ReconciliationTracker) diberikan, baris
+    duplikat dibuang dan progress['reconciliation'] diperbarui setiap halaman. Konsumen bisa
+    mengisi progress['skip_combination'] (mis. iter_incremental_pages) agar sisa halaman
+    kombinasi aktif dilewati dan crawl berlanjut ke kombinasi berikutnya.
+    '''
+    combinations = expand_filters(filters, directory)
+    if progress is None:
+        progress = {}
+    first_index = progress.get('filter_index', 0)
+    progress['filters'] = filters or {}
+    if tracker is not None:
+        for index, combination in enumerate(combinations):
+            tracker.register(index, combination)
+    
+    for index in range(first_index, len(combinations)):
+        combination = combinations[index]
+        last = index == len(combinations) - 1
+        progress['filter_index'] = index
+        if len(combinations) > 1:
+            print(f"\n  Kombinasi filter {index + 1}/{len(combinations)}: {describe_filters(combination)}")
+        pages = iter_pages(max_pages=max_pages, start_page=start_page if index == first_index else 1,
+                           progress=progress, order=order, filters=combination)
+        try:
+            for page_data in pages:
+                if tracker is not None:
+                    page_data = tracker.add_page(page_data, index, progress.pop('page_range', None), progress)
+                    progress['reconciliation'] = tracker.report()
+                if progress.get('completed') and not last:
+                    progress.update(completed=False, page=0, filter_index=index + 1)
+                    progress.pop('total_entries', None)
+                yield page_data
+                if progress.pop('skip_combination', False):
+                    if not last:
+                        progress.update(completed=False, page=0, filter_index=index + 1)
+                        progress.pop('total_entries', None)
+                    break
+        finally:
+            if hasattr(pages, 'close'):
+                pages.close()
+
+def iter_missing_ranges(iter_ranges, tracker, progress=None):
+    '''Mengambil ulang hanya rentang offset yang hilang menurut tracker, per kombinasi filter.
+
+    iter_ranges(ranges, progress=..., filters=...) adalah ScrapeEngine.iter_ranges; baris yang
+    sudah ada di indeks dedup tracker tidak dihasilkan lagi.
+    '''
+    if progress is None:
+        progress = {}
+    for index, filters, ranges in tracker.missing_ranges():
+        label = describe_filters(filters)
+        print(f"\n  Mengambil ulang offset {describe_offset_ranges(ranges)} ({label})...")
+        progress.pop('total_entries', None)
+        progress['filter_index'] = index
+        pages = iter_ranges(ranges, progress=progress, filters=filters)
+        try:
+            for page_data in pages:
+                page_data = tracker.add_page(page_data, index, progress.pop('page_range', None), progress)
+                progress['reconciliation'] = tracker.report()
+                yield page_data
+        finally:
+            if hasattr(pages, 'close'):
+                pages.close()
+
+def iter_banpt_prodi_pages(driver, max_pages=None, page_delay=0, start_page=1, progress=None, order=None,
+                           url=None, filters=None, navigator=None, directory=None):
+    '''Generator halaman direktori program studi: menghasilkan list baris per halaman.
+
+    Jika progress (dict) diberikan, nomor halaman dan info tabel diperbarui sebelum tiap yield
+    sehingga konsumen bisa menulis checkpoint setelah halaman tersebut tersimpan.
+    order berupa tuple (nama_kolom, 'asc'/'desc') untuk mengurutkan tabel sebelum paging.
+    filters berupa satu kombinasi filter bernilai tunggal yang diterapkan di DataTables sebelum paging.
+    Posisi tiap halaman diverifikasi dan dipulihkan oleh TableNavigator; navigator bisa diberikan
+    (mis. dengan driver_factory) agar sesi WebDriver yang mati dapat dibuat ulang. Meski bernama
+    prodi, generator ini melayani direktori mana pun lewat directory (DirectorySchema).
+    '''
+    collected = 0
+    if progress is None:
+        progress = {}
+    if navigator is None:
+        navigator = TableNavigator(driver, url, filters=filters, order=order, directory=directory)
+    progress.update(mode='selenium', page_size=navigator.page_size, completed=False)
+    
+    try:
+        if not navigator.open():
+            return
         
         # Dapatkan total halaman
-        total_pages = get_total_pages(driver)
+        total_pages = get_total_pages(navigator.driver, navigator.page_size, navigator.table_id)
         if max_pages:
             total_pages = min(total_pages, max_pages)
+        table_info = read_table_info(navigator.driver, navigator.table_id)
+        if table_info:
+            _track_total_entries(progress, table_info['total'], table_info['text'])
         
-        # Estimasi waktu (asumsi 5 detik per halaman)
-        estimated_time = total_pages * 5
-        estimated_minutes = estimated_time // 60
-        print(f"    Estimasi waktu scraping: ~{estimated_minutes} menit ({estimated_time} detik)")
-        
-        current_page = 1
+        # Lanjutkan dari halaman checkpoint jika diminta
+        current_page = start_page
+        if current_page > 1:
+            print(f"    Melanjutkan dari halaman {current_page}...")
+            if not navigator.go_to(current_page):
+                print(f"    Gagal lompat ke halaman {current_page}.")
+                return
         
+        # Estimasi waktu dihitung dari kecepatan aktual pada baris progres tiap halaman
         while current_page <= total_pages:
-            print(f"\n  Scraping halaman {current_page} dari {total_pages} ({len(all_data)} data terkumpul)...")
+            print(f"\n  Scraping halaman {current_page} dari {total_pages} ({collected} data terkumpul)...")
             
-            # Ekstrak data dari halaman saat ini
-            page_data = extract_table_data(driver)
+            # Ekstrak data dari halaman saat ini (offset #table_info dicek sebelum dan sesudah)
+            page_data = navigator.extract(current_page)
+            if page_data is None:
+                print(f"    Halaman {current_page} tidak bisa diekstrak pada posisi yang terverifikasi, berhenti "
+                      f"(checkpoint tetap di halaman sebelumnya).")
+                break
+            page_data = filter_rows(page_data, filters)
             
             if page_data:
-                all_data.extend(page_data)
+                collected += len(page_data)
                 print(f"    +{len(page_data)} data dari halaman {current_page}")
             else:
                 print(f"    Tidak ada data yang diekstrak dari halaman {current_page}")
             
+            progress['page'] = current_page
+            progress['page_range'] = navigator.last_range
+            progress['completed'] = current_page >= total_pages
+            yield page_data
+            
             # Jika sudah halaman terakhir atau mencapai max_pages, stop
             if current_page >= total_pages:
+                total_entries = progress.get('total_entries')
+                if not max_pages and total_entries is not None and navigator.last_range[1] != total_entries:
+                    print(f"    ⚠️  Offset akhir {navigator.last_range[1]} tidak sama dengan total {total_entries} entri, "
+                          f"sebagian baris mungkin terlewat.")
+                    progress['coverage_complete'] = False
                 break
                 
-            # Navigasi ke halaman berikutnya
-            if not go_to_next_page(driver):
+            # Navigasi ke halaman berikutnya (dipulihkan ke halaman yang sama jika gagal)
+            if not navigator.next_page(current_page):
                 print("    Tidak bisa melanjutkan ke halaman berikutnya.")
                 break
             
             current_page += 1
             
-            # Delay antar halaman
-            time.sleep(2)
+            # Delay antar halaman (opsional, tunggu draw sudah menjamin tabel siap)
+            if page_delay:
+                time.sleep(page_delay)
         
     except Exception as e:
+        # Dicatat di progress (ikut laporan run) lalu diteruskan agar run tidak dianggap selesai
         print(f"Error dalam scraping utama: {e}")
-    
+        progress['error'] = f"{type(e).__name__}: {e}"
+        raise
+
+def scrape_banpt_prodi_directory(driver, max_pages=None, page_delay=0, filters=None):
+    '''Scraping utama untuk direktori program studi BANPT (opsional hanya baris yang cocok dengan filters).'''
+    def iter_pages(**kwargs):
+        return iter_banpt_prodi_pages(driver, page_delay=page_delay, **kwargs)
+    tracker = ReconciliationTracker(max_pages)
+    all_data = RecordBatch.concat(iter_filter_combinations(iter_pages, filters, max_pages=max_pages, tracker=tracker))
+    tracker.print_summary()
     return all_data
 
-def save_to_csv(data_list, csv_file_path):
-    '''Menyimpan data ke file CSV.'''
-    if not data_list:
-        print("Tidak ada data untuk disimpan ke CSV.")
-        return
+def iter_banpt_prodi_range_pages(navigator, ranges, progress=None, filters=None):
+    '''Generator halaman yang hanya mencakup rentang offset [start, end) tertentu (end None = sampai akhir).'''
+    if progress is None:
+        progress = {}
+    page_size = navigator.page_size
+    progress.update(mode='selenium', page_size=page_size)
+    
+    try:
+        if not navigator.open():
+            return
+        table_info = read_table_info(navigator.driver, navigator.table_id)
+        if table_info:
+            _track_total_entries(progress, table_info['total'], table_info['text'])
+        total_entries = progress.get('total_entries')
+        
+        for start, end in ranges:
+            if total_entries is not None:
+                end = total_entries if end is None else min(end, total_entries)
+            if end is None or end <= start:
+                continue
+            first_page, last_page = start // page_size + 1, (end - 1) // page_size + 1
+            if not navigator.go_to(first_page):
+                print(f"    Gagal lompat ke halaman {first_page}.")
+                return
+            for page in range(first_page, last_page + 1):
+                page_data = navigator.extract(page)
+                if page_data is None:
+                    print(f"    Halaman {page} tidak bisa diekstrak pada posisi yang terverifikasi, berhenti.")
+                    return
+                # Hanya baris di dalam rentang yang hilang yang dikembalikan
+                page_start, page_end = navigator.last_range
+                low = max(start, page_start)
+                high = max(low, min(end, page_end))
+                progress['page_range'] = [low, high]
+                yield filter_rows(page_data[low - page_start:high - page_start], filters)
+                if page < last_page and not navigator.next_page(page):
+                    print("    Tidak bisa melanjutkan ke halaman berikutnya.")
+                    return
+    except Exception as e:
+        print(f"Error saat mengambil ulang rentang: {e}")
+        progress['error'] = f"{type(e).__name__}: {e}"
+        raise
+
+@spanned('navigate')
+def jump_to_page(driver, page_number, timeout=20, table_id='table'):
+    '''Lompat langsung ke halaman tertentu (1-based) lewat table.page(n).draw('page').'''
+    try:
+        previous_state = get_table_draw_state(driver, table_id)
+        current_page = driver.execute_script("""
+            var table = $('#' + arguments[1]).DataTable();
+            var target = arguments[0];
+            if (table.page() === target) {
+                return target;
+            }
+            table.page(target).draw('page');
+            return -1;
+        """, page_number - 1, table_id)
+        if current_page == page_number - 1:
+            return True
+        return wait_for_table_draw(driver, previous_state, timeout=timeout, label="jump_page", table_id=table_id)
+    except Exception as e:
+        print(f"    Error lompat ke halaman {page_number}: {e}")
+        return False
+
+def sort_table(driver, column_name, direction='desc', timeout=20, directory=None):
+    '''Mengurutkan tabel di sisi server berdasarkan kolom data directory lewat table.order().'''
+    try:
+        directory = get_directory(directory)
+        previous_state = get_table_draw_state(driver, directory.table_id)
+        driver.execute_script("$('#' + arguments[2]).DataTable().order([arguments[0], arguments[1]]).draw();",
+                              directory.column_index(column_name), direction, directory.table_id)
+        print(f"    Mengurutkan tabel berdasarkan {column_name} ({direction})...")
+        return wait_for_table_draw(driver, previous_state, timeout=timeout, label="sort", table_id=directory.table_id)
+    except Exception as e:
+        print(f"    Error mengurutkan tabel: {e}")
+        return False
+
+def filter_table(driver, filters, timeout=20, directory=None):
+    '''Menerapkan satu kombinasi filter lewat table.search() dan column().search() lalu satu kali draw.'''
+    try:
+        directory = get_directory(directory)
+        previous_state = get_table_draw_state(driver, directory.table_id)
+        column_filters = {str(directory.column_index(name)): value
+                          for name, value in filters.items() if name != SEARCH_FILTER_KEY}
+        driver.execute_script("""
+            var table = $('#' + arguments[2]).DataTable();
+            var columnFilters = arguments[1];
+            table.search(arguments[0]);
+            table.columns().search('');
+            Object.keys(columnFilters).forEach(function(index) {
+                table.column(parseInt(index, 10)).search(columnFilters[index]);
+            });
+            table.draw();
+        """, filters.get(SEARCH_FILTER_KEY, ""), column_filters, directory.table_id)
+        print(f"    Menerapkan filter {describe_filters(filters)}...")
+        return wait_for_table_draw(driver, previous_state, timeout=timeout, label="filter",
+                                   table_id=directory.table_id)
+    except Exception as e:
+        print(f"    Error menerapkan filter: {e}")
+        return False
+
+def ensure_page_length(driver, page_size=100, timeout=10, table_id='table'):
+    '''Memastikan DataTables memakai page_size baris per halaman lewat table.page.len() (fallback dropdown).'''
+    try:
+        previous_state = get_table_draw_state(driver, table_id)
+        changed = driver.execute_script("""
+            var table = $('#' + arguments[1]).DataTable();
+            if (table.page.len() === arguments[0]) {
+                return false;
+            }
+            table.page.len(arguments[0]).draw('page');
+            return true;
+        """, page_size, table_id)
+        if not changed:
+            return True
+        print(f"    Mengatur ulang panjang halaman ke {page_size} lewat DataTables API...")
+        return wait_for_table_draw(driver, previous_state, timeout=timeout, label="page_length", table_id=table_id)
+    except Exception as e:
+        print(f"    Error mengatur panjang halaman: {e}")
+        return False
+
+def is_driver_alive(driver):
+    '''True jika sesi WebDriver masih merespons.'''
+    try:
+        driver.execute_script("return 1;")
+        return True
+    except Exception:
+        return False
+
+def is_table_warm(driver, url=BANPT_PRODI_URL, table_id='table'):
+    '''True jika driver masih menampilkan tabel DataTables di url dengan zoom yang sudah diterapkan.'''
+    try:
+        return bool(driver.execute_script("""
+            return window.location.href === arguments[0] && !!window.jQuery &&
+                $.fn.dataTable.isDataTable('#' + arguments[1]) && document.body.style.zoom === '0.5';
+        """, url, table_id))
+    except Exception:
+        return False
+
+def reset_table(driver, timeout=20, table_id='table'):
+    '''Mengembalikan tabel yang sudah dimuat ke keadaan awal: tanpa search/filter, urutan awal, halaman 1.'''
+    try:
+        previous_state = get_table_draw_state(driver, table_id)
+        changed = driver.execute_script("""
+            var table = $('#' + arguments[0]).DataTable();
+            var initial = table.init().order || table.init().aaSorting || [[0, 'asc']];
+            var searched = table.search() !== '' ||
+                table.columns().search().toArray().some(function(value) { return value !== ''; });
+            if (!searched && table.page() === 0 && JSON.stringify(table.order()) === JSON.stringify(initial)) {
+                return false;
+            }
+            table.search('');
+            table.columns().search('');
+            table.order(initial).draw();
+            return true;
+        """, table_id)
+        if not changed:
+            return True
+        print("    Mengembalikan tabel hangat ke keadaan awal...")
+        return wait_for_table_draw(driver, previous_state, timeout=timeout, label="reset", table_id=table_id)
+    except Exception as e:
+        print(f"    Error mengembalikan tabel ke keadaan awal: {e}")
+        return False
+
+class TableNavigator:
+    '''Posisi paging #table yang diverifikasi lewat #table_info dan dipulihkan tanpa kembali ke halaman 1.
+
+    Sebelum dan sesudah tiap ekstraksi, "Showing X to Y" dicek terhadap offset halaman yang
+    diharapkan. Jika posisi salah, draw gagal atau sesi WebDriver mati, halaman dimuat ulang
+    (driver dibuat ulang lewat driver_factory bila perlu), lalu panjang halaman, filter, urutan
+    dan indeks halaman diterapkan ulang dengan backoff eksponensial antar percobaan.
+    Dengan reuse_table=True, tabel yang masih termuat di driver dipakai ulang (cukup di-reset)
+    alih-alih membuka ulang halaman direktori. extractor(driver, directory) mengambil isi halaman
+    (default extract_table_data; capture_table_snapshot untuk parsing HTML terpisah).
+    directory (DirectorySchema, default prodi) menentukan kolom filter, urutan dan ekstraksi;
+    url None berarti URL directory.
+    '''
+    
+    def __init__(self, driver, url=None, page_size=100, filters=None, order=None, driver_factory=None,
+                 max_attempts=4, backoff_base=1.0, backoff_max=30.0, label="", reuse_table=False, timeout=20,
+                 extractor=None, directory=None):
+        self.driver = driver
+        self.directory = get_directory(directory)
+        self.table_id = self.directory.table_id
+        self.url = url or self.directory.url
+        self.page_size = page_size
+        self.filters = filters
+        self.order = order
+        self.driver_factory = driver_factory
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.label = label
+        self.reuse_table = reuse_table
+        # Batas waktu (detik) setiap draw tabel
+        self.timeout = timeout
+        self.extractor = extractor or extract_table_data
+        # Rentang offset [start, end) halaman terverifikasi terakhir menurut #table_info
+        self.last_range = None
+    
+    def open(self, reload=False):
+        '''Membuka halaman direktori (atau me-reset tabel hangat) lalu menerapkan panjang halaman, filter dan urutan.'''
+        if self.reuse_table and not reload and is_table_warm(self.driver, self.url, self.table_id):
+            print(f"    {self.label}Memakai ulang tabel yang sudah dimuat.")
+            if not reset_table(self.driver, self.timeout, self.table_id):
+                return self.open(reload=True)
+        elif not prepare_table(self.driver, self.url, self.timeout, self.table_id):
+            return False
+        if not ensure_page_length(self.driver, self.page_size, self.timeout, self.table_id):
+            print(f"    {self.label}Gagal mengatur {self.page_size} baris per halaman, offset halaman tidak bisa dijamin.")
+            return False
+        if self.filters and not filter_table(self.driver, self.filters, self.timeout, self.directory):
+            print(f"    {self.label}Gagal menerapkan filter, berhenti agar tidak meng-crawl seluruh direktori.")
+            return False
+        if self.order and not sort_table(self.driver, *self.order, timeout=self.timeout, directory=self.directory):
+            print(f"    {self.label}Gagal mengurutkan tabel, berhenti agar urutan halaman tidak acak.")
+            return False
+        return True
+    
+    def check_page(self, page, quiet=False):
+        '''Info #table_info jika tabel sedang menampilkan halaman page (1-based), None jika tidak.'''
+        try:
+            info = read_table_info(self.driver, self.table_id)
+        except Exception as e:
+            if not quiet:
+                print(f"    {self.label}Gagal membaca #table_info: {e}")
+            return None
+        if not info:
+            return None
+        expected_start = (page - 1) * self.page_size + 1
+        if info['total'] == 0 or info['start'] == expected_start:
+            return info
+        if not quiet:
+            print(f"    ⚠️  {self.label}#table_info menunjukkan baris {info['start']}-{info['end']}, "
+                  f"diharapkan mulai dari {expected_start} (halaman {page})")
+        return None
+    
+    def go_to(self, page):
+        '''Memastikan tabel berada di halaman page (lompat langsung bila perlu), memulihkan jika gagal.'''
+        if self.check_page(page, quiet=True):
+            return True
+        if jump_to_page(self.driver, page, self.timeout, self.table_id) and self.check_page(page):
+            return True
+        return self.recover(page)
+    
+    def next_page(self, page):
+        '''Pindah dari page ke page + 1 lewat tombol Next, memulihkan posisi jika klik atau draw gagal.'''
+        if go_to_next_page(self.driver, self.timeout, self.table_id) and self.check_page(page + 1):
+            return True
+        return self.recover(page + 1)
+    
+    def extract(self, page):
+        '''Mengekstrak halaman page tepat sekali; None jika posisinya tidak bisa diverifikasi.'''
+        for attempt in range(self.max_attempts):
+            info = self.check_page(page)
+            if info is None:
+                if not self.recover(page):
+                    return None
+                continue
+            
+            page_data = self.extractor(self.driver, self.directory)
+            expected_rows = info['end'] - info['start'] + 1 if info['total'] else 0
+            # Baris berdata utama kosong tetap dihitung karena memang ada di tabel; kekurangan lain
+            # (render setengah jadi, baris "Loading") berarti halaman gagal dan harus diulang
+            rendered_rows = len(page_data) + getattr(page_data, 'skipped_rows', 0)
+            after = self.check_page(page)
+            # Tabel di-draw ulang selama ekstraksi atau jumlah baris tidak sama persis dengan "Showing X to Y"
+            if after is not None and after['text'] == info['text'] and rendered_rows == expected_rows:
+                self.last_range = [info['start'] - 1, info['end']] if info['total'] else [0, 0]
+                return page_data
+            
+            print(f"    ⚠️  {self.label}Ekstraksi halaman {page} tidak konsisten dengan #table_info "
+                  f"({rendered_rows} baris, diharapkan {expected_rows}), mengulang...")
+            RUN_METRICS.incr('retries')
+            if not self.recover(page):
+                return None
+        return None
+    
+    def recover(self, page):
+        '''Memuat ulang tabel (atau membuat ulang driver) dan kembali ke halaman page dengan backoff.'''
+        for attempt in range(self.max_attempts):
+            delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+            print(f"    🔁 {self.label}Memulihkan tabel ke halaman {page} (percobaan {attempt + 1}/{self.max_attempts}, "
+                  f"tunggu {delay:.0f} detik)...")
+            RUN_METRICS.incr('recoveries')
+            time.sleep(delay)
+            try:
+                if not is_driver_alive(self.driver):
+                    if not self._recycle_driver():
+                        continue
+                else:
+                    RUN_METRICS.incr('refreshes')
+                if self.open(reload=True) and jump_to_page(self.driver, page, self.timeout, self.table_id) and \
+                        self.check_page(page):
+                    print(f"    {self.label}Tabel kembali ke halaman {page}.")
+                    return True
+            except Exception as e:
+                print(f"    {self.label}Pemulihan gagal: {e}")
+        print(f"    ❌ {self.label}Gagal memulihkan tabel ke halaman {page} setelah {self.max_attempts} percobaan.")
+        return False
+    
+    def _recycle_driver(self):
+        if self.driver_factory is None:
+            print(f"    {self.label}Sesi WebDriver tidak merespons dan tidak ada driver_factory untuk membuat ulang.")
+            return False
+        print(f"    {self.label}Sesi WebDriver tidak merespons, membuat driver baru...")
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+        self.driver = self.driver_factory()
+        RUN_METRICS.incr('driver_recycles')
+        return self.driver is not None
+    
+    def quit(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+def split_page_ranges(total_pages, workers):
+    '''Membagi halaman 1..total_pages menjadi rentang berurutan untuk tiap worker.'''
+    workers = max(1, min(workers, total_pages))
+    base, extra = divmod(total_pages, workers)
+    ranges = []
+    first_page = 1
+    for i in range(workers):
+        size = base + (1 if i < extra else 0)
+        ranges.append((first_page, first_page + size - 1))
+        first_page += size
+    return ranges
+
+def deduplicate_rows(rows, seen=None, key_fields=ROW_KEY_FIELDS):
+    '''Menghapus baris duplikat berdasarkan key_fields, mempertahankan urutan pertama.
+
+    Mengembalikan RecordBatch; set seen bisa dipakai ulang antar halaman saat streaming.
+    '''
+    rows = RecordBatch.from_rows(rows)
+    if seen is None:
+        seen = set()
+    unique_indices = []
+    for i, key in enumerate(rows.iter_tuples(key_fields)):
+        if key in seen:
+            continue
+        seen.add(key)
+        unique_indices.append(i)
+    return rows if len(unique_indices) == len(rows) else rows.take(unique_indices)
+
+def iter_page_range(navigator, first_page, last_page, shard_id=0):
+    '''Generator halaman first_page..last_page dari TableNavigator yang tabelnya sudah siap.'''
+    if not navigator.go_to(first_page):
+        print(f"  [Shard {shard_id}] Gagal lompat ke halaman {first_page}")
+        return
+    
+    for page_number in range(first_page, last_page + 1):
+        print(f"\n  [Shard {shard_id}] Scraping halaman {page_number} (rentang {first_page}-{last_page})...")
+        page_data = navigator.extract(page_number)
+        if page_data is None:
+            print(f"  [Shard {shard_id}] Halaman {page_number} tidak bisa diekstrak pada posisi yang terverifikasi")
+            break
+        yield page_data
         
+        if page_number >= last_page:
+            break
+        if not navigator.next_page(page_number):
+            print(f"  [Shard {shard_id}] Tidak bisa melanjutkan setelah halaman {page_number}")
+            break
+
+# Penanda akhir pekerjaan satu shard pada antrean hasil
+_SHARD_DONE = object()
+
+def _run_shard(webdriver_executable_path, first_page, last_page, shard_id, results, stop, driver=None,
+               url=None, filters=None, directory=None, page_size=100):
+    '''Worker shard: membuat driver headless sendiri (jika belum ada) lalu mengirim tiap halaman ke antrean.
+
+    Driver yang crash di tengah rentang dibuat ulang oleh TableNavigator dan dikembalikan ke
+    halaman terakhir shard ini, bukan ke halaman pertama rentangnya.
+    '''
+    navigator = None
     try:
-        fieldnames = data_list[0].keys()
+        factory = partial(setup_driver, webdriver_executable_path, headless=True)
+        opened = driver is not None
+        if driver is None:
+            driver = factory()
+            if not driver:
+                return
+        navigator = TableNavigator(driver, url, page_size=page_size, filters=filters, driver_factory=factory,
+                                   label=f"[Shard {shard_id}] ", directory=directory)
+        if not opened and not navigator.open():
+            return
         
+        for page_data in iter_page_range(navigator, first_page, last_page, shard_id):
+            if stop.is_set():
+                break
+            # Rentang offset halaman yang terverifikasi #table_info, untuk rekonsiliasi
+            results.put((shard_id, filter_rows(page_data, filters), navigator.last_range))
+    except Exception as e:
+        print(f"  [Shard {shard_id}] Error: {e}")
+    finally:
+        if navigator is not None:
+            navigator.quit()
+        elif driver:
+            driver.quit()
+        results.put((shard_id, _SHARD_DONE, None))
+
+def _iter_shard_pages(webdriver_executable_path, workers=None, max_pages=None, url=None, filters=None,
+                      directory=None, page_size=100, progress=None):
+    '''Menjalankan worker shard dan menghasilkan (shard_id, page_data, page_range) sesuai urutan selesai.
+
+    page_range adalah rentang offset [start, end) halaman menurut #table_info; total entri
+    tabel dicatat ke progress (jika diberikan) dari driver pertama.
+    '''
+    workers = workers or os.cpu_count() or 1
+    
+    # Driver pertama dipakai untuk membaca total halaman, lalu menjadi worker shard 0
+    probe_driver = setup_driver(webdriver_executable_path, headless=True)
+    if not probe_driver:
+        return
+    if not TableNavigator(probe_driver, url, page_size=page_size, filters=filters, directory=directory).open():
+        probe_driver.quit()
+        return
+    
+    table_id = get_directory(directory).table_id
+    total_pages = get_total_pages(probe_driver, page_size, table_id)
+    if max_pages:
+        total_pages = min(total_pages, max_pages)
+    table_info = read_table_info(probe_driver, table_id)
+    if progress is not None and table_info:
+        _track_total_entries(progress, table_info['total'], table_info['text'])
+    
+    page_ranges = split_page_ranges(total_pages, workers)
+    print(f"    Membagi {total_pages} halaman ke {len(page_ranges)} worker: {page_ranges}")
+    
+    # Antrean terbatas agar worker tidak menumpuk halaman lebih cepat dari penulisan output
+    results = queue.Queue(maxsize=len(page_ranges) * 2)
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=len(page_ranges)) as executor:
+        for shard_id, (first_page, last_page) in enumerate(page_ranges):
+            driver = probe_driver if shard_id == 0 else None
+            executor.submit(_run_shard, webdriver_executable_path, first_page, last_page, shard_id, results, stop,
+                            driver, url, filters, directory, page_size)
+        
+        running = len(page_ranges)
+        try:
+            while running:
+                shard_id, page_data, page_range = results.get()
+                if page_data is _SHARD_DONE:
+                    running -= 1
+                    continue
+                yield shard_id, page_data, page_range
+        finally:
+            # Jika konsumen berhenti lebih awal, kosongkan antrean agar worker bisa selesai
+            stop.set()
+            while running:
+                _, page_data, _ = results.get()
+                if page_data is _SHARD_DONE:
+                    running -= 1
+
+def iter_banpt_prodi_sharded_pages(webdriver_executable_path, workers=None, max_pages=None, url=None,
+                                   filters=None, directory=None, page_size=100, progress=None):
+    '''Generator halaman dari crawl paralel, baris duplikat antar shard dibuang saat streaming.
+
+    Seperti engine selenium, progress mendapat total_entries dan page_range tiap halaman
+    (urutan selesai antar shard tidak berurutan) sehingga ReconciliationTracker bisa
+    menghitung offset yang hilang. Halaman yang seluruh barisnya duplikat tetap dihasilkan
+    (kosong) agar rentangnya tercatat.
+    '''
+    if progress is None:
+        progress = {}
+    progress.update(mode='sharded', page_size=page_size, completed=False)
+    seen = set()
+    key_fields = get_directory(directory).key_fields
+    for _, page_data, page_range in _iter_shard_pages(webdriver_executable_path, workers, max_pages, url, filters,
+                                                      directory, page_size, progress):
+        progress['page_range'] = page_range
+        yield deduplicate_rows(page_data, seen, key_fields)
+
+def scrape_banpt_prodi_sharded(webdriver_executable_path, workers=None, max_pages=None, url=BANPT_PRODI_URL,
+                               filters=None):
+    '''Scraping paralel dengan beberapa WebDriver headless, tiap worker memegang satu rentang halaman.
+
+    filters harus satu kombinasi bernilai tunggal (lihat expand_filters).
+    '''
+    shard_data = {}
+    for shard_id, page_data, _ in _iter_shard_pages(webdriver_executable_path, workers, max_pages, url, filters):
+        shard_data.setdefault(shard_id, RecordBatch()).extend(page_data)
+    
+    # Gabungkan sesuai urutan shard agar urutan halaman tetap terjaga
+    merged_data = RecordBatch.concat(shard_data[shard_id] for shard_id in sorted(shard_data))
+    
+    all_data = deduplicate_rows(merged_data)
+    print(f"    Digabung {len(merged_data)} baris dari {len(shard_data)} shard, {len(merged_data) - len(all_data)} duplikat dihapus")
+    return all_data
+
+def discover_ajax_endpoint(driver, table_id='table'):
+    '''Menangkap endpoint JSON di balik tabel table_id dari halaman yang sudah dimuat.'''
+    try:
+        info = driver.execute_script("""
+            var table = $('#' + arguments[0]).DataTable();
+            var settings = table.settings()[0];
+            var ajax = settings.ajax;
+            var method = 'GET';
+            if (ajax && typeof ajax === 'object') {
+                method = ajax.type || ajax.method || 'GET';
+            }
+            return {
+                url: table.ajax.url() || settings.sAjaxSource,
+                method: method.toUpperCase(),
+                params: table.ajax.params() || {},
+                server_side: !!settings.oFeatures.bServerSide
+            };
+        """, table_id)
+    except Exception as e:
+        print(f"    Error saat membaca konfigurasi AJAX DataTables: {e}")
+        return None
+    
+    if not info or not info.get('url'):
+        print("    Endpoint AJAX tidak ditemukan pada DataTables.")
+        return None
+    
+    cookies = "; ".join(f"{c['name']}={c['value']}" for c in driver.get_cookies())
+    endpoint = {
+        'url': urljoin(driver.current_url, info['url']),
+        'method': info.get('method') or 'GET',
+        'params': info.get('params') or {},
+        'server_side': info.get('server_side', True),
+        'referer': driver.current_url,
+        'cookies': cookies,
+    }
+    print(f"    Endpoint AJAX ditemukan: {endpoint['method']} {endpoint['url']} (server-side: {endpoint['server_side']})")
+    return endpoint
+
+def default_datatables_params(column_count=PRODI_DIRECTORY.width):
+    '''Parameter server-side DataTables standar untuk endpoint yang diketahui tanpa browser.'''
+    return {
+        'columns': [
+            {'data': i, 'name': '', 'searchable': True, 'orderable': True,
+             'search': {'value': '', 'regex': False}}
+            for i in range(column_count)
+        ],
+        'order': [{'column': 0, 'dir': 'asc'}],
+        'search': {'value': '', 'regex': False},
+    }
+
+def datatables_filter_params(params, filters, directory=None):
+    '''Salinan parameter DataTables dengan satu kombinasi filter di search dan columns[i][search].'''
+    directory = get_directory(directory)
+    params = dict(params or {})
+    columns = [dict(column) for column in
+               (params.get('columns') or default_datatables_params(directory.width)['columns'])]
+    for name, value in filters.items():
+        if name == SEARCH_FILTER_KEY:
+            params['search'] = {'value': value, 'regex': False}
+            continue
+        index = directory.column_index(name)
+        columns[index] = dict(columns[index], searchable=True, search={'value': value, 'regex': False})
+    params['columns'] = columns
+    return params
+
+def make_ajax_endpoint(url, method='GET', params=None, server_side=True, referer=BANPT_PRODI_URL, directory=None):
+    '''Membuat dict endpoint AJAX secara manual (tanpa discover_ajax_endpoint).'''
+    return {
+        'url': url,
+        'method': method.upper(),
+        'params': params if params is not None else default_datatables_params(get_directory(directory).width),
+        'server_side': server_side,
+        'referer': referer,
+        'cookies': "",
+    }
+
+def save_ajax_endpoint(endpoint, path):
+    '''Menyimpan endpoint hasil discovery agar run berikutnya tidak perlu membuka browser.'''
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(endpoint, f, indent=2, ensure_ascii=False)
+
+def load_ajax_endpoint(path):
+    '''Membaca endpoint yang tersimpan; None jika belum ada.'''
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def flatten_datatables_params(params, prefix=""):
+    '''Meratakan parameter DataTables bersarang ke format jQuery.param (columns[0][data]=...).'''
+    items = []
+    if isinstance(params, dict):
+        for key, value in params.items():
+            name = f"{prefix}[{key}]" if prefix else str(key)
+            items.extend(flatten_datatables_params(value, name))
+    elif isinstance(params, (list, tuple)):
+        for i, value in enumerate(params):
+            items.extend(flatten_datatables_params(value, f"{prefix}[{i}]"))
+    elif isinstance(params, bool):
+        items.append((prefix, "true" if params else "false"))
+    elif params is None:
+        items.append((prefix, ""))
+    else:
+        items.append((prefix, str(params)))
+    return items
+
+class HttpStatusError(Exception):
+    '''Respons HTTP dengan status error (4xx/5xx).'''
+    
+    def __init__(self, status, url, retry_after=None):
+        super().__init__(f"HTTP {status} dari {url.split('?', 1)[0]}")
+        self.status = status
+        self.url = url
+        self.retry_after = retry_after
+    
+    @property
+    def retryable(self):
+        return self.status == 429 or self.status >= 500
+
+class HttpSession:
+    '''Klien HTTP dengan koneksi keep-alive per thread per host, kompresi gzip/brotli dan metrik per host.
+
+    Metrik per host mencatat jumlah koneksi yang dibuka (rasio pakai ulang keep-alive) serta
+    byte di jaringan (body terkompresi) dibanding byte setelah didekompresi.
+    '''
+    
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.host_metrics = {}
+        encodings = ['gzip', 'deflate'] + (['br'] if brotli else [])
+        self.accept_encoding = ', '.join(encodings)
+    
+    def _get_connection(self, scheme, netloc):
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        connection = connections.get((scheme, netloc))
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            connection = connection_class(netloc, timeout=self.timeout)
+            connections[(scheme, netloc)] = connection
+            with self._lock:
+                self._prune_connections()
+                self._connections.append((threading.current_thread(), connection))
+        return connection
+    
+    def _prune_connections(self):
+        # Dipanggil dengan self._lock sudah dipegang; koneksi milik thread yang sudah selesai
+        # (mis. worker pool yang diganti) tidak akan dipakai lagi, jadi ditutup dan dilepas
+        alive = []
+        for thread, connection in self._connections:
+            if thread.is_alive():
+                alive.append((thread, connection))
+            else:
+                connection.close()
+        self._connections = alive
+    
+    def _drop_connection(self, scheme, netloc):
+        connection = self._local.connections.pop((scheme, netloc), None)
+        if connection:
+            connection.close()
+            with self._lock:
+                self._connections = [entry for entry in self._connections if entry[1] is not connection]
+    
+    def _host_metrics(self, host):
+        # Dipanggil dengan self._lock sudah dipegang
+        return self.host_metrics.setdefault(host, {
+            'requests': 0, 'errors': 0, 'connections': 0, 'bytes': 0, 'decoded_bytes': 0, 'statuses': {},
+            'latencies': [], 'first_request': time.time(), 'last_response': None,
+        })
+    
+    def _record(self, host, latency, status=None, received=0, error=False):
+        with self._lock:
+            metrics = self._host_metrics(host)
+            metrics['requests'] += 1
+            metrics['bytes'] += received
+            metrics['latencies'].append(latency)
+            metrics['last_response'] = time.time()
+            if error:
+                metrics['errors'] += 1
+            if status is not None:
+                metrics['statuses'][str(status)] = metrics['statuses'].get(str(status), 0) + 1
+    
+    def request(self, method, url, body=None, headers=None):
+        '''Mengirim request dan mengembalikan body yang sudah didekompresi (bytes).'''
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        headers = dict(headers or {})
+        headers.setdefault('Accept-Encoding', self.accept_encoding)
+        headers.setdefault('Connection', 'keep-alive')
+        
+        started = time.perf_counter()
+        for attempt in range(2):
+            connection = self._get_connection(parts.scheme, parts.netloc)
+            if connection.sock is None:
+                # Socket baru (koneksi pertama atau dibuka ulang otomatis oleh http.client)
+                with self._lock:
+                    self._host_metrics(parts.netloc)['connections'] += 1
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                raw = response.read()
+                break
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine, BrokenPipeError,
+                    ConnectionResetError):
+                # Koneksi keep-alive ditutup server: buka ulang sekali
+                self._drop_connection(parts.scheme, parts.netloc)
+                if attempt:
+                    self._record(parts.netloc, time.perf_counter() - started, error=True)
+                    raise
+            except OSError:
+                self._drop_connection(parts.scheme, parts.netloc)
+                self._record(parts.netloc, time.perf_counter() - started, error=True)
+                raise
+        
+        latency = time.perf_counter() - started
+        self._record(parts.netloc, latency, response.status, len(raw), error=response.status >= 400)
+        if response.getheader('Connection', '').lower() == 'close':
+            self._drop_connection(parts.scheme, parts.netloc)
+        
+        if response.status >= 400:
+            retry_after = response.getheader('Retry-After')
+            raise HttpStatusError(response.status, url,
+                                  float(retry_after) if retry_after and retry_after.isdigit() else None)
+        
+        encoding = response.getheader('Content-Encoding', '').lower()
+        if encoding == 'gzip':
+            raw = gzip.decompress(raw)
+        elif encoding == 'deflate':
+            raw = zlib.decompress(raw)
+        elif encoding == 'br' and brotli:
+            raw = brotli.decompress(raw)
+        with self._lock:
+            self._host_metrics(parts.netloc)['decoded_bytes'] += len(raw)
+        return raw
+    
+    def metrics_report(self):
+        '''Ringkasan metrik per host: jumlah request, pakai ulang koneksi, byte, laju, latensi dan status.'''
+        report = {}
+        with self._lock:
+            for host, metrics in self.host_metrics.items():
+                latencies = sorted(metrics['latencies'])
+                duration = (metrics['last_response'] or metrics['first_request']) - metrics['first_request']
+                requests = metrics['requests']
+                report[host] = {
+                    'requests': requests,
+                    'errors': metrics['errors'],
+                    'connections': metrics['connections'],
+                    # Porsi request yang memakai koneksi keep-alive yang sudah terbuka
+                    'connection_reuse_ratio': max(0, requests - metrics['connections']) / requests if requests else None,
+                    'bytes': metrics['bytes'],
+                    'decoded_bytes': metrics['decoded_bytes'],
+                    'statuses': dict(metrics['statuses']),
+                    'requests_per_second': metrics['requests'] / duration if duration > 0 else None,
+                    'latency_avg': sum(latencies) / len(latencies) if latencies else None,
+                    'latency_p50': latencies[len(latencies) // 2] if latencies else None,
+                    'latency_p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None,
+                    'latency_max': latencies[-1] if latencies else None,
+                }
+        return report
+    
+    def print_summary(self):
+        for host, metrics in self.metrics_report().items():
+            if not metrics['requests']:
+                continue
+            rate = f"{metrics['requests_per_second']:.1f} req/detik" if metrics['requests_per_second'] else "-"
+            reuse = f"{metrics['connection_reuse_ratio']:.0%}" if metrics['connection_reuse_ratio'] is not None else "-"
+            print(f"🌐 {host}: {metrics['requests']} request ({rate}), {metrics['errors']} error, "
+                  f"{metrics['connections']} koneksi (pakai ulang {reuse}), "
+                  f"{metrics['bytes'] / 1024:.0f} KB di jaringan / {metrics['decoded_bytes'] / 1024:.0f} KB didekompresi, "
+                  f"latensi rata-rata {metrics['latency_avg']:.3f}s "
+                  f"p50 {metrics['latency_p50']:.3f}s p95 {metrics['latency_p95']:.3f}s, status {metrics['statuses']}")
+    
+    def close(self):
+        with self._lock:
+            for _, connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
+
+# Sesi default untuk pemanggilan fetch_datatables_page tanpa sesi eksplisit
+HTTP_SESSION = HttpSession()
+
+@spanned('fetch')
+def fetch_datatables_page(endpoint, start, length, draw=1, session=None):
+    '''Mengambil satu halaman JSON langsung dari endpoint DataTables.'''
+    session = session or HTTP_SESSION
+    params = dict(endpoint.get('params') or {})
+    params['draw'] = draw
+    params['start'] = start
+    params['length'] = length
+    query = urlencode(flatten_datatables_params(params))
+    
+    headers = {
+        'User-Agent': COMMON_USER_AGENT,
+        'Accept': 'application/json, text/javascript, */*; q=0.01',
+        'X-Requested-With': 'XMLHttpRequest',
+    }
+    if endpoint.get('referer'):
+        headers['Referer'] = endpoint['referer']
+    if endpoint.get('cookies'):
+        headers['Cookie'] = endpoint['cookies']
+    
+    url = endpoint['url']
+    if endpoint.get('method', 'GET') == 'POST':
+        headers['Content-Type'] = 'application/x-www-form-urlencoded; charset=UTF-8'
+        raw = session.request('POST', url, body=query.encode('utf-8'), headers=headers)
+    else:
+        separator = '&' if '?' in url else '?'
+        raw = session.request('GET', f"{url}{separator}{query}", headers=headers)
+    
+    payload = json.loads(raw.decode('utf-8'))
+    
+    if isinstance(payload, list):
+        rows = payload
+        total = len(rows)
+    else:
+        rows = payload.get('data', payload.get('aaData', []))
+        total = payload.get('recordsFiltered', payload.get('iTotalDisplayRecords', len(rows)))
+    return rows, int(total)
+
+class AimdLimiter:
+    '''Pembatas request paralel adaptif (additive increase, multiplicative decrease).
+
+    Batas naik perlahan selama latensi di bawah target, turun ke separuh ketika server
+    membalas 429/5xx atau koneksi gagal, disertai jeda backoff eksponensial global.
+    '''
+    
+    def __init__(self, initial=2, min_limit=1, max_limit=8, target_latency=2.0, backoff_base=1.0, backoff_max=60.0):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.backoff = backoff_base
+        self.backoff_until = 0.0
+        self.in_flight = 0
+        self.throttle_events = 0
+        self.peak_limit = self.limit
+        self._condition = threading.Condition()
+    
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= max(self.min_limit, int(self.limit)):
+                self._condition.wait()
+            self.in_flight += 1
+            delay = self.backoff_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    
+    def release(self, latency=None, throttled=False, retry_after=None):
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.throttle_events += 1
+                self.limit = max(self.min_limit, self.limit / 2)
+                wait = max(self.backoff, retry_after or 0)
+                self.backoff_until = max(self.backoff_until, time.monotonic() + wait)
+                self.backoff = min(self.backoff * 2, self.backoff_max)
+            elif latency is not None:
+                self.backoff = self.backoff_base
+                if latency > self.target_latency:
+                    self.limit = max(self.min_limit, self.limit * 0.9)
+                else:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+                self.peak_limit = max(self.peak_limit, self.limit)
+            self._condition.notify_all()
+    
+    def print_summary(self):
+        print(f"🚦 Konkurensi adaptif: batas akhir {self.limit:.1f}, puncak {self.peak_limit:.1f}, "
+              f"{self.throttle_events} kali throttle/backoff")
+
+def fetch_datatables_page_with_retry(endpoint, start, length, draw, limiter, session=None, max_retries=5):
+    '''fetch_datatables_page yang diatur AimdLimiter dan diulang saat 429/5xx atau error jaringan.'''
+    last_error = None
+    for attempt in range(max_retries + 1):
+        limiter.acquire()
+        started = time.perf_counter()
+        try:
+            result = fetch_datatables_page(endpoint, start, length, draw, session=session)
+        except HttpStatusError as e:
+            limiter.release(throttled=e.retryable, retry_after=e.retry_after)
+            if not e.retryable:
+                raise
+            last_error = e
+        except (OSError, http.client.HTTPException) as e:
+            limiter.release(throttled=True)
+            last_error = e
+        else:
+            limiter.release(latency=time.perf_counter() - started)
+            return result
+        RUN_METRICS.incr('retries')
+        print(f"    Percobaan {attempt + 1} offset {start} gagal: {last_error}, mengulang...")
+    raise last_error
+
+def map_json_rows(json_rows, scraped_at=None, directory=None):
+    '''Mengubah baris JSON DataTables menjadi RecordBatch dengan skema extract_table_data.'''
+    cell_rows = ([clean_cell_text(value) for value in (json_row.values() if isinstance(json_row, dict) else json_row)]
+                 for json_row in json_rows)
+    return RecordBatch.from_cells(cell_rows, scraped_at, directory)
+
+def _apply_endpoint_query(endpoint, order=None, filters=None, directory=None):
+    '''Salinan endpoint dengan parameter order dan filter DataTables.'''
+    if order:
+        column_name, direction = order
+        params = dict(endpoint.get('params') or {})
+        params['order'] = [{'column': get_directory(directory).column_index(column_name), 'dir': direction}]
+        endpoint = dict(endpoint, params=params)
+    if filters:
+        endpoint = dict(endpoint, params=datatables_filter_params(endpoint.get('params'), filters, directory))
+    return endpoint
+
+def iter_banpt_prodi_ajax_pages(endpoint, page_size=1000, max_pages=None, start_page=1, progress=None, order=None,
+                                session=None, limiter=None, filters=None, directory=None):
+    '''Generator halaman dari endpoint JSON DataTables tanpa klik halaman di browser.
+
+    Halaman pertama diambil sendiri untuk mengetahui total entri, sisanya diambil paralel
+    sesuai batas AimdLimiter namun tetap di-yield berurutan (aman untuk checkpoint).
+    Baris JSON dipetakan ke kolom directory (DirectorySchema, default prodi).
+    '''
+    if progress is None:
+        progress = {}
+    if limiter is None:
+        limiter = AimdLimiter()
+    endpoint = _apply_endpoint_query(endpoint, order, filters, directory)
+    progress.update(mode='http', page_size=page_size, completed=False)
+    
+    def fetch_page(page):
+        return fetch_datatables_page_with_retry(endpoint, (page - 1) * page_size, page_size, page, limiter, session)
+    
+    try:
+        if not endpoint.get('server_side', True):
+            # DataTables client-side: seluruh data dikirim dalam satu respons
+            print("    Tabel memuat data di sisi klien, mengambil semua data sekaligus...")
+            json_rows, total_entries = fetch_datatables_page_with_retry(endpoint, 0, -1, 1, limiter, session)
+            # Parameter search diabaikan tabel client-side, jadi seluruh filter diterapkan lokal
+            all_rows = filter_rows(map_json_rows(json_rows, directory=directory), filters, local_search=True)
+            _track_total_entries(progress, len(all_rows))
+            if max_pages:
+                all_rows = all_rows[:max_pages * page_size]
+            total_pages = (len(all_rows) + page_size - 1) // page_size
+            for page in range(start_page, total_pages + 1):
+                start = (page - 1) * page_size
+                page_rows = all_rows[start:start + page_size]
+                progress['page'] = page
+                progress['page_range'] = [start, start + len(page_rows)]
+                progress['completed'] = page >= total_pages
+                yield page_rows
+            print(f"    +{len(all_rows)} baris dari endpoint AJAX")
+            return
+        
+        print(f"\n  Mengambil data AJAX mulai offset {(start_page - 1) * page_size}...")
+        json_rows, total_entries = fetch_page(start_page)
+        total_pages = (total_entries + page_size - 1) // page_size
+        if max_pages:
+            total_pages = min(total_pages, max_pages)
+        print(f"    Total entries: {total_entries}, Total halaman: {total_pages} (@{page_size} per halaman)")
+        _track_total_entries(progress, total_entries)
+        
+        # Jendela prefetch dibatasi agar memori tetap konstan meski halaman tiba tidak berurutan
+        window = limiter.max_limit * 2
+        pending = {}
+        next_to_submit = start_page + 1
+        collected = 0
+        page = start_page
+        
+        with ThreadPoolExecutor(max_workers=limiter.max_limit) as executor:
+            try:
+                while True:
+                    page_data = filter_rows(map_json_rows(json_rows, directory=directory), filters)
+                    collected += len(page_data)
+                    print(f"    +{len(page_data)} data dari halaman {page} ({collected} data terkumpul)")
+                    
+                    finished = not json_rows or page >= total_pages
+                    progress['page'] = page
+                    progress['page_range'] = [(page - 1) * page_size, (page - 1) * page_size + len(json_rows)]
+                    progress['completed'] = finished
+                    yield page_data
+                    
+                    if finished:
+                        break
+                    
+                    while next_to_submit <= total_pages and len(pending) < window:
+                        pending[next_to_submit] = executor.submit(fetch_page, next_to_submit)
+                        next_to_submit += 1
+                    
+                    page += 1
+                    json_rows, _ = pending.pop(page).result()
+            finally:
+                for future in pending.values():
+                    future.cancel()
+    
+    except Exception as e:
+        print(f"Error dalam scraping AJAX: {e}")
+        progress['error'] = f"{type(e).__name__}: {e}"
+        raise
+
+def iter_banpt_prodi_ajax_ranges(endpoint, ranges, page_size=1000, progress=None, session=None, limiter=None,
+                                 filters=None, directory=None):
+    '''Mengambil ulang rentang offset [start, end) tertentu dari endpoint JSON (end None = sampai akhir).'''
+    if progress is None:
+        progress = {}
+    if limiter is None:
+        limiter = AimdLimiter()
+    endpoint = _apply_endpoint_query(endpoint, filters=filters, directory=directory)
+    progress.update(mode='http', page_size=page_size)
+    
+    try:
+        if not endpoint.get('server_side', True):
+            json_rows, _ = fetch_datatables_page_with_retry(endpoint, 0, -1, 1, limiter, session)
+            all_rows = filter_rows(map_json_rows(json_rows, directory=directory), filters, local_search=True)
+            _track_total_entries(progress, len(all_rows))
+            for start, end in ranges:
+                end = len(all_rows) if end is None else min(end, len(all_rows))
+                for chunk_start in range(start, end, page_size):
+                    chunk_end = min(end, chunk_start + page_size)
+                    progress['page_range'] = [chunk_start, chunk_end]
+                    yield all_rows[chunk_start:chunk_end]
+            return
+        
+        draw = 1
+        for start, end in ranges:
+            offset = start
+            while end is None or offset < end:
+                length = page_size if end is None else min(page_size, end - offset)
+                json_rows, total_entries = fetch_datatables_page_with_retry(endpoint, offset, length, draw, limiter,
+                                                                            session)
+                draw += 1
+                _track_total_entries(progress, total_entries)
+                if end is None or end > total_entries:
+                    end = total_entries
+                print(f"    +{len(json_rows)} baris dari offset {offset}")
+                progress['page_range'] = [offset, offset + len(json_rows)]
+                yield filter_rows(map_json_rows(json_rows, directory=directory), filters)
+                if not json_rows:
+                    break
+                offset += len(json_rows)
+    except Exception as e:
+        print(f"Error saat mengambil ulang rentang AJAX: {e}")
+        progress['error'] = f"{type(e).__name__}: {e}"
+        raise
+
+def scrape_banpt_prodi_via_ajax(endpoint, page_size=1000, max_pages=None, filters=None):
+    '''Scraping langsung ke endpoint JSON DataTables tanpa klik halaman di browser.'''
+    def iter_pages(**kwargs):
+        return iter_banpt_prodi_ajax_pages(endpoint, page_size=page_size, **kwargs)
+    tracker = ReconciliationTracker(max_pages)
+    all_data = RecordBatch.concat(iter_filter_combinations(iter_pages, filters, max_pages=max_pages, tracker=tracker))
+    tracker.print_summary()
+    return all_data
+
+class ScrapeEngine:
+    '''Antarmuka engine scraping: start(), iter_pages() per halaman, lalu close().
+
+    directory (DirectorySchema) menentukan halaman, kolom dan kunci baris yang di-scrape.
+    '''
+    
+    name = None
+    directory = PRODI_DIRECTORY
+    
+    def start(self):
+        raise NotImplementedError
+    
+    def iter_pages(self, max_pages=None, start_page=1, progress=None, order=None, filters=None):
+        '''Generator halaman; filters berupa satu kombinasi filter bernilai tunggal (lihat expand_filters).'''
+        raise NotImplementedError
+    
+    def iter_ranges(self, ranges, progress=None, filters=None):
+        '''Generator halaman yang hanya mencakup rentang offset [start, end) tertentu (untuk --refetch-missing).'''
+        raise NotImplementedError(f"Engine {self.name} tidak mendukung pengambilan ulang per rentang offset")
+    
+    def warm_up(self):
+        '''Menyiapkan sesi sekali di awal agar run berikutnya bisa langsung mem-paging (opsional).'''
+        pass
+    
+    def print_summary(self):
+        '''Menampilkan metrik khusus engine di akhir run (opsional).'''
+        pass
+    
+    def metrics(self):
+        '''Metrik khusus engine untuk laporan run JSON (opsional).'''
+        return {}
+    
+    def close(self):
+        pass
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class SeleniumEngine(ScrapeEngine):
+    '''Engine Chrome: membuka halaman direktori dan berpindah halaman lewat DataTables.
+
+    Dengan snapshots=True, browser hanya mengambil outerHTML #table per halaman dan parsing
+    dilakukan parse_workers process (0 = di proses ini) sementara browser lanjut ke halaman
+    berikutnya. snapshot_dir mengarsipkan HTML tersebut untuk diparse ulang nanti.
+    '''
+    
+    name = 'selenium'
+    
+    def __init__(self, webdriver_executable_path="", headless=False, page_delay=0, url=None,
+                 keep_warm=False, timeout=20, snapshots=False, snapshot_dir=None, parse_workers=None,
+                 html_parser=None, directory=None, page_size=100):
+        self.webdriver_executable_path = webdriver_executable_path
+        self.headless = headless
+        self.page_delay = page_delay
+        # Baris per halaman tabel (table.page.len()), menentukan offset tiap halaman
+        self.page_size = page_size
+        self.directory = get_directory(directory)
+        self.url = url or self.directory.url
+        self.timeout = timeout
+        # keep_warm: tabel yang sudah dimuat dipakai ulang antar run, bukan dibuka ulang
+        self.keep_warm = keep_warm
+        self.snapshots = snapshots or bool(snapshot_dir)
+        self.snapshot_dir = snapshot_dir
+        self.parse_workers = parse_workers
+        self.html_parser = html_parser
+        self.driver = None
+        self.navigator = None
+        self._parse_pool = None
+    
+    def _create_driver(self):
+        return setup_driver(self.webdriver_executable_path, headless=self.headless)
+    
+    def start(self):
+        self.driver = self._create_driver()
+        if not self.driver:
+            raise RuntimeError("Gagal setup WebDriver")
+    
+    def _new_navigator(self, filters=None, order=None, snapshots=False):
+        # Driver bisa sudah diganti navigator sebelumnya jika sesi lama crash
+        if self.navigator is not None:
+            self.driver = self.navigator.driver
+        self.navigator = TableNavigator(self.driver, self.url, page_size=self.page_size, filters=filters, order=order,
+                                        driver_factory=self._create_driver, reuse_table=self.keep_warm,
+                                        timeout=self.timeout, directory=self.directory,
+                                        extractor=capture_table_snapshot if snapshots else extract_table_data)
+        return self.navigator
+    
+    def _get_parse_pool(self):
+        if self.parse_workers == 0:
+            return None
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._parse_pool
+    
+    def iter_pages(self, max_pages=None, start_page=1, progress=None, order=None, filters=None):
+        navigator = self._new_navigator(filters, order, snapshots=self.snapshots)
+        if not self.snapshots:
+            return iter_banpt_prodi_pages(self.driver, max_pages=max_pages, page_delay=self.page_delay,
+                                          start_page=start_page, progress=progress, order=order, url=self.url,
+                                          filters=filters, navigator=navigator)
+        if progress is None:
+            progress = {}
+        # Filter tetap diterapkan di DataTables oleh navigator; penyaringan persis dilakukan setelah parsing
+        pages = iter_banpt_prodi_pages(self.driver, max_pages=max_pages, page_delay=self.page_delay,
+                                       start_page=start_page, progress=progress, order=order, url=self.url,
+                                       navigator=navigator)
+        executor = self._get_parse_pool()
+        window = 2 * (self.parse_workers or os.cpu_count() or 1) if executor else 1
+        return iter_parsed_snapshots(pages, progress, executor, self.html_parser, filters, self.snapshot_dir,
+                                     window=window, directory=self.directory)
+    
+    def iter_ranges(self, ranges, progress=None, filters=None):
+        # Rentang offset dipotong per baris, jadi halaman diekstrak langsung tanpa snapshot
+        return iter_banpt_prodi_range_pages(self._new_navigator(filters), ranges, progress=progress, filters=filters)
+    
+    def warm_up(self):
+        self.keep_warm = True
+        if not self._new_navigator().open():
+            raise RuntimeError("Gagal menyiapkan tabel direktori")
+    
+    def close(self):
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(cancel_futures=True)
+            self._parse_pool = None
+        if self.navigator is not None:
+            self.driver = self.navigator.driver
+            self.navigator = None
+        if self.driver:
+            print("\nMenutup WebDriver...")
+            self.driver.quit()
+            self.driver = None
+            print("WebDriver berhasil ditutup.")
+
+class ShardedSeleniumEngine(ScrapeEngine):
+    '''Engine paralel: beberapa Chrome headless, masing-masing memegang satu rentang halaman.'''
+    
+    name = 'sharded'
+    
+    def __init__(self, webdriver_executable_path="", workers=None, url=None, directory=None, page_size=100):
+        self.webdriver_executable_path = webdriver_executable_path
+        self.workers = workers
+        self.page_size = page_size
+        self.directory = get_directory(directory)
+        self.url = url or self.directory.url
+    
+    def start(self):
+        # Driver dibuat oleh masing-masing worker saat iter_pages dijalankan
+        pass
+    
+    def iter_pages(self, max_pages=None, start_page=1, progress=None, order=None, filters=None):
+        if start_page > 1 or order:
+            print("    Warning: Engine sharded tidak mendukung resume maupun pengurutan, diabaikan.")
+        return iter_banpt_prodi_sharded_pages(self.webdriver_executable_path, workers=self.workers,
+                                              max_pages=max_pages, url=self.url, filters=filters,
+                                              directory=self.directory, page_size=self.page_size, progress=progress)
+
+class HttpEngine(ScrapeEngine):
+    '''Engine HTTP: langsung mem-paging endpoint JSON DataTables tanpa browser.
+
+    Jika endpoint belum diketahui (atau belum tersimpan di endpoint_cache_path), browser
+    hanya dibuka sekali untuk discovery lalu langsung ditutup.
+    '''
+    
+    name = 'http'
+    
+    def __init__(self, endpoint=None, page_size=1000, endpoint_cache_path=None,
+                 webdriver_executable_path="", headless=True, endpoint_url=None, url=None,
+                 max_concurrency=8, timeout=30, directory=None):
+        self.directory = get_directory(directory)
+        self.url = url or self.directory.url
+        self.endpoint = endpoint or (make_ajax_endpoint(endpoint_url, referer=self.url, directory=self.directory)
+                                     if endpoint_url else None)
+        self.max_concurrency = max_concurrency
+        self.session = HttpSession(timeout=timeout)
+        self.limiter = None
+        self.page_size = page_size
+        self.endpoint_cache_path = endpoint_cache_path
+        self.webdriver_executable_path = webdriver_executable_path
+        self.headless = headless
+    
+    def start(self):
+        if self.endpoint is None and self.endpoint_cache_path:
+            self.endpoint = load_ajax_endpoint(self.endpoint_cache_path)
+        if self.endpoint is None:
+            self.endpoint = self._discover_endpoint()
+            if self.endpoint_cache_path:
+                save_ajax_endpoint(self.endpoint, self.endpoint_cache_path)
+    
+    def _discover_endpoint(self):
+        driver = setup_driver(self.webdriver_executable_path, headless=self.headless)
+        if not driver:
+            raise RuntimeError("Gagal setup WebDriver untuk discovery endpoint AJAX")
+        try:
+            driver.get(self.url)
+            table_id = self.directory.table_id
+            endpoint = discover_ajax_endpoint(driver, table_id) \
+                if wait_for_table_data(driver, table_id=table_id) else None
+        finally:
+            driver.quit()
+        if not endpoint:
+            raise RuntimeError("Endpoint AJAX tidak ditemukan")
+        return endpoint
+    
+    def _get_limiter(self):
+        if self.limiter is None:
+            self.limiter = AimdLimiter(initial=min(2, self.max_concurrency), max_limit=self.max_concurrency)
+        return self.limiter
+    
+    def iter_pages(self, max_pages=None, start_page=1, progress=None, order=None, filters=None):
+        return iter_banpt_prodi_ajax_pages(self.endpoint, page_size=self.page_size, max_pages=max_pages,
+                                           start_page=start_page, progress=progress, order=order,
+                                           session=self.session, limiter=self._get_limiter(), filters=filters,
+                                           directory=self.directory)
+    
+    def iter_ranges(self, ranges, progress=None, filters=None):
+        return iter_banpt_prodi_ajax_ranges(self.endpoint, ranges, page_size=self.page_size, progress=progress,
+                                            session=self.session, limiter=self._get_limiter(), filters=filters,
+                                            directory=self.directory)
+    
+    def print_summary(self):
+        self.session.print_summary()
+        if self.limiter:
+            self.limiter.print_summary()
+    
+    def metrics(self):
+        metrics = {'hosts': self.session.metrics_report()}
+        if self.limiter:
+            metrics['limiter'] = {
+                'limit': self.limiter.limit,
+                'peak_limit': self.limiter.peak_limit,
+                'max_limit': self.limiter.max_limit,
+                'throttle_events': self.limiter.throttle_events,
+            }
+        return metrics
+    
+    def close(self):
+        self.session.close()
+
+ENGINES = {
+    'http': HttpEngine,
+    'selenium': SeleniumEngine,
+    'sharded': ShardedSeleniumEngine,
+}
+
+# Nama mode lama yang masih bisa muncul di checkpoint
+ENGINE_ALIASES = {'ajax': 'http'}
+
+class RowWriter:
+    '''Antarmuka writer output streaming: tulis per halaman, flush, lalu close.'''
+    
+    # True jika tell() memberi offset yang bisa dipakai resume_offset (checkpoint/resume)
+    supports_resume = False
+    
+    def __init__(self, path):
+        self.path = path
+        self.rows_written = 0
+    
+    def write_rows(self, rows):
+        raise NotImplementedError
+    
+    def tell(self):
+        '''Offset byte output yang sudah di-flush (None jika format tidak mendukung resume).'''
+        return None
+    
+    def close(self):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def _open_for_resume(path, resume_offset, newline=None):
+    '''Membuka file output untuk ditulis; jika resume_offset diberikan, potong ke offset lalu append.'''
+    if resume_offset is None:
+        return open(path, 'w', newline=newline, encoding='utf-8')
+    with open(path, 'r+b') as existing:
+        existing.truncate(resume_offset)
+    return open(path, 'a', newline=newline, encoding='utf-8')
+
+class CsvRowWriter(RowWriter):
+    '''Menulis baris ke CSV, header ditulis sekali di awal file.'''
+    
+    supports_resume = True
+    
+    def __init__(self, path, fieldnames=None, resume_offset=None):
+        super().__init__(path)
+        self.fieldnames = list(fieldnames or ROW_FIELDNAMES)
+        self._file = _open_for_resume(path, resume_offset, newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        self._tuple_writer = csv.writer(self._file)
+        if resume_offset is None:
+            self._writer.writeheader()
+            self._file.flush()
+    
+    def write_rows(self, rows):
+        if isinstance(rows, RecordBatch):
+            self._tuple_writer.writerows(rows.iter_tuples(self.fieldnames))
+        else:
+            self._writer.writerows(rows)
+        self._file.flush()
+        self.rows_written += len(rows)
+    
+    def tell(self):
+        return self._file.tell()
+    
+    def close(self):
+        self._file.close()
+
+class JsonLinesRowWriter(RowWriter):
+    '''Menulis satu objek JSON per baris (JSON Lines); kolom mengikuti baris sehingga fieldnames tidak dipakai.'''
+    
+    supports_resume = True
+    
+    def __init__(self, path, fieldnames=None, resume_offset=None):
+        super().__init__(path)
+        self._file = _open_for_resume(path, resume_offset)
+    
+    def write_rows(self, rows):
+        for row in rows:
+            self._file.write(json.dumps(row, ensure_ascii=False, default=format_cell_value))
+            self._file.write('\n')
+        self._file.flush()
+        self.rows_written += len(rows)
+    
+    def tell(self):
+        return self._file.tell()
+    
+    def close(self):
+        self._file.close()
+
+class ParquetRowWriter(RowWriter):
+    '''Menulis tiap halaman sebagai row group Parquet (butuh pyarrow).'''
+    
+    def __init__(self, path, fieldnames=None, resume_offset=None):
+        super().__init__(path)
+        if resume_offset is not None:
+            raise RuntimeError("Resume tidak didukung untuk output Parquet, gunakan CSV atau JSON Lines")
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Output Parquet membutuhkan paket 'pyarrow' (pip install pyarrow)")
+        self._pq = pq
+        self.fieldnames = list(fieldnames or ROW_FIELDNAMES)
+        # Skema diambil dari halaman pertama: kolom kategorikal ditulis dari kode kamus RecordBatch,
+        # kolom ternormalisasi (int/date) mengikuti tipenya
+        self._writer = None
+    
+    def write_rows(self, rows):
+        if not rows:
+            return
+        batch = RecordBatch.from_rows(rows, self.fieldnames)
+        if batch.fieldnames != self.fieldnames:
+            batch = RecordBatch.concat([batch], self.fieldnames)
+        table = batch.to_arrow()
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, table.schema)
+        self._writer.write_table(table)
+        self.rows_written += len(rows)
+    
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+ROW_WRITERS = {
+    'csv': CsvRowWriter,
+    'jsonl': JsonLinesRowWriter,
+    'parquet': ParquetRowWriter,
+}
+
+def detect_output_format(path, output_format=None):
+    '''Format output (csv/jsonl/parquet), default ditebak dari ekstensi file.'''
+    if not output_format:
+        extension = os.path.splitext(path)[1].lower().lstrip('.')
+        output_format = {'ndjson': 'jsonl', 'pq': 'parquet'}.get(extension, extension) or 'csv'
+    if output_format not in ROW_WRITERS:
+        raise ValueError(f"Format output tidak dikenal: {output_format} (pilihan: {', '.join(ROW_WRITERS)})")
+    return output_format
+
+def check_resumable_output(path, output_format=None):
+    '''ValueError jika format output tidak mendukung checkpoint/resume (mis. Parquet).'''
+    output_format = detect_output_format(path, output_format)
+    if not ROW_WRITERS[output_format].supports_resume:
+        raise ValueError(f"Checkpoint/resume tidak didukung untuk output {output_format} '{path}', "
+                         f"gunakan CSV atau JSON Lines")
+
+def open_row_writer(path, output_format=None, resume_offset=None, fieldnames=None):
+    '''Membuat writer sesuai format (csv/jsonl/parquet), default ditebak dari ekstensi file.'''
+    return ROW_WRITERS[detect_output_format(path, output_format)](path, fieldnames=fieldnames,
+                                                                  resume_offset=resume_offset)
+
+def iter_output_rows(path, output_format=None, limit=None, columns=None):
+    '''Dict baris dari file output yang sudah ada (limit = batas byte, mis. offset resume; columns = kolom Parquet).'''
+    output_format = detect_output_format(path, output_format)
+    if output_format == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Membaca output Parquet membutuhkan paket 'pyarrow' (pip install pyarrow)")
+        for record_batch in pq.ParquetFile(path).iter_batches(columns=list(columns) if columns else None):
+            yield from record_batch.to_pylist()
+        return
+    with open(path, 'rb') as f:
+        content = f.read(limit) if limit is not None else f.read()
+    lines = io.StringIO(content.decode('utf-8'), newline='')
+    if output_format == 'csv':
+        yield from csv.DictReader(lines)
+    else:
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+
+def iter_output_row_keys(path, output_format=None, limit=None, key_fields=ROW_KEY_FIELDS):
+    '''Tuple key_fields dari setiap baris file output yang sudah ada (limit = batas byte, mis. offset resume).'''
+    for row in iter_output_rows(path, output_format, limit, columns=key_fields):
+        yield tuple(row.get(name, "") for name in key_fields)
+
+def save_checkpoint(checkpoint_path, checkpoint):
+    '''Menyimpan checkpoint secara atomik (tulis ke file sementara lalu rename).'''
+    checkpoint = dict(checkpoint, updated_at=datetime.now().isoformat())
+    tmp_path = checkpoint_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, checkpoint_path)
+
+def load_checkpoint(checkpoint_path):
+    '''Membaca checkpoint; None jika file belum ada atau rusak.'''
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError) as e:
+        print(f"Warning: Checkpoint '{checkpoint_path}' tidak bisa dibaca: {e}")
+        return None
+
+def stream_pages_to_writer(pages, writer, progress=None, checkpoint_path=None):
+    '''Menulis setiap halaman dari generator ke writer segera setelah tersedia.
+
+    Jika checkpoint_path diberikan, checkpoint diperbarui setelah setiap halaman di-flush
+    menggunakan info halaman dari dict progress yang diisi generator. Setelah tiap halaman
+    dicetak baris progres (baris/detik dan ETA) dari RUN_METRICS.
+    '''
+    pages_done = 0
+    for page_data in pages:
+        with RUN_METRICS.span('write'):
+            writer.write_rows(page_data)
+        pages_done += 1
+        RUN_METRICS.incr('pages')
+        RUN_METRICS.incr('rows', len(page_data))
+        
+        total_pages = None
+        if progress is not None and progress.get('total_entries') is not None and progress.get('page_size'):
+            total_pages = math.ceil(progress['total_entries'] / progress['page_size'])
+        RUN_METRICS.print_progress(writer.rows_written, progress.get('page') if progress else None,
+                                   total_pages, pages_done)
+        
+        if checkpoint_path and progress is not None and 'page' in progress:
+            checkpoint = dict(progress)
+            checkpoint['last_page'] = checkpoint.pop('page')
+            checkpoint.update(
+                output_path=writer.path,
+                output_offset=writer.tell(),
+                rows_written=writer.rows_written,
+            )
+            save_checkpoint(checkpoint_path, checkpoint)
+    print(f"💾 {writer.rows_written} data ditulis bertahap ke '{writer.path}'")
+    return writer.rows_written
+
+def build_run_report(engine=None, progress=None, **extra):
+    '''Laporan run: span dan counter RUN_METRICS, histogram tunggu, metrik engine dan progress.'''
+    report = RUN_METRICS.report()
+    report['waits'] = WAIT_HISTOGRAM.report()
+    if engine is not None:
+        report['engine'] = engine.name
+        report['engine_metrics'] = engine.metrics()
+    if progress:
+        report['progress'] = dict(progress)
+    report.update(extra)
+    return report
+
+def save_run_report(report_path, report):
+    '''Menyimpan laporan run sebagai JSON.'''
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, default=format_cell_value)
+    print(f"📝 Laporan run disimpan ke '{report_path}'")
+
+def save_to_csv(data_list, csv_file_path):
+    '''Menyimpan data ke file CSV.'''
+    if not data_list:
+        print("Tidak ada data untuk disimpan ke CSV.")
+        return
+        
+    try:
         with open(csv_file_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data_list)
+            if isinstance(data_list, RecordBatch):
+                writer = csv.writer(csvfile)
+                writer.writerow(data_list.fieldnames)
+                writer.writerows(data_list.iter_tuples())
+            else:
+                writer = csv.DictWriter(csvfile, fieldnames=data_list[0].keys())
+                writer.writeheader()
+                writer.writerows(data_list)
             
         print(f"💾 Data berhasil disimpan ke '{csv_file_path}'")
         
@@ -487,38 +3599,1004 @@ def save_to_csv(data_list, csv_file_path):
     except Exception as e:
         print(f"Error saat menyimpan ke CSV: {e}")
 
-if __name__ == '__main__':
-    # --- KONFIGURASI SCRAPING ---
-    WEBDRIVER_PATH = ""  # Kosongkan jika ChromeDriver ada di PATH
-    RUN_HEADLESS = False  # Set ke True untuk menjalankan tanpa UI
-    MAX_PAGES = None  # Set ke angka untuk membatasi jumlah halaman, None untuk semua
-    DELAY_BETWEEN_OPERATIONS = 2  # Jeda antar operasi (detik)
-    CSV_OUTPUT_FILENAME = "banpt_akreditasi_prodi.csv"
-    # --- AKHIR KONFIGURASI ---
-
-    print("Memulai scraping data akreditasi program studi BANPT...")
-    
-    # Setup WebDriver
-    driver = setup_driver(WEBDRIVER_PATH, headless=RUN_HEADLESS)
-    if not driver:
-        print("Gagal setup WebDriver. Program berhenti.")
-        exit()
+# Kolom yang ikut dihitung pada hash isi baris (status dan waktu scraping tidak termasuk)
+ROW_HASH_FIELDS = PRODI_COLUMNS
+# Pengurai kolom bertipe seperti di normalize_batch, agar hash baris --raw dan ternormalisasi sama
+ROW_HASH_CANONICALIZERS = {'tahun_sk': partial(parse_or_keep, parse_year),
+                           'tanggal_kedaluwarsa': partial(parse_or_keep, parse_date_text),
+                           'peringkat': Peringkat.parse}
 
-    try:
-        # Lakukan scraping
-        scraped_data = scrape_banpt_prodi_directory(driver, max_pages=MAX_PAGES)
+def row_content_hash(row):
+    '''Hash SHA-1 dari isi kolom data sebuah baris dalam bentuk kanonis (ternormalisasi).
+
+    Nilai mentah ("24 Januari 2021", "Baik Sekali (B)") dan nilai hasil normalize_batch
+    menghasilkan hash yang sama, sehingga run --raw dan run ternormalisasi bisa memakai
+    indeks yang sama tanpa semua baris dianggap berubah.
+    '''
+    values = []
+    for field in ROW_HASH_FIELDS:
+        value = row.get(field)
+        if field in ROW_HASH_CANONICALIZERS:
+            value = ROW_HASH_CANONICALIZERS[field](value)
+        values.append(format_cell_value(value))
+    content = '\x1f'.join(values)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+class AccreditationIndex:
+    '''Indeks SQLite lokal untuk scraping inkremental, dikunci pada ROW_KEY_FIELDS.'''
+    
+    def __init__(self, db_path, changelog=False):
+        self.db_path = db_path
+        self.changelog = changelog
+        self.totals = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS akreditasi (
+                perguruan_tinggi TEXT NOT NULL,
+                program_studi TEXT NOT NULL,
+                strata TEXT NOT NULL,
+                no_sk TEXT NOT NULL,
+                wilayah TEXT,
+                tahun_sk TEXT,
+                peringkat TEXT,
+                tanggal_kedaluwarsa TEXT,
+                status_kedaluwarsa TEXT,
+                content_hash TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                PRIMARY KEY (perguruan_tinggi, program_studi, strata, no_sk)
+            );
+            CREATE TABLE IF NOT EXISTS perubahan (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                perguruan_tinggi TEXT NOT NULL,
+                program_studi TEXT NOT NULL,
+                strata TEXT NOT NULL,
+                no_sk TEXT NOT NULL,
+                change_type TEXT NOT NULL,
+                old_hash TEXT,
+                new_hash TEXT NOT NULL,
+                row_json TEXT NOT NULL,
+                changed_at TEXT NOT NULL
+            );
+        """)
+    
+    def upsert_rows(self, rows):
+        '''Menyimpan baris ke indeks; mengembalikan (counts, changed_rows) untuk halaman ini.'''
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        changed_rows = []
+        changed_indices = []
+        now = datetime.now().isoformat()
+        cursor = self.conn.cursor()
         
-        if scraped_data:
-            print(f"\n🎉 SCRAPING SELESAI!")
-            print(f"📊 Total {len(scraped_data)} data akreditasi program studi berhasil diekstrak")
-            save_to_csv(scraped_data, CSV_OUTPUT_FILENAME)
-        else:
-            print("\n❌ Tidak ada data yang berhasil diekstrak.")
+        for i, row in enumerate(rows):
+            key = tuple(row.get(field, "") for field in ROW_KEY_FIELDS)
+            content_hash = row_content_hash(row)
+            existing = cursor.execute(
+                "SELECT content_hash FROM akreditasi "
+                "WHERE perguruan_tinggi = ? AND program_studi = ? AND strata = ? AND no_sk = ?", key).fetchone()
+            values = tuple(format_cell_value(row.get(field)) for field in
+                           ('wilayah', 'tahun_sk', 'peringkat', 'tanggal_kedaluwarsa', 'status_kedaluwarsa'))
+            values += (content_hash,)
             
+            if existing is None:
+                cursor.execute(
+                    "INSERT INTO akreditasi (perguruan_tinggi, program_studi, strata, no_sk, wilayah, tahun_sk, "
+                    "peringkat, tanggal_kedaluwarsa, status_kedaluwarsa, content_hash, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", key + values + (now, now))
+                change_type = 'inserted'
+            elif existing[0] != content_hash:
+                cursor.execute(
+                    "UPDATE akreditasi SET wilayah = ?, tahun_sk = ?, peringkat = ?, tanggal_kedaluwarsa = ?, "
+                    "status_kedaluwarsa = ?, content_hash = ?, last_seen = ? "
+                    "WHERE perguruan_tinggi = ? AND program_studi = ? AND strata = ? AND no_sk = ?",
+                    values + (now,) + key)
+                change_type = 'updated'
+            else:
+                cursor.execute(
+                    "UPDATE akreditasi SET last_seen = ? "
+                    "WHERE perguruan_tinggi = ? AND program_studi = ? AND strata = ? AND no_sk = ?", (now,) + key)
+                counts['unchanged'] += 1
+                continue
+            
+            counts[change_type] += 1
+            changed_rows.append(row)
+            changed_indices.append(i)
+            if self.changelog:
+                cursor.execute(
+                    "INSERT INTO perubahan (perguruan_tinggi, program_studi, strata, no_sk, change_type, "
+                    "old_hash, new_hash, row_json, changed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    key + (change_type, existing[0] if existing else None, content_hash,
+                           json.dumps(row, ensure_ascii=False, default=format_cell_value), now))
+        
+        self.conn.commit()
+        for name, count in counts.items():
+            self.totals[name] += count
+        if isinstance(rows, RecordBatch):
+            # Tetap kolumnar (dan bertipe jika sudah dinormalisasi) untuk writer
+            changed_rows = rows.take(changed_indices)
+        return counts, changed_rows
+    
+    def print_summary(self):
+        print(f"🗂️  Indeks '{self.db_path}': {self.totals['inserted']} baru, "
+              f"{self.totals['updated']} berubah, {self.totals['unchanged']} tidak berubah")
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def iter_incremental_pages(pages, index, progress=None):
+    '''Meneruskan hanya baris baru/berubah, berhenti saat satu halaman seluruhnya sudah dikenal.
+
+    Halaman sumber harus diurutkan menurun (tahun_sk atau tanggal_kedaluwarsa) agar
+    data lama berkumpul di halaman-halaman akhir. Jika progress milik iter_filter_combinations
+    diberikan, hanya kombinasi filter aktif yang dihentikan dan kombinasi berikutnya tetap
+    di-crawl; tanpa progress seluruh generator sumber ditutup.
+    '''
+    for page_data in pages:
+        counts, changed_rows = index.upsert_rows(page_data)
+        print(f"    Delta halaman: {counts['inserted']} baru, {counts['updated']} berubah, {counts['unchanged']} tidak berubah")
+        if page_data and not changed_rows and progress is not None:
+            print("    Semua baris di halaman ini sudah dikenal, kombinasi filter ini dihentikan.")
+            progress['skip_combination'] = True
+            yield changed_rows
+            continue
+        yield changed_rows
+        if page_data and not changed_rows:
+            print("    Semua baris di halaman ini sudah dikenal, scraping inkremental dihentikan.")
+            if hasattr(pages, 'close'):
+                pages.close()
+            break
+
+# Singkatan umum pada nama perguruan tinggi yang diseragamkan sebelum join
+INSTITUTION_NAME_ALIASES = {
+    'univ': 'universitas',
+    'inst': 'institut',
+    'poltek': 'politeknik',
+    'sttek': 'sekolah tinggi teknologi',
+}
+
+_PARENTHESES_RE = re.compile(r'\([^)]*\)')
+_NAME_WORD_RE = re.compile(r'[a-z0-9]+')
+
+def normalize_institution_name(name):
+    '''Kunci join nama PT: tanpa aksen, tanda baca, beda huruf besar dan singkatan dalam kurung.'''
+    text = unicodedata.normalize('NFKD', format_cell_value(name)).encode('ascii', 'ignore').decode('ascii').lower()
+    words = _NAME_WORD_RE.findall(_PARENTHESES_RE.sub(' ', text))
+    return ' '.join(INSTITUTION_NAME_ALIASES.get(word, word) for word in words)
+
+# Kolom baris institusi yang ditambahkan ke baris prodi oleh join (dengan awalan INSTITUTION_JOIN_PREFIX)
+INSTITUTION_JOIN_FIELDS = ('perguruan_tinggi', 'peringkat', 'no_sk', 'tahun_sk', 'tanggal_kedaluwarsa',
+                           'status_kedaluwarsa')
+INSTITUTION_JOIN_PREFIX = 'institusi_'
+
+class InstitutionIndex:
+    '''Indeks hash nama PT ternormalisasi -> baris akreditasi institusi, dibangun sekali sebelum join.
+
+    Jika beberapa baris institusi bernama sama setelah normalisasi (mis. SK lama dan baru),
+    yang dipakai adalah yang tahun_sk lalu tanggal_kedaluwarsa-nya paling akhir; keduanya
+    dibandingkan sebagai nilai parse_year/parse_date_text sehingga teks --raw non-ISO
+    (mis. "5 Januari 2024") tetap benar, dan nilai yang gagal diurai dianggap paling lama.
+    join() menambahkan kolom institusi ke baris prodi dengan satu lookup per nama PT unik.
+    '''
+    
+    def __init__(self, fields=INSTITUTION_JOIN_FIELDS, prefix=INSTITUTION_JOIN_PREFIX):
+        self.fields = tuple(fields)
+        self.prefix = prefix
+        self.records = {}
+        self.rows = 0
+        self.collisions = 0
+        self.joined_rows = 0
+        self.matched_rows = 0
+        self.unmatched_names = set()
+        self._keys = {}
+        self._recency = {}
+    
+    @classmethod
+    def from_rows(cls, rows, fields=INSTITUTION_JOIN_FIELDS, prefix=INSTITUTION_JOIN_PREFIX):
+        index = cls(fields, prefix)
+        for row in rows:
+            index.add(row)
+        return index
+    
+    def key(self, name):
+        '''Kunci normalisasi nama PT (di-cache karena nama yang sama berulang di banyak baris).'''
+        key = self._keys.get(name)
+        if key is None:
+            key = self._keys[name] = normalize_institution_name(name)
+        return key
+    
+    def add(self, row):
+        self.rows += 1
+        key = self.key(row.get('perguruan_tinggi'))
+        if not key:
+            return
+        record = tuple(format_cell_value(row.get(name)) for name in self.fields)
+        recency = self.recency(row)
+        if key in self.records:
+            self.collisions += 1
+            if self._recency[key] >= recency:
+                return
+        self.records[key] = record
+        self._recency[key] = recency
+    
+    @staticmethod
+    def recency(row):
+        '''Kunci urut kebaruan baris institusi: (tahun_sk, tanggal_kedaluwarsa) terurai, None paling lama.'''
+        year = parse_year(row.get('tahun_sk'))
+        expiry = parse_date_text(row.get('tanggal_kedaluwarsa'))
+        return (year is not None, year or 0, expiry is not None, expiry or date.min)
+    
+    def lookup(self, name):
+        '''Tuple nilai fields institusi untuk nama PT, None jika tidak ada pasangannya.'''
+        return self.records.get(self.key(name))
+    
+    def joined_fieldnames(self, fieldnames):
+        return list(fieldnames) + [self.prefix + name for name in self.fields]
+    
+    def join(self, rows):
+        '''RecordBatch baris prodi ditambah kolom institusi (kosong jika nama PT tidak ditemukan).'''
+        batch = RecordBatch.from_rows(rows)
+        joined = batch.take(range(len(batch)))
+        matches = {name: self.lookup(name) for name in batch.categories('perguruan_tinggi')}
+        for i, name in enumerate(self.fields):
+            field = self.prefix + name
+            joined.derive_categories(field, 'perguruan_tinggi',
+                                     lambda value, i=i: matches[value][i] if matches[value] else "")
+            joined.fieldnames.append(field)
+        
+        unmatched = {value for value, record in matches.items() if record is None}
+        self.unmatched_names.update(unmatched)
+        self.joined_rows += len(batch)
+        self.matched_rows += sum(1 for value in batch.column('perguruan_tinggi') if value not in unmatched)
+        return joined
+    
+    def print_summary(self, limit=5):
+        print(f"🔗 Join institusi: {self.matched_rows} dari {self.joined_rows} baris prodi berpasangan "
+              f"({len(self.records)} nama PT di indeks dari {self.rows} baris, {self.collisions} nama ganda)")
+        if self.unmatched_names:
+            examples = ", ".join(sorted(self.unmatched_names)[:limit])
+            print(f"    {len(self.unmatched_names)} nama PT tanpa pasangan, mis.: {examples}")
+
+def iter_output_batches(path, output_format=None, batch_size=10000):
+    '''RecordBatch per batch_size baris dari file output yang sudah ada (kolom mengikuti file).'''
+    rows = iter_output_rows(path, output_format)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            return
+        yield RecordBatch.from_rows(chunk, list(chunk[0]))
+
+JOB_KINDS = ('full', 'filtered', 'incremental')
+
+_JOB_IDS = count(1)
+
+class ScrapeJob:
+    '''Satu pekerjaan untuk ScraperService: full, filtered (butuh filters) atau incremental (butuh db_path).
+
+    directory (opsional) harus sama dengan direktori engine service; output_path default
+    diturunkan dari direktori tersebut, mis. banpt_akreditasi_institusi-<job_id>.csv.
+    '''
+    
+    def __init__(self, kind='full', output_path=None, output_format=None, filters=None, max_pages=None,
+                 db_path=None, changelog=False, raw=False, incremental_sort='tahun_sk', job_id=None,
+                 directory=None):
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Jenis job tidak dikenal: {kind} (pilihan: {', '.join(JOB_KINDS)})")
+        if kind == 'filtered' and not filters:
+            raise ValueError("Job filtered membutuhkan filters")
+        if kind == 'incremental' and not db_path:
+            raise ValueError("Job incremental membutuhkan db_path")
+        expand_filters(filters)
+        self.job_id = job_id or f"job-{next(_JOB_IDS)}"
+        self.kind = kind
+        self.directory = get_directory(directory) if directory is not None else None
+        # Tanpa directory, output default baru ditentukan run_scrape_job dari direktori engine
+        self.output_path = output_path or (self.default_output_path(self.directory) if self.directory else None)
+        self.output_format = output_format
+        self.filters = filters or {}
+        self.max_pages = max_pages
+        self.db_path = db_path
+        self.changelog = changelog
+        self.raw = raw
+        self.incremental_sort = incremental_sort
+        self.status = 'pending'
+        self.result = None
+        self.error = None
+        self.submitted_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+    
+    @classmethod
+    def from_dict(cls, spec, job_id=None):
+        '''Membuat job dari dict JSON, mis. {"kind": "filtered", "filters": {"strata": "S2"}, "output": "s2.csv"}.'''
+        filters = dict(spec.get('filters') or {})
+        if spec.get('search'):
+            filters[SEARCH_FILTER_KEY] = spec['search']
+        return cls(spec.get('kind', 'full'), output_path=spec.get('output'), output_format=spec.get('format'),
+                   filters=filters, max_pages=spec.get('max_pages'), db_path=spec.get('db'),
+                   changelog=spec.get('changelog', False), raw=spec.get('raw', False),
+                   incremental_sort=spec.get('sort', 'tahun_sk'), job_id=spec.get('id', job_id),
+                   directory=spec.get('directory'))
+    
+    def default_output_path(self, directory):
+        stem, extension = os.path.splitext(directory.output_filename)
+        return f"{stem}-{self.job_id}{extension}"
+    
+    def to_dict(self):
+        return {
+            'id': self.job_id,
+            'kind': self.kind,
+            'directory': self.directory.name if self.directory else None,
+            'status': self.status,
+            'output': self.output_path,
+            'filters': self.filters,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error,
+            'result': self.result,
+        }
+    
+    def wait(self, timeout=None):
+        '''Menunggu job selesai; mengembalikan laporan run (None jika gagal atau timeout).'''
+        self.done.wait(timeout)
+        return self.result
+
+def run_scrape_job(engine, job):
+    '''Menjalankan satu ScrapeJob dengan engine yang sudah berjalan; mengembalikan laporan run.'''
+    progress = {}
+    directory = engine.directory
+    if job.directory is not None and job.directory is not directory:
+        raise ValueError(f"Job untuk direktori {job.directory.name} tidak bisa dijalankan engine direktori {directory.name}")
+    if job.output_path is None:
+        job.output_path = job.default_output_path(directory)
+    if job.kind == 'incremental' and directory is not PRODI_DIRECTORY:
+        raise ValueError(f"Job incremental belum mendukung direktori {directory.name} (indeks SQLite khusus prodi)")
+    order = (job.incremental_sort, 'desc') if job.kind == 'incremental' else None
+    tracker = None if job.kind == 'incremental' else ReconciliationTracker(job.max_pages, directory.key_fields)
+    pages = iter_filter_combinations(engine.iter_pages, job.filters, max_pages=job.max_pages, progress=progress,
+                                     order=order, tracker=tracker, directory=directory)
+    if not job.raw:
+        pages = iter_normalized_pages(pages)
+    
+    index = None
+    try:
+        if job.kind == 'incremental':
+            index = AccreditationIndex(job.db_path, changelog=job.changelog)
+            pages = iter_incremental_pages(pages, index, progress)
+        with open_row_writer(job.output_path, job.output_format, fieldnames=directory.fieldnames) as writer:
+            rows_written = stream_pages_to_writer(pages, writer, progress=progress)
     finally:
-        if driver:
-            print("\nMenutup WebDriver...")
-            driver.quit()
-            print("WebDriver berhasil ditutup.")
+        if index:
+            index.print_summary()
+            index.close()
+    if tracker is not None:
+        tracker.print_summary()
+    return build_run_report(engine, progress, job_id=job.job_id, kind=job.kind, output_path=job.output_path,
+                            filters=job.filters, rows_written=rows_written)
+
+class ScraperService:
+    '''Layanan scraping jangka panjang: engine tetap hangat dan job diambil dari antrean.
+
+    Tiap worker memegang satu engine (mis. Chrome dengan tabel yang sudah disiapkan lewat
+    warm_up), sehingga job berulang tidak lagi membayar start browser dan inisialisasi
+    halaman. RUN_METRICS dan WAIT_HISTOGRAM bersifat global per proses: keduanya di-reset
+    per job hanya jika workers=1, selain itu laporan job berisi metrik gabungan.
+    '''
+    
+    def __init__(self, engine_factory, workers=1):
+        self.engine_factory = engine_factory
+        self.workers = workers
+        self.jobs = queue.Queue()
+        self.engines = []
+        self._threads = []
+    
+    def start(self):
+        started = time.perf_counter()
+        for worker_id in range(self.workers):
+            engine = self.engine_factory()
+            self.engines.append(engine)
+            engine.start()
+            engine.warm_up()
+        for worker_id, engine in enumerate(self.engines):
+            thread = threading.Thread(target=self._worker, args=(engine,), name=f"scraper-worker-{worker_id}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"🔥 {len(self.engines)} engine siap dalam {time.perf_counter() - started:.1f} detik, menunggu job...")
+    
+    def submit(self, job):
+        '''Memasukkan job ke antrean; mengembalikan job yang sama untuk ditunggu lewat job.wait().'''
+        if not self._threads:
+            raise RuntimeError("ScraperService belum dijalankan")
+        self.jobs.put(job)
+        return job
+    
+    def _worker(self, engine):
+        while True:
+            job = self.jobs.get()
+            try:
+                if job is None:
+                    return
+                self._run(engine, job)
+            finally:
+                self.jobs.task_done()
+    
+    def _run(self, engine, job):
+        job.status = 'running'
+        job.started_at = datetime.now().isoformat()
+        print(f"\n▶️  Job {job.job_id} ({job.kind}) dimulai: {describe_filters(job.filters)}")
+        if self.workers == 1:
+            reset_run_metrics()
+        try:
+            job.result = run_scrape_job(engine, job)
+            job.status = 'done'
+            print(f"✅ Job {job.job_id} selesai: {job.result['rows_written']} baris ke '{job.output_path}'")
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+            print(f"❌ Job {job.job_id} gagal: {e}")
+        finally:
+            job.finished_at = datetime.now().isoformat()
+            job.done.set()
+    
+    def join(self):
+        '''Menunggu semua job di antrean selesai.'''
+        self.jobs.join()
+    
+    def stop(self):
+        for _ in self._threads:
+            self.jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        for engine in self.engines:
+            engine.close()
+        self.engines = []
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+def serve_job_directory(service, directory, poll_interval=5):
+    '''Daemon sederhana: setiap file *.json di directory (mis. ditaruh cron) dijalankan sebagai ScrapeJob.
+
+    File job diganti nama menjadi *.running selama dijalankan, lalu statusnya ditulis ke
+    *.done.json atau *.failed.json. Berjalan sampai dihentikan (Ctrl+C).
+    '''
+    os.makedirs(directory, exist_ok=True)
+    print(f"📂 Menunggu file job di '{directory}' (cek tiap {poll_interval} detik)...")
+    while True:
+        submitted = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith('.json') or name.endswith(('.done.json', '.failed.json')):
+                continue
+            base_path = os.path.join(directory, name[:-len('.json')])
+            running_path = base_path + '.running'
+            os.replace(base_path + '.json', running_path)
+            try:
+                with open(running_path, 'r', encoding='utf-8') as f:
+                    job = ScrapeJob.from_dict(json.load(f), job_id=os.path.basename(base_path))
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                print(f"❌ File job '{name}' tidak valid: {e}")
+                with open(base_path + '.failed.json', 'w', encoding='utf-8') as f:
+                    json.dump({'error': str(e)}, f, indent=2, ensure_ascii=False)
+                os.remove(running_path)
+                continue
+            submitted.append((base_path, running_path, service.submit(job)))
+        
+        for base_path, running_path, job in submitted:
+            job.wait()
+            result_path = base_path + ('.done.json' if job.status == 'done' else '.failed.json')
+            with open(result_path, 'w', encoding='utf-8') as f:
+                json.dump(job.to_dict(), f, indent=2, ensure_ascii=False, default=format_cell_value)
+            os.remove(running_path)
+        time.sleep(poll_interval)
+
+# Default konfigurasi; setiap nilai bisa diganti per job lewat Scraper atau flag CLI
+DEFAULT_OUTPUT_FILENAME = PRODI_DIRECTORY.output_filename
+DEFAULT_ENDPOINT_CACHE_FILENAME = PRODI_DIRECTORY.endpoint_cache_filename  # Endpoint hasil discovery engine HTTP
+DEFAULT_JOIN_OUTPUT_FILENAME = "banpt_akreditasi_prodi_institusi.csv"  # Output join prodi dengan institusi
+DEFAULT_INDEX_DB_FILENAME = "banpt_akreditasi_prodi.sqlite"  # Indeks lokal untuk scraping inkremental
+DEFAULT_INCREMENTAL_SORT = "tahun_sk"  # Kolom yang diurutkan menurun pada scraping inkremental
+INCREMENTAL_SORT_COLUMNS = ('tahun_sk', 'tanggal_kedaluwarsa')
+
+class Scraper:
+    '''API library scraping direktori BANPT dengan konfigurasi per job (dipakai juga oleh CLI).
+
+    Contoh:
+        scraper = Scraper(engine='http', page_size=2000, output_path='s2.parquet')
+        report = scraper.scrape(filters={'strata': 'S2'})
+
+    timeout berlaku untuk request HTTP (engine http) atau draw tabel (engine selenium);
+    None memakai default engine. page_size adalah baris per request (http) atau per halaman tabel
+    (selenium/sharded); None memakai default engine (1000 dan 100). workers adalah jumlah
+    WebDriver paralel engine sharded.
+    snapshots/snapshot_dir/parse_workers/html_parser mengatur parsing HTML terpisah engine
+    selenium (lihat SeleniumEngine) dan parse_snapshots(). directory memilih direktori yang
+    di-scrape ('prodi' atau 'institusi', lihat DIRECTORIES); output_path, url dan
+    endpoint_cache_path None memakai default DirectorySchema tersebut.
+    Setiap metode run mengembalikan laporan run (dict, juga disimpan ke report_path).
+    '''
+
+    def __init__(self, engine='http', output_path=None, output_format=None, page_size=None,
+                 workers=None, concurrency=8, timeout=None, max_pages=None, webdriver_path="", headless=False,
+                 page_delay=0, url=None, endpoint_url=None, endpoint_cache_path=None, checkpoint_path=None,
+                 report_path=None, raw=False, profile=None, profile_output=None, snapshots=False, snapshot_dir=None,
+                 parse_workers=None, html_parser=None, directory=None):
+        engine = ENGINE_ALIASES.get(engine, engine)
+        if engine not in ENGINES:
+            raise ValueError(f"Engine tidak dikenal: {engine} (pilihan: {', '.join(ENGINES)})")
+        self.engine = engine
+        self.directory = get_directory(directory)
+        self.output_path = output_path or self.directory.output_filename
+        self.output_format = output_format
+        self.page_size = page_size
+        self.workers = workers
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.webdriver_path = webdriver_path
+        self.headless = headless
+        self.page_delay = page_delay
+        self.url = url
+        self.endpoint_url = endpoint_url
+        self.endpoint_cache_path = endpoint_cache_path or self.directory.endpoint_cache_filename
+        self.checkpoint_path = checkpoint_path
+        if checkpoint_path:
+            check_resumable_output(self.output_path, output_format)
+        self.report_path = report_path
+        self.raw = raw
+        self.profile = profile
+        self.profile_output = profile_output
+        self.snapshots = snapshots
+        self.snapshot_dir = snapshot_dir
+        self.parse_workers = parse_workers
+        self.html_parser = html_parser
+
+    def checkpoint_file(self):
+        return self.checkpoint_path or f"{self.output_path}.checkpoint.json"
+
+    def report_file(self):
+        return self.report_path or f"{self.output_path}.report.json"
+
+    def create_engine(self, mode=None):
+        '''Membuat engine (belum di-start) sesuai konfigurasi.'''
+        mode = mode or self.engine
+        kwargs = {'page_size': self.page_size} if self.page_size else {}
+        if mode == "sharded":
+            return ShardedSeleniumEngine(self.webdriver_path, workers=self.workers, url=self.url,
+                                         directory=self.directory, **kwargs)
+        if self.timeout:
+            kwargs['timeout'] = self.timeout
+        if mode == "http":
+            return HttpEngine(endpoint_cache_path=self.endpoint_cache_path,
+                              webdriver_executable_path=self.webdriver_path, headless=self.headless,
+                              endpoint_url=self.endpoint_url, url=self.url, max_concurrency=self.concurrency,
+                              directory=self.directory, **kwargs)
+        return SeleniumEngine(self.webdriver_path, headless=self.headless, page_delay=self.page_delay, url=self.url,
+                              snapshots=self.snapshots, snapshot_dir=self.snapshot_dir,
+                              parse_workers=self.parse_workers, html_parser=self.html_parser,
+                              directory=self.directory, **kwargs)
+
+    def new_tracker(self, report=None):
+        '''ReconciliationTracker baru (atau dipulihkan dari report) dengan kunci baris direktori.'''
+        if report:
+            return ReconciliationTracker.from_report(report)
+        return ReconciliationTracker(self.max_pages, self.directory.key_fields)
 
-    print("Proses scraping selesai.")
\ No newline at end of file
+    def scrape(self, filters=None):
+        '''Scraping penuh (atau hanya baris yang cocok dengan filters) dengan checkpoint per halaman.'''
+        expand_filters(filters, self.directory)
+        return self._run(filters or {}, tracker=self.new_tracker())
+
+    def resume(self):
+        '''Melanjutkan run dari checkpoint; None jika checkpoint menandakan scraping sudah selesai.'''
+        checkpoint_path = self.checkpoint_file()
+        checkpoint = load_checkpoint(checkpoint_path)
+        if not checkpoint:
+            print(f"Checkpoint '{checkpoint_path}' tidak ditemukan, memulai dari halaman 1.")
+            return self.scrape()
+        if checkpoint.get('completed'):
+            print(f"Checkpoint '{checkpoint_path}' menandakan scraping sudah selesai. Tidak ada yang dilanjutkan.")
+            return None
+
+        start_page = checkpoint['last_page'] + 1
+        resume_offset = checkpoint.get('output_offset')
+        self.output_path = checkpoint.get('output_path', self.output_path)
+        check_resumable_output(self.output_path, self.output_format)
+        if resume_offset is None:
+            # Tanpa offset writer akan membuka file baru dan menimpa halaman yang sudah ditulis
+            raise ValueError(f"Checkpoint '{checkpoint_path}' tidak mencatat output_offset, tidak bisa dilanjutkan")
+        self.directory = get_directory(checkpoint.get('directory', PRODI_DIRECTORY.name))
+        self.engine = ENGINE_ALIASES.get(checkpoint.get('mode'), checkpoint.get('mode', self.engine))
+        # Offset halaman checkpoint hanya berlaku dengan ukuran halaman yang sama
+        self.page_size = checkpoint.get('page_size', self.page_size)
+        filters = checkpoint.get('filters') or {}
+        if filters:
+            print(f"Memakai filter dari checkpoint: {describe_filters(filters)}")
+        print(f"Melanjutkan dari checkpoint: halaman {start_page}, {checkpoint.get('rows_written', 0)} data sudah tersimpan.")
+
+        tracker = self.new_tracker(checkpoint.get('reconciliation'))
+        if checkpoint.get('reconciliation') and resume_offset is not None:
+            tracker.seed_keys(iter_output_row_keys(self.output_path, self.output_format, limit=resume_offset,
+                                                   key_fields=tracker.key_fields))
+        return self._run(filters, start_page=start_page, progress=checkpoint, resume_offset=resume_offset,
+                         tracker=tracker)
+
+    def diff(self, db_path=DEFAULT_INDEX_DB_FILENAME, changelog=False, sort=DEFAULT_INCREMENTAL_SORT, filters=None):
+        '''Scraping inkremental: hanya baris baru/berubah dibanding indeks SQLite yang ditulis.
+
+        Tabel diurutkan menurun berdasarkan sort dan scraping berhenti di halaman pertama yang
+        seluruh barisnya sudah dikenal indeks. Skema indeks SQLite saat ini khusus direktori prodi.
+        '''
+        if self.directory is not PRODI_DIRECTORY:
+            raise ValueError(f"Scraping inkremental belum mendukung direktori {self.directory.name}")
+        if sort not in INCREMENTAL_SORT_COLUMNS:
+            raise ValueError(f"Kolom urutan inkremental tidak dikenal: {sort} "
+                             f"(pilihan: {', '.join(INCREMENTAL_SORT_COLUMNS)})")
+        expand_filters(filters, self.directory)
+        mode = self.engine
+        if mode == "sharded":
+            print("Scraping inkremental membutuhkan urutan halaman, beralih ke engine HTTP.")
+            mode = "http"
+        return self._run(filters or {}, mode=mode, order=(sort, 'desc'), db_path=db_path, changelog=changelog)
+
+    def refetch_missing(self):
+        '''Mengambil ulang hanya rentang offset yang hilang menurut laporan run sebelumnya (lihat ReconciliationTracker).'''
+        report_path = self.report_file()
+        try:
+            with open(report_path, 'r', encoding='utf-8') as f:
+                previous_report = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Laporan run '{report_path}' tidak bisa dibaca: {e}")
+            return None
+        previous_progress = previous_report.get('progress') or {}
+        if not previous_progress.get('reconciliation'):
+            print(f"Laporan run '{report_path}' tidak memuat data rekonsiliasi.")
+            return None
+        self.directory = get_directory(previous_progress.get('directory', PRODI_DIRECTORY.name))
+        tracker = self.new_tracker(previous_progress['reconciliation'])
+        if not tracker.missing_ranges():
+            print(f"Laporan run '{report_path}' tidak mencatat rentang yang hilang. Tidak ada yang diambil ulang.")
+            return None
+
+        self.output_path = previous_report.get('output_path', self.output_path)
+        self.engine = ENGINE_ALIASES.get(previous_progress.get('mode'), previous_progress.get('mode') or self.engine)
+        if self.engine == "sharded":
+            # Rentang yang hilang diambil ulang berurutan lewat satu Chrome dengan ukuran halaman yang sama
+            print("Engine sharded tidak mendukung pengambilan ulang per rentang, beralih ke engine selenium.")
+            self.engine = "selenium"
+        self.page_size = previous_progress.get('page_size', self.page_size)
+        resume_offset = None
+        if os.path.exists(self.output_path):
+            check_resumable_output(self.output_path, self.output_format)
+            seeded = tracker.seed_keys(iter_output_row_keys(self.output_path, self.output_format,
+                                                            key_fields=tracker.key_fields))
+            print(f"Indeks dedup diisi {seeded} kunci dari '{self.output_path}'.")
+            resume_offset = os.path.getsize(self.output_path)
+        return self._run(previous_report.get('filters') or {}, resume_offset=resume_offset, tracker=tracker,
+                         refetch=True)
+
+    def parse_snapshots(self, paths):
+        '''Memparse ulang arsip snapshot HTML (file atau direktori) lalu menulis barisnya ke output_path.
+
+        Baris duplikat antar snapshot (mis. arsip beberapa run) dibuang berdasarkan kunci direktori.
+        '''
+        reset_run_metrics()
+        seen = set()
+        pages = (deduplicate_rows(batch, seen, self.directory.key_fields)
+                 for batch in iter_parsed_snapshot_files(paths, workers=self.parse_workers, parser=self.html_parser,
+                                                         directory=self.directory))
+        if not self.raw:
+            pages = iter_normalized_pages(pages)
+        with profile_run(self.profile, self.profile_output), \
+                open_row_writer(self.output_path, self.output_format, fieldnames=self.directory.fieldnames) as writer:
+            total_rows = stream_pages_to_writer(pages, writer)
+        RUN_METRICS.print_summary()
+        report = build_run_report(output_path=self.output_path, rows_written=total_rows, snapshot_paths=list(paths))
+        save_run_report(self.report_file(), report)
+        return report
+
+    def join_institutions(self, prodi_path, institusi_path):
+        '''Menulis baris output prodi ditambah kolom akreditasi institusinya ke output_path.
+
+        Indeks hash nama PT ternormalisasi dibangun sekali dari output institusi, lalu output
+        prodi di-stream per batch sehingga join linear terhadap jumlah baris.
+        '''
+        reset_run_metrics()
+        index = InstitutionIndex.from_rows(iter_output_rows(institusi_path))
+        print(f"Indeks institusi: {len(index.records)} nama PT dari '{institusi_path}'")
+        pages = (index.join(batch) for batch in iter_output_batches(prodi_path))
+        with profile_run(self.profile, self.profile_output), \
+                open_row_writer(self.output_path, self.output_format,
+                                fieldnames=index.joined_fieldnames(PRODI_DIRECTORY.fieldnames)) as writer:
+            total_rows = stream_pages_to_writer(pages, writer)
+        index.print_summary()
+        report = build_run_report(output_path=self.output_path, rows_written=total_rows, prodi_path=prodi_path,
+                                  institusi_path=institusi_path, matched_rows=index.matched_rows,
+                                  unmatched_names=len(index.unmatched_names))
+        save_run_report(self.report_file(), report)
+        return report
+
+    def serve(self, directory, pool_size=1, poll_interval=5):
+        '''Menjalankan ScraperService dengan pool_size engine hangat yang mengambil job dari directory.'''
+        try:
+            with ScraperService(self.create_engine, workers=pool_size) as service:
+                serve_job_directory(service, directory, poll_interval=poll_interval)
+        except KeyboardInterrupt:
+            print("\nLayanan scraping dihentikan.")
+
+    def _run(self, filters, mode=None, start_page=1, progress=None, resume_offset=None, tracker=None, order=None,
+             db_path=None, changelog=False, refetch=False):
+        if progress is None:
+            progress = {}
+        checkpoint_path = self.checkpoint_file()
+        total_rows = 0
+        report = None
+        reset_run_metrics()
+
+        print(f"Memulai scraping data akreditasi {self.directory.label} BANPT...")
+        engine = self.create_engine(mode)
+        try:
+            try:
+                engine.start()
+            except RuntimeError as e:
+                if engine.name != "http":
+                    print(f"{e}. Scraping dibatalkan.")
+                    return None
+                print(f"{e}. Mode HTTP tidak tersedia, beralih ke mode Selenium.")
+                if start_page > 1 or refetch:
+                    print("Checkpoint/laporan mode HTTP tidak bisa dipakai di mode Selenium, memulai dari halaman 1.")
+                    start_page, resume_offset, progress, refetch = 1, None, {}, False
+                    tracker = self.new_tracker()
+                    # Ukuran halaman dari checkpoint HTTP tidak dipakai untuk paging tabel
+                    self.page_size = None
+                engine = self.create_engine("selenium")
+                engine.start()
+            progress['directory'] = self.directory.name
+
+            if engine.name == "sharded" or refetch or db_path:
+                # Sharded: setiap worker membuat WebDriver headless sendiri; refetch dan inkremental tanpa checkpoint
+                checkpoint_path = None
+            elif not ROW_WRITERS[detect_output_format(self.output_path, self.output_format)].supports_resume:
+                print(f"Output '{self.output_path}' tidak mendukung resume, checkpoint tidak ditulis.")
+                checkpoint_path = None
+
+            # Siapkan generator halaman sesuai engine
+            if refetch:
+                pages = iter_missing_ranges(engine.iter_ranges, tracker, progress)
+            else:
+                pages = iter_filter_combinations(engine.iter_pages, filters, max_pages=self.max_pages,
+                                                 start_page=start_page, progress=progress, order=order,
+                                                 tracker=tracker, directory=self.directory)
+            if not self.raw:
+                pages = iter_normalized_pages(pages)
+
+            index = None
+            if db_path:
+                index = AccreditationIndex(db_path, changelog=changelog)
+                pages = iter_incremental_pages(pages, index, progress)
+
+            # Tulis setiap halaman langsung ke file output
+            try:
+                with profile_run(self.profile, self.profile_output), \
+                        open_row_writer(self.output_path, self.output_format, resume_offset=resume_offset,
+                                        fieldnames=self.directory.fieldnames) as writer:
+                    writer.rows_written = progress.get('rows_written', 0)
+                    total_rows = stream_pages_to_writer(pages, writer, progress=progress,
+                                                        checkpoint_path=checkpoint_path)
+            finally:
+                if index:
+                    index.print_summary()
+                    index.close()
+
+            if total_rows:
+                print(f"\n🎉 SCRAPING SELESAI!")
+                print(f"📊 Total {total_rows} data akreditasi {self.directory.label} berhasil diekstrak")
+                if progress.get('total_entries_changed'):
+                    before, after = progress['total_entries_changed']
+                    print(f"⚠️  Total entri berubah sejak checkpoint ({before} -> {after}), periksa kemungkinan data bergeser.")
+                RUN_METRICS.print_summary()
+                print_extraction_summary()
+                WAIT_HISTOGRAM.print_summary()
+                engine.print_summary()
+            else:
+                print("\n❌ Tidak ada data yang berhasil diekstrak.")
+            if tracker is not None:
+                tracker.print_summary()
+        finally:
+            report = build_run_report(engine, progress, output_path=self.output_path, filters=filters,
+                                      rows_written=total_rows)
+            save_run_report(self.report_file(), report)
+            engine.close()
+
+        print("Proses scraping selesai.")
+        return report
+
+def _add_filter_arguments(parser):
+    parser.add_argument('--filter', action='append', default=[], metavar='KOLOM=NILAI',
+                        help="Hanya ambil baris dengan kolom bernilai tertentu, mis. wilayah='Wilayah 3' atau strata=S1; "
+                             "ulangi kolom yang sama untuk beberapa nilai")
+    parser.add_argument('--search', default=None,
+                        help="Pencarian teks bebas DataTables yang diterapkan sebelum paging")
+
+def build_arg_parser():
+    '''Parser CLI "python -m scraper" dengan subcommand scrape, resume, diff, serve, parse, join dan bench.'''
+    directory_options = argparse.ArgumentParser(add_help=False)
+    directory_options.add_argument('--directory', choices=list(DIRECTORIES), default=PRODI_DIRECTORY.name,
+                                   help="Direktori BANPT yang di-scrape (default: prodi)")
+    engine_options = argparse.ArgumentParser(add_help=False)
+    engine_group = engine_options.add_argument_group("engine")
+    engine_group.add_argument('--engine', choices=sorted(ENGINES), default='http',
+                              help="http: ambil JSON langsung, selenium: klik per halaman, sharded: beberapa "
+                                   "Chrome paralel (default: http)")
+    engine_group.add_argument('--workers', type=int, default=None,
+                              help="Jumlah WebDriver paralel engine sharded (default: jumlah CPU)")
+    engine_group.add_argument('--page-size', type=int, default=None,
+                              help="Baris per request engine http atau per halaman tabel engine selenium/sharded "
+                                   "(default: 1000 untuk http, 100 untuk selenium/sharded)")
+    engine_group.add_argument('--concurrency', type=int, default=8,
+                              help="Batas maksimum request paralel engine http")
+    engine_group.add_argument('--timeout', type=float, default=None,
+                              help="Batas waktu request HTTP atau draw tabel Selenium (detik)")
+    engine_group.add_argument('--max-pages', type=int, default=None,
+                              help="Batas halaman per kombinasi filter (default: semua)")
+    engine_group.add_argument('--page-delay', type=float, default=0,
+                              help="Jeda tambahan antar halaman engine selenium (detik)")
+    engine_group.add_argument('--webdriver-path', default="",
+                              help="Path ChromeDriver (kosong = cari di PATH)")
+    engine_group.add_argument('--headless', action='store_true', help="Jalankan Chrome tanpa UI")
+    engine_group.add_argument('--endpoint-url', default=None,
+                              help="URL endpoint JSON DataTables (lewati discovery lewat browser)")
+    engine_group.add_argument('--endpoint-cache', default=None,
+                              help="File endpoint hasil discovery untuk engine http "
+                                   "(default: banpt_ajax_endpoint.json untuk prodi, "
+                                   "banpt_ajax_endpoint_<direktori>.json untuk lainnya)")
+    engine_group.add_argument('--snapshots', action='store_true',
+                              help="Engine selenium hanya mengambil HTML #table per halaman, parsing di process pool")
+    engine_group.add_argument('--snapshot-dir', default=None,
+                              help="Arsipkan snapshot HTML per halaman ke direktori ini (mengaktifkan --snapshots)")
+    parsing_options = argparse.ArgumentParser(add_help=False)
+    parsing_group = parsing_options.add_argument_group("parsing HTML")
+    parsing_group.add_argument('--parse-workers', type=int, default=None,
+                               help="Jumlah process parser snapshot (default: jumlah CPU, 0 = tanpa process pool)")
+    parsing_group.add_argument('--html-parser', choices=list(HTML_PARSERS), default=None,
+                               help="Backend parser snapshot (default: yang tercepat terpasang)")
+    output_options = argparse.ArgumentParser(add_help=False)
+    output_group = output_options.add_argument_group("output")
+    output_group.add_argument('--output', '-o', default=None,
+                              help="File output (default: banpt_akreditasi_<direktori>.csv)")
+    output_group.add_argument('--format', choices=sorted(ROW_WRITERS), default=None,
+                              help="Format output (default: ditebak dari ekstensi file)")
+    output_group.add_argument('--raw', action='store_true',
+                              help="Tulis teks tampilan apa adanya tanpa normalisasi tahun, tanggal, peringkat dan status")
+    output_group.add_argument('--checkpoint', default=None,
+                              help="Path file checkpoint (default: <output>.checkpoint.json)")
+    output_group.add_argument('--report', default=None,
+                              help="Path laporan run JSON (default: <output>.report.json)")
+    output_group.add_argument('--profile', choices=['cprofile', 'pyinstrument'], default=None,
+                              help="Jalankan crawl di bawah profiler")
+    output_group.add_argument('--profile-output', default=None,
+                              help="Path hasil profiler (default: scraper.prof / scraper-profile.html)")
+    common = [directory_options, engine_options, parsing_options, output_options]
+
+    parser = argparse.ArgumentParser(prog="python -m scraper",
+                                     description="Scraping data akreditasi program studi dan perguruan tinggi BANPT")
+    subparsers = parser.add_subparsers(dest='command')
+
+    scrape_parser = subparsers.add_parser('scrape', parents=common, help="Scraping penuh atau terfilter (default)")
+    _add_filter_arguments(scrape_parser)
+    scrape_parser.add_argument('--refetch-missing', action='store_true',
+                               help="Ambil ulang hanya rentang offset yang hilang menurut laporan run sebelumnya "
+                                    "lalu tambahkan ke file output")
+
+    subparsers.add_parser('resume', parents=common,
+                          help="Lanjutkan dari halaman terakhir yang tercatat di checkpoint")
+
+    diff_parser = subparsers.add_parser('diff', parents=common,
+                                        help="Hanya tulis baris baru/berubah dibanding indeks lokal")
+    _add_filter_arguments(diff_parser)
+    diff_parser.add_argument('--db', default=DEFAULT_INDEX_DB_FILENAME, help="Path database SQLite indeks")
+    diff_parser.add_argument('--changelog', action='store_true',
+                             help="Catat setiap perubahan ke tabel 'perubahan' pada database indeks")
+    diff_parser.add_argument('--sort', choices=INCREMENTAL_SORT_COLUMNS, default=DEFAULT_INCREMENTAL_SORT,
+                             help="Kolom yang diurutkan menurun agar data lama berkumpul di halaman akhir")
+
+    serve_parser = subparsers.add_parser('serve', parents=common,
+                                         help="Layanan dengan engine hangat yang mengambil job dari direktori")
+    serve_parser.add_argument('job_dir', metavar='DIREKTORI',
+                              help="Direktori file job *.json (mis. ditaruh cron)")
+    serve_parser.add_argument('--pool-size', type=int, default=1, help="Jumlah engine hangat")
+    serve_parser.add_argument('--poll-interval', type=float, default=5, help="Jeda pengecekan direktori (detik)")
+
+    parse_parser = subparsers.add_parser('parse', parents=[directory_options, parsing_options, output_options],
+                                         help="Parse ulang arsip snapshot HTML (--snapshot-dir) tanpa browser")
+    parse_parser.add_argument('paths', nargs='+', metavar='PATH',
+                              help="File snapshot/halaman tersimpan atau direktori berisi *.html")
+
+    join_parser = subparsers.add_parser('join', parents=[output_options],
+                                        help="Gabungkan output prodi dengan akreditasi institusinya per nama PT")
+    join_parser.add_argument('prodi', metavar='PRODI', help="File output scraping direktori prodi")
+    join_parser.add_argument('institusi', metavar='INSTITUSI', help="File output scraping direktori institusi")
+
+    # Hanya untuk daftar subcommand di --help; argumennya diteruskan utuh ke benchmark.main oleh main()
+    subparsers.add_parser('bench', add_help=False, help="Benchmark engine (argumen diteruskan ke benchmark.py)")
+    return parser
+
+def scraper_from_args(args):
+    '''Membuat Scraper dari hasil parse build_arg_parser().'''
+    return Scraper(engine=args.engine, output_path=args.output, output_format=args.format, page_size=args.page_size,
+                   workers=args.workers, concurrency=args.concurrency, timeout=args.timeout,
+                   max_pages=args.max_pages, webdriver_path=args.webdriver_path, headless=args.headless,
+                   page_delay=args.page_delay, endpoint_url=args.endpoint_url,
+                   endpoint_cache_path=args.endpoint_cache, checkpoint_path=args.checkpoint,
+                   report_path=args.report, raw=args.raw, profile=args.profile, profile_output=args.profile_output,
+                   snapshots=args.snapshots, snapshot_dir=args.snapshot_dir, parse_workers=args.parse_workers,
+                   html_parser=args.html_parser, directory=args.directory)
+
+def main(argv=None):
+    '''Entry point CLI; tanpa subcommand dianggap "scrape".'''
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] == 'bench':
+        # Opsi bench (termasuk --help) milik parser benchmark.py, bukan parser scraper
+        import benchmark
+        return benchmark.main(argv[1:])
+
+    parser = build_arg_parser()
+    if not argv or (argv[0].startswith('-') and argv[0] not in ('-h', '--help')):
+        argv.insert(0, 'scrape')
+    args = parser.parse_args(argv)
+
+    if args.command == 'parse':
+        scraper = Scraper(output_path=args.output, output_format=args.format, report_path=args.report, raw=args.raw,
+                          profile=args.profile, profile_output=args.profile_output,
+                          parse_workers=args.parse_workers, html_parser=args.html_parser,
+                          directory=args.directory)
+        try:
+            return scraper.parse_snapshots(args.paths)
+        except RuntimeError as e:
+            parser.error(str(e))
+
+    if args.command == 'join':
+        scraper = Scraper(output_path=args.output or DEFAULT_JOIN_OUTPUT_FILENAME, output_format=args.format,
+                          report_path=args.report, profile=args.profile, profile_output=args.profile_output)
+        try:
+            return scraper.join_institutions(args.prodi, args.institusi)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    try:
+        scraper = scraper_from_args(args)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.command == 'resume':
+        return scraper.resume()
+    if args.command == 'serve':
+        return scraper.serve(args.job_dir, pool_size=args.pool_size, poll_interval=args.poll_interval)
+
+    try:
+        filters = parse_filter_args(args.filter, args.search, scraper.directory)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.command == 'diff':
+        if scraper.directory is not PRODI_DIRECTORY:
+            parser.error(f"diff belum mendukung direktori {scraper.directory.name}")
+        return scraper.diff(args.db, changelog=args.changelog, sort=args.sort, filters=filters)
+    if args.refetch_missing:
+        if filters:
+            parser.error("--refetch-missing memakai filter dari laporan run sebelumnya, jangan isi --filter/--search")
+        return scraper.refetch_missing()
+    return scraper.scrape(filters)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+'''
+Fixture pytest bersama: server fixture_server.py lokal di port acak sebagai pengganti banpt.or.id.
+'''
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixture_server
+import scraper
+
+FIXTURE_ROW_COUNT = 1234
+
+@pytest.fixture(scope='session')
+def fixture_rows():
+    return fixture_server.generate_fixture_rows(FIXTURE_ROW_COUNT)
+
+@pytest.fixture(scope='session')
+def fixture_endpoint(fixture_rows):
+    '''URL endpoint JSON DataTables server fixture (port ephemeral, hidup selama sesi test).'''
+    server, base_url = fixture_server.start_fixture_server(fixture_rows)
+    yield base_url + fixture_server.JSON_PATH
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def make_scraper(fixture_endpoint, tmp_path, monkeypatch):
+    '''Factory Scraper engine http yang menulis ke tmp_path dan memakai endpoint fixture.'''
+    monkeypatch.chdir(tmp_path)
+
+    def factory(**kwargs):
+        kwargs.setdefault('output_path', str(tmp_path / "output.csv"))
+        kwargs.setdefault('page_size', 250)
+        return scraper.Scraper(engine='http', endpoint_url=fixture_endpoint, **kwargs)
+    return factory
@@ -0,0 +1,30 @@
+'''
+Test indeks SQLite inkremental: hash isi baris tidak bergantung pada mode --raw.
+'''
+import scraper
+
+RAW_ROW = {
+    'perguruan_tinggi': 'Universitas Fiktif 1', 'program_studi': 'Teknik Informatika', 'strata': 'S1',
+    'wilayah': 'Wilayah 8', 'no_sk': '1000/SK/BAN-PT/Ak/S/2016', 'tahun_sk': '2016',
+    'peringkat': 'Baik Sekali (B)', 'tanggal_kedaluwarsa': '24 Januari 2021', 'status_kedaluwarsa': 'Kedaluwarsa',
+    'scraped_at': '2026-01-01T00:00:00',
+}
+
+def normalized(row):
+    return scraper.normalize_batch(scraper.RecordBatch.from_rows([row]))
+
+def test_raw_and_normalized_rows_share_content_hash():
+    (normalized_row,) = normalized(RAW_ROW)
+    assert normalized_row['tanggal_kedaluwarsa'] != RAW_ROW['tanggal_kedaluwarsa']
+    assert scraper.row_content_hash(normalized_row) == scraper.row_content_hash(RAW_ROW)
+    assert scraper.row_content_hash(dict(RAW_ROW, peringkat='Unggul')) != scraper.row_content_hash(RAW_ROW)
+
+def test_mixing_raw_and_normalized_runs_keeps_rows_unchanged(tmp_path):
+    with scraper.AccreditationIndex(str(tmp_path / "index.sqlite")) as index:
+        assert index.upsert_rows([RAW_ROW])[0]['inserted'] == 1
+        counts, changed_rows = index.upsert_rows(normalized(RAW_ROW))
+        assert counts == {'inserted': 0, 'updated': 0, 'unchanged': 1}
+        assert len(changed_rows) == 0
+
+        counts, _ = index.upsert_rows([dict(RAW_ROW, tanggal_kedaluwarsa='2026-01-24')])
+        assert counts['updated'] == 1
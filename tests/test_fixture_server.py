@@ -0,0 +1,46 @@
+'''
+Test server fixture: halaman fixture hanya memuat aset yang disajikan server sendiri.
+'''
+import os
+import re
+import urllib.error
+import urllib.request
+
+import pytest
+
+import fixture_server
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return response.status, response.headers.get('Content-Type'), response.read()
+
+def test_page_assets_are_served_locally(fixture_endpoint):
+    base_url = fixture_endpoint[:-len(fixture_server.JSON_PATH)]
+    _, _, page = fetch(base_url + fixture_server.PAGE_PATH)
+    assets = re.findall(r'(?:src|href)="([^"]+)"', page.decode('utf-8'))
+
+    assert assets and all(url.startswith(fixture_server.ASSETS_PATH + '/') for url in assets)
+    for url in assets:
+        status, content_type, body = fetch(base_url + url)
+        assert status == 200 and body
+        assert content_type in ('text/css', 'text/javascript', 'application/javascript')
+
+def test_assets_outside_asset_dir_are_not_served(fixture_endpoint):
+    base_url = fixture_endpoint[:-len(fixture_server.JSON_PATH)]
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        fetch(base_url + fixture_server.ASSETS_PATH + '/../fixture_server.py')
+    assert excinfo.value.code == 404
+
+def test_every_vendored_package_ships_its_license():
+    # Template memuat aset dari <paket>@<versi>/..., tiap paket wajib disertai lisensi upstream
+    page = fixture_server.render_page_html('prodi', fixture_server.ASSETS_PATH, fixture_server.JSON_PATH)
+    packages = set(re.findall(re.escape(fixture_server.ASSETS_PATH) + r'/([^/"]+@[^/"]+)/', page))
+    with open(os.path.join(fixture_server.ASSETS_DIR, 'README.md'), encoding='utf-8') as f:
+        readme = f.read()
+
+    assert packages == set(os.listdir(fixture_server.ASSETS_DIR)) - {'README.md'}
+    for package in packages:
+        name, version = package.split('@')
+        assert any(entry.lower().startswith('license') for entry in
+                   os.listdir(os.path.join(fixture_server.ASSETS_DIR, package)))
+        assert re.search(rf'\| {re.escape(name)} +\| {re.escape(version)} +\|', readme)
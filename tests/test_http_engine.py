@@ -0,0 +1,195 @@
+'''
+Test engine HTTP terhadap rekaman JSON yang diputar ulang server fixture lokal.
+'''
+import csv
+import json
+import threading
+
+import pytest
+
+import fixture_server
+import scraper
+from conftest import FIXTURE_ROW_COUNT
+
+def read_output(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+def row_keys(rows):
+    return [tuple(row[name] for name in scraper.ROW_KEY_FIELDS) for row in rows]
+
+def without_scraped_at(batch):
+    # Urutan baris mengikuti order server-side, jadi dibandingkan setelah diurutkan per no_sk
+    rows = [{name: value for name, value in row.items() if name != 'scraped_at'} for row in batch]
+    return sorted(rows, key=lambda row: row['no_sk'])
+
+def test_scrape_writes_every_row_once(make_scraper, fixture_rows):
+    s = make_scraper()
+    report = s.scrape()
+
+    rows = read_output(s.output_path)
+    assert report['rows_written'] == FIXTURE_ROW_COUNT
+    assert len(rows) == FIXTURE_ROW_COUNT
+    assert len(set(row_keys(rows))) == FIXTURE_ROW_COUNT
+    assert report['progress']['reconciliation']['complete']
+    assert sorted(row['no_sk'] for row in rows) == sorted(row[4] for row in fixture_rows)
+
+def test_repeated_scrape_reports_only_its_own_metrics(make_scraper):
+    s = make_scraper()
+    first = s.scrape()
+    second = s.scrape()
+
+    assert first['counters'] == second['counters']
+    assert second['counters']['rows'] == FIXTURE_ROW_COUNT
+
+def test_http_rows_match_selenium_row_shape(fixture_endpoint, fixture_rows):
+    with scraper.HttpEngine(endpoint_url=fixture_endpoint, page_size=100) as engine:
+        http_batch = scraper.RecordBatch.concat(engine.iter_pages())
+    # Baris Selenium: #table hasil draw DataTables (termasuk kolom status hasil render)
+    selenium_batch = scraper.parse_table_html(fixture_server.render_table_html(fixture_rows),
+                                              parser='html.parser')
+
+    assert http_batch.fieldnames == selenium_batch.fieldnames == scraper.ROW_FIELDNAMES
+    assert without_scraped_at(scraper.normalize_batch(http_batch)) == \
+        without_scraped_at(scraper.normalize_batch(selenium_batch))
+
+def test_filter_pushdown_is_refiltered_exactly(make_scraper, fixture_rows):
+    # Pencarian kolom server bersifat "mengandung": Wilayah 1 juga cocok dengan Wilayah 10-16
+    contains = [row for row in fixture_rows if 'wilayah 1' in row[3].lower()]
+    exact = [row for row in fixture_rows if row[3] == 'Wilayah 1']
+    assert len(contains) > len(exact) > 0
+
+    s = make_scraper()
+    report = s.scrape(filters={'wilayah': 'Wilayah 1'})
+
+    rows = read_output(s.output_path)
+    assert report['rows_written'] == len(exact)
+    assert {row['wilayah'] for row in rows} == {'Wilayah 1'}
+    assert sorted(row['no_sk'] for row in rows) == sorted(row[4] for row in exact)
+
+class Interrupted(Exception):
+    pass
+
+def test_resume_continues_after_interruption(make_scraper, monkeypatch):
+    normalized_pages = scraper.iter_normalized_pages
+
+    def interrupted_after_two_pages(pages, today=None):
+        for page_number, page_data in enumerate(normalized_pages(pages, today), 1):
+            if page_number > 2:
+                raise Interrupted()
+            yield page_data
+
+    monkeypatch.setattr(scraper, 'iter_normalized_pages', interrupted_after_two_pages)
+    s = make_scraper()
+    with pytest.raises(Interrupted):
+        s.scrape()
+    checkpoint = scraper.load_checkpoint(s.checkpoint_file())
+    assert checkpoint['last_page'] == 2
+    assert len(read_output(s.output_path)) == 2 * s.page_size
+
+    monkeypatch.setattr(scraper, 'iter_normalized_pages', normalized_pages)
+    report = make_scraper().resume()
+
+    rows = read_output(s.output_path)
+    assert report['rows_written'] == FIXTURE_ROW_COUNT
+    assert len(rows) == FIXTURE_ROW_COUNT
+    assert len(set(row_keys(rows))) == FIXTURE_ROW_COUNT
+
+def test_failed_fetch_fails_the_run(make_scraper, monkeypatch, capsys):
+    fetch_page = scraper.fetch_datatables_page_with_retry
+
+    def failing_from_third_page(endpoint, start, length, draw, limiter, session=None, **kwargs):
+        if start >= 500:
+            raise ConnectionError("koneksi terputus")
+        return fetch_page(endpoint, start, length, draw, limiter, session, **kwargs)
+
+    monkeypatch.setattr(scraper, 'fetch_datatables_page_with_retry', failing_from_third_page)
+    s = make_scraper()
+    with pytest.raises(ConnectionError):
+        s.scrape()
+
+    assert 'SCRAPING SELESAI' not in capsys.readouterr().out
+    with open(s.report_file(), encoding='utf-8') as f:
+        report = json.load(f)
+    assert report['progress']['error'] == "ConnectionError: koneksi terputus"
+    assert not report['progress']['completed']
+    assert scraper.load_checkpoint(s.checkpoint_file())['last_page'] == 2
+    assert len(read_output(s.output_path)) == 2 * s.page_size
+
+def test_session_metrics_report_connection_reuse(fixture_endpoint):
+    with scraper.HttpEngine(endpoint_url=fixture_endpoint, page_size=100) as engine:
+        pages = list(engine.iter_pages())
+        metrics = engine.session.metrics_report()
+
+    (host_metrics,) = metrics.values()
+    assert host_metrics['requests'] >= len(pages)
+    assert 1 <= host_metrics['connections'] <= host_metrics['requests']
+    assert host_metrics['connection_reuse_ratio'] == \
+        (host_metrics['requests'] - host_metrics['connections']) / host_metrics['requests']
+    assert host_metrics['decoded_bytes'] >= host_metrics['bytes'] > 0
+    assert len(engine.session._connections) <= host_metrics['connections']
+
+def test_session_releases_connections_of_finished_threads(fixture_endpoint):
+    session = scraper.HttpSession()
+    worker = threading.Thread(target=session.request, args=('GET', fixture_endpoint))
+    worker.start()
+    worker.join()
+    session.request('GET', fixture_endpoint)
+    session.request('GET', fixture_endpoint)
+
+    (host_metrics,) = session.metrics_report().values()
+    assert host_metrics['connections'] == 2
+    assert host_metrics['connection_reuse_ratio'] == 1 / 3
+    assert [thread for thread, _ in session._connections] == [threading.current_thread()]
+    session.close()
+
+def test_job_output_path_follows_directory(fixture_endpoint, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert scraper.ScrapeJob(job_id='pt', directory='institusi').output_path == \
+        'banpt_akreditasi_institusi-pt.csv'
+
+    job = scraper.ScrapeJob(job_id='prodi', max_pages=1)
+    with scraper.HttpEngine(endpoint_url=fixture_endpoint, page_size=100) as engine:
+        report = scraper.run_scrape_job(engine, job)
+        with pytest.raises(ValueError):
+            scraper.run_scrape_job(engine, scraper.ScrapeJob(directory='institusi', max_pages=1))
+
+    assert job.output_path == report['output_path'] == 'banpt_akreditasi_prodi-prodi.csv'
+    assert len(read_output(tmp_path / job.output_path)) == 100
+
+def test_diff_continues_with_next_filter_combination(make_scraper, fixture_rows, tmp_path):
+    db_path = str(tmp_path / "index.sqlite")
+    s2_rows = [row for row in fixture_rows if row[2] == 'S2']
+    make_scraper().diff(db_path=db_path, filters={'strata': 'S1'})
+
+    # Kombinasi S1 berhenti di halaman pertama yang sudah dikenal, kombinasi S2 tetap di-crawl
+    s = make_scraper(output_path=str(tmp_path / "delta.csv"))
+    report = s.diff(db_path=db_path, filters={'strata': ['S1', 'S2']})
+
+    rows = read_output(s.output_path)
+    assert report['rows_written'] == len(s2_rows) > 0
+    assert {row['strata'] for row in rows} == {'S2'}
+    with scraper.AccreditationIndex(db_path) as index:
+        indexed = index.conn.execute("SELECT COUNT(*) FROM akreditasi WHERE strata = 'S2'").fetchone()[0]
+    assert indexed == len(s2_rows)
+
+def test_parquet_output_is_not_checkpointed(make_scraper, tmp_path):
+    with pytest.raises(ValueError):
+        make_scraper(output_path=str(tmp_path / "output.parquet"), checkpoint_path=str(tmp_path / "cp.json"))
+
+    # Checkpoint lama tanpa output_offset (ditulis writer Parquet) tidak boleh menimpa output
+    s = make_scraper()
+    scraper.save_checkpoint(s.checkpoint_file(), {'last_page': 2, 'output_path': s.output_path,
+                                                  'output_offset': None, 'rows_written': 500, 'mode': 'http'})
+    with open(s.output_path, 'w', encoding='utf-8') as f:
+        f.write('isi lama\n')
+    with pytest.raises(ValueError):
+        s.resume()
+    with open(s.output_path, encoding='utf-8') as f:
+        assert f.read() == 'isi lama\n'
+
+    s = make_scraper(output_path=str(tmp_path / "output.parquet"))
+    scraper.save_checkpoint(s.checkpoint_file(), {'last_page': 2, 'output_path': s.output_path,
+                                                  'output_offset': None, 'mode': 'http'})
+    with pytest.raises(ValueError):
+        s.resume()
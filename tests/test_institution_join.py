@@ -0,0 +1,89 @@
+'''
+Test join prodi-institusi: normalisasi nama PT dan pemilihan baris institusi terbaru.
+'''
+from datetime import date
+
+import pytest
+
+import scraper
+
+def institution(name, tahun_sk, tanggal_kedaluwarsa, peringkat='Baik', no_sk='1/SK/PT'):
+    return {'perguruan_tinggi': name, 'peringkat': peringkat, 'no_sk': no_sk, 'tahun_sk': tahun_sk,
+            'wilayah': 'Wilayah 3', 'tanggal_kedaluwarsa': tanggal_kedaluwarsa, 'status_kedaluwarsa': ''}
+
+@pytest.mark.parametrize('older, newer', [
+    # Teks --raw non-ISO: perbandingan string akan memilih "5 ..." < "12 ..." secara salah
+    (institution('Universitas A', '2023', '12 Desember 2023', no_sk='lama'),
+     institution('Universitas A', '2023', '5 Januari 2024', no_sk='baru')),
+    (institution('Universitas A', 'SK 999', '2030-01-01', no_sk='lama'),
+     institution('Universitas A', '2019', '2024-01-01', no_sk='baru')),
+    (institution('Universitas A', '2020', 'tidak diketahui', no_sk='lama'),
+     institution('Universitas A', '2020', '2021-01-01', no_sk='baru')),
+    (institution('Universitas A', 2018, date(2023, 1, 1), no_sk='lama'),
+     institution('Universitas A', 2021, date(2022, 1, 1), no_sk='baru')),
+])
+def test_most_recent_institution_row_wins_in_any_order(older, newer):
+    for rows in ([older, newer], [newer, older]):
+        index = scraper.InstitutionIndex.from_rows(rows)
+        record = dict(zip(index.fields, index.lookup('Universitas A')))
+        assert record['no_sk'] == 'baru'
+        assert index.collisions == 1
+
+@pytest.mark.parametrize('name, expected', [
+    ('Universitas Fiktif 1', 'universitas fiktif 1'),
+    ('UNIVERSITAS  FIKTIF 1', 'universitas fiktif 1'),
+    ('Univ. Fiktif 1', 'universitas fiktif 1'),
+    ('Universitas Fiktif 1 (UF1)', 'universitas fiktif 1'),
+    ('Institut Teknologi Bandung', 'institut teknologi bandung'),
+    ('Inst. Teknologi Bandung', 'institut teknologi bandung'),
+    ('Poltek Negeri Jakarta', 'politeknik negeri jakarta'),
+    ('Universitas Pelita Harapan-Medan', 'universitas pelita harapan medan'),
+    ("Sekolah Tinggi Ilmu Ekonomi 'Indonesia'", 'sekolah tinggi ilmu ekonomi indonesia'),
+    ('Universitas Katolik Santo Agustinus Hippo Pérez', 'universitas katolik santo agustinus hippo perez'),
+    ('', ''),
+    (None, ''),
+])
+def test_normalize_institution_name(name, expected):
+    assert scraper.normalize_institution_name(name) == expected
+
+def prodi(name, no_sk):
+    return {'perguruan_tinggi': name, 'program_studi': 'Teknik Sipil', 'strata': 'S1', 'wilayah': 'Wilayah 3',
+            'no_sk': no_sk, 'tahun_sk': '2020', 'peringkat': 'Baik', 'tanggal_kedaluwarsa': '2025-01-01',
+            'status_kedaluwarsa': '', 'scraped_at': ''}
+
+def test_duplicate_names_collapse_to_one_record():
+    index = scraper.InstitutionIndex.from_rows([
+        institution('Universitas Fiktif 1', '2016', '2021-01-01', no_sk='lama'),
+        institution('UNIVERSITAS FIKTIF 1', '2021', '2026-01-01', peringkat='Unggul', no_sk='baru'),
+        institution('Univ. Fiktif 1 (UF1)', '2018', '2023-01-01', no_sk='tengah'),
+        institution('Universitas Fiktif 2', '2020', '2025-01-01', no_sk='lain'),
+        institution('', '2020', '2025-01-01', no_sk='tanpa nama'),
+    ])
+
+    assert index.rows == 5
+    assert len(index.records) == 2
+    assert index.collisions == 2
+    record = dict(zip(index.fields, index.lookup('universitas fiktif 1')))
+    assert record['no_sk'] == 'baru'
+    # Nama asli baris terpilih yang ikut di output, bukan kunci normalisasinya
+    assert record['perguruan_tinggi'] == 'UNIVERSITAS FIKTIF 1'
+    assert index.lookup('Universitas Fiktif 3') is None
+
+def test_join_adds_prefixed_institution_columns():
+    index = scraper.InstitutionIndex.from_rows([
+        institution('Universitas Fiktif 1', '2016', '2021-01-01', no_sk='lama'),
+        institution('Universitas Fiktif 1', '2021', '2026-01-01', peringkat='Unggul', no_sk='baru'),
+    ])
+    rows = [prodi('Univ. Fiktif 1', 'p1'), prodi('Universitas Tanpa Pasangan', 'p2'), prodi('Universitas Fiktif 1', 'p3')]
+    joined = index.join(rows)
+
+    assert joined.fieldnames == scraper.ROW_FIELDNAMES + [f"institusi_{name}" for name in index.fields]
+    joined_rows = list(joined)
+    assert [row['no_sk'] for row in joined_rows] == ['p1', 'p2', 'p3']
+    assert [row['institusi_no_sk'] for row in joined_rows] == ['baru', '', 'baru']
+    assert joined_rows[0]['institusi_peringkat'] == 'Unggul'
+    assert all(row['institusi_perguruan_tinggi'] == '' for row in joined_rows[1:2])
+    assert (index.joined_rows, index.matched_rows) == (3, 2)
+    assert index.unmatched_names == {'Universitas Tanpa Pasangan'}
+    # Batch sumber tidak ikut berubah
+    assert scraper.RecordBatch.from_rows(rows).fieldnames == scraper.ROW_FIELDNAMES
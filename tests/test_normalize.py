@@ -0,0 +1,104 @@
+'''
+Test normalisasi nilai tampilan: tahun, tanggal, peringkat dan status kedaluwarsa.
+'''
+from datetime import date
+
+import pytest
+
+import scraper
+
+@pytest.mark.parametrize('text, expected', [
+    ('2021-01-24', date(2021, 1, 24)),
+    ('2021-1-5T00:00:00', date(2021, 1, 5)),
+    ('24-01-2021', date(2021, 1, 24)),
+    ('24/01/2021', date(2021, 1, 24)),
+    ('24.01.2021', date(2021, 1, 24)),
+    ('24 Januari 2021', date(2021, 1, 24)),
+    ('5 Agustus 2024', date(2024, 8, 5)),
+    (' 12 Des. 2023 ', date(2023, 12, 12)),
+    ('1 May 2022', date(2022, 5, 1)),
+])
+def test_parse_date_text_formats(text, expected):
+    assert scraper.parse_date_text(text) == expected
+
+@pytest.mark.parametrize('text', ['31 Sept 2025', '2021-02-30', '31/04/2021', '24 Foo 2021', 'besok', '', None])
+def test_parse_date_text_unparseable(text):
+    assert scraper.parse_date_text(text) is None
+
+def test_parse_date_text_keeps_dates():
+    value = date(2020, 2, 29)
+    assert scraper.parse_date_text(value) is value
+
+@pytest.mark.parametrize('text, expected', [
+    ('2016', 2016), (' 2016 ', 2016), ('SK 2019/2020', 2019), ('Tahun 1999', 1999), (2016, 2016),
+])
+def test_parse_year(text, expected):
+    assert scraper.parse_year(text) == expected
+
+@pytest.mark.parametrize('text', ['20l6', '1899', '12345', '', None])
+def test_parse_year_unparseable(text):
+    assert scraper.parse_year(text) is None
+
+def test_parse_or_keep_returns_source_text_on_failure():
+    assert scraper.parse_or_keep(scraper.parse_year, '20l6') == '20l6'
+    assert scraper.parse_or_keep(scraper.parse_year, '2016') == 2016
+    assert scraper.parse_or_keep(scraper.parse_date_text, '') is None
+
+@pytest.mark.parametrize('text, expected', [
+    ('Unggul', scraper.Peringkat.UNGGUL),
+    ('  baik   sekali ', scraper.Peringkat.BAIK_SEKALI),
+    ('Baik Sekali (B)', scraper.Peringkat.BAIK_SEKALI),
+    ('Terakreditasi A', scraper.Peringkat.A),
+    ('C', scraper.Peringkat.C),
+    ('TIDAK TERAKREDITASI', scraper.Peringkat.TIDAK_TERAKREDITASI),
+])
+def test_peringkat_parse(text, expected):
+    assert scraper.Peringkat.parse(text) is expected
+
+def test_peringkat_parse_keeps_unknown_text():
+    assert scraper.Peringkat.parse('Belum  Ada') == 'Belum Ada'
+    assert scraper.Peringkat.parse('') == ''
+    assert scraper.Peringkat.parse(None) is None
+    assert scraper.Peringkat.parse(scraper.Peringkat.B) is scraper.Peringkat.B
+
+def test_peringkat_ordering():
+    Peringkat = scraper.Peringkat
+    assert Peringkat.C < Peringkat.BAIK < Peringkat.B < Peringkat.BAIK_SEKALI < Peringkat.A < Peringkat.UNGGUL
+    assert Peringkat.TERAKREDITASI_SEMENTARA < Peringkat.C
+    assert max([Peringkat.A, Peringkat.UNGGUL, Peringkat.BAIK]) is Peringkat.UNGGUL
+    assert sorted([Peringkat.A, Peringkat.C, Peringkat.B]) == [Peringkat.C, Peringkat.B, Peringkat.A]
+    assert Peringkat.UNGGUL >= Peringkat.A
+    with pytest.raises(TypeError):
+        Peringkat.A < 'B'
+    assert str(Peringkat.BAIK_SEKALI) == 'Baik Sekali'
+
+def make_row(**values):
+    row = {
+        'perguruan_tinggi': 'Universitas Fiktif 1', 'program_studi': 'Teknik Informatika', 'strata': 'S1',
+        'wilayah': 'Wilayah 8', 'no_sk': '1000/SK/BAN-PT/Ak/S/2016', 'tahun_sk': '2016', 'peringkat': 'Baik Sekali',
+        'tanggal_kedaluwarsa': '24 Januari 2021', 'status_kedaluwarsa': 'Kedaluwarsa', 'scraped_at': '',
+    }
+    row.update(values)
+    return row
+
+def test_normalize_batch_types_values():
+    (row,) = scraper.normalize_batch([make_row()], today=date(2020, 1, 1))
+
+    assert row['tahun_sk'] == 2016
+    assert row['tanggal_kedaluwarsa'] == date(2021, 1, 24)
+    assert row['peringkat'] is scraper.Peringkat.BAIK_SEKALI
+    assert row['status_kedaluwarsa'] == scraper.STATUS_MASIH_BERLAKU
+
+def test_normalize_batch_keeps_unparseable_text_and_counts_it():
+    scraper.reset_run_metrics()
+    rows = [make_row(tahun_sk='20l6', tanggal_kedaluwarsa='31 Sept 2025', peringkat='Belum Ada'),
+            make_row(tanggal_kedaluwarsa='31 Sept 2025'), make_row(tanggal_kedaluwarsa='')]
+    batch = scraper.normalize_batch(rows, today=date(2020, 1, 1))
+
+    assert batch.column('tahun_sk') == ['20l6', 2016, 2016]
+    assert batch.column('tanggal_kedaluwarsa') == ['31 Sept 2025', '31 Sept 2025', None]
+    assert batch.column('peringkat')[0] == 'Belum Ada'
+    assert batch.column('status_kedaluwarsa') == ['', '', '']
+    counters = scraper.RUN_METRICS.report()['counters']
+    assert counters['parse_failures_tahun_sk'] == 1
+    assert counters['parse_failures_tanggal_kedaluwarsa'] == 2
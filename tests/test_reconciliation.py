@@ -0,0 +1,108 @@
+'''
+Test rekonsiliasi offset: penggabungan rentang, rentang hilang dan laporan ReconciliationTracker.
+'''
+import pytest
+
+import scraper
+
+def rows_for(keys):
+    return [{'perguruan_tinggi': 'PT', 'program_studi': 'Prodi', 'strata': 'S1', 'no_sk': key} for key in keys]
+
+@pytest.mark.parametrize('added, expected', [
+    ([(0, 100), (100, 200)], [[0, 200]]),
+    ([(0, 100), (200, 300)], [[0, 100], [200, 300]]),
+    ([(200, 300), (0, 100)], [[0, 100], [200, 300]]),
+    ([(0, 100), (200, 300), (100, 200)], [[0, 300]]),
+    ([(0, 100), (50, 150)], [[0, 150]]),
+    ([(0, 300), (100, 200)], [[0, 300]]),
+    ([(100, 200), (0, 50), (40, 120)], [[0, 200]]),
+    ([(0, 100), (100, 100), (300, 200)], [[0, 100]]),
+])
+def test_add_offset_range_merges(added, expected):
+    ranges = []
+    for start, end in added:
+        assert scraper.add_offset_range(ranges, start, end) is ranges
+    assert ranges == expected
+
+@pytest.mark.parametrize('ranges, end, expected', [
+    ([], 250, [[0, 250]]),
+    ([[0, 250]], 250, []),
+    ([[0, 100], [200, 250]], 250, [[100, 200]]),
+    ([[100, 200]], 250, [[0, 100], [200, 250]]),
+    ([[0, 100]], 50, []),
+    ([[0, 100], [300, 400]], 250, [[100, 250]]),
+])
+def test_missing_offset_ranges(ranges, end, expected):
+    assert scraper.missing_offset_ranges(ranges, end) == expected
+
+def test_tracker_reports_complete_coverage_and_duplicates():
+    tracker = scraper.ReconciliationTracker()
+    tracker.register(0, {'strata': 'S1'})
+    progress = {'total_entries': 5, 'page_size': 3}
+
+    first = tracker.add_page(rows_for('abc'), 0, [0, 3], progress)
+    # Data bergeser: baris c muncul lagi di halaman berikutnya
+    second = tracker.add_page(rows_for('cd'), 0, [3, 5], progress)
+
+    assert [row['no_sk'] for row in first] == ['a', 'b', 'c']
+    assert [row['no_sk'] for row in second] == ['d']
+    report = tracker.report()
+    assert report['complete']
+    assert report['expected_entries'] == 5
+    assert report['received_rows'] == 5
+    assert report['unique_rows'] == 4
+    assert report['duplicate_rows'] == 1
+    assert report['missing_rows'] == 0
+    assert report['combinations'][0]['missing'] == []
+    assert tracker.missing_ranges() == []
+
+def test_tracker_reports_gaps_filtered_rows_and_unreached_combinations():
+    tracker = scraper.ReconciliationTracker()
+    tracker.register(0, {'strata': 'S1'})
+    tracker.register(1, {'strata': 'S2'})
+    progress = {'total_entries': 10, 'page_size': 3}
+
+    # Halaman kedua hilang; satu baris halaman ketiga tersaring
+    tracker.add_page(rows_for('abc'), 0, [0, 3], progress)
+    tracker.add_page(rows_for('gh'), 0, [6, 9], progress)
+
+    report = tracker.report()
+    assert not report['complete']
+    assert report['filtered_out_rows'] == 1
+    assert report['combinations'][0]['missing'] == [[3, 6], [9, 10]]
+    assert report['missing_rows'] == 4
+    # Kombinasi yang belum dijangkau tidak punya cakupan tercatat
+    assert report['combinations'][1]['missing'] is None
+    assert tracker.missing_ranges() == [(0, {'strata': 'S1'}, [[3, 6], [9, 10]]),
+                                        (1, {'strata': 'S2'}, [[0, None]])]
+
+def test_tracker_limits_expected_entries_to_max_pages():
+    tracker = scraper.ReconciliationTracker(max_pages=2)
+    tracker.add_page(rows_for('abc'), 0, [0, 3], {'total_entries': 10, 'page_size': 3})
+    tracker.add_page(rows_for('def'), 0, [3, 6], {'total_entries': 10, 'page_size': 3})
+
+    report = tracker.report()
+    assert report['expected_entries'] == 6
+    assert report['complete']
+
+def test_tracker_without_page_ranges_is_not_complete():
+    tracker = scraper.ReconciliationTracker()
+    tracker.add_page(rows_for('ab'), 0, None, {'total_entries': 2, 'page_size': 2})
+
+    report = tracker.report()
+    assert report['received_rows'] == 2
+    assert report['combinations'][0]['missing'] is None
+    assert not report['complete']
+
+def test_tracker_round_trips_through_report():
+    tracker = scraper.ReconciliationTracker()
+    tracker.register(0, {'strata': 'S1'})
+    tracker.add_page(rows_for('ab'), 0, [0, 2], {'total_entries': 4, 'page_size': 2})
+    report = tracker.report()
+
+    restored = scraper.ReconciliationTracker.from_report(report)
+    assert restored.report() == report
+    assert restored.missing_ranges() == [(0, {'strata': 'S1'}, [[2, 4]])]
+    # Indeks dedup diisi ulang dari output yang sudah ada
+    assert restored.seed_keys([('PT', 'Prodi', 'S1', 'a'), ('PT', 'Prodi', 'S1', 'b')]) == 2
+    assert len(restored.add_page(rows_for('bc'), 0, [2, 4])) == 1
@@ -0,0 +1,81 @@
+'''
+Test RecordBatch: penyimpanan kolumnar berkamus dan round-trip ke dict baris.
+'''
+import pytest
+
+import scraper
+
+def make_rows(count, offset=0):
+    return [{
+        'perguruan_tinggi': f"Universitas Fiktif {(offset + i) // 3}", 'program_studi': 'Teknik Informatika',
+        'strata': 'S1' if (offset + i) % 2 else 'S2', 'wilayah': 'Wilayah 3', 'no_sk': f"{offset + i}/SK/BAN-PT",
+        'tahun_sk': '2020', 'peringkat': 'Unggul', 'tanggal_kedaluwarsa': '2025-01-01',
+        'status_kedaluwarsa': 'Masih Berlaku', 'scraped_at': '2026-01-01T00:00:00',
+    } for i in range(count)]
+
+def test_from_rows_round_trips_dict_rows():
+    rows = make_rows(7)
+    batch = scraper.RecordBatch.from_rows(rows)
+
+    assert len(batch) == 7
+    assert list(batch) == rows
+    assert scraper.RecordBatch.from_rows(batch) is batch
+    assert list(scraper.RecordBatch.from_rows(list(batch))) == rows
+
+def test_categorical_columns_share_dictionary_values():
+    batch = scraper.RecordBatch.from_rows(make_rows(6))
+
+    assert batch.categories('strata') == ['S2', 'S1']
+    assert batch.categories('scraped_at') == ['2026-01-01T00:00:00']
+    assert batch.column('strata') == ['S2', 'S1', 'S2', 'S1', 'S2', 'S1']
+    # no_sk bukan kolom kategorikal sehingga disimpan apa adanya
+    assert batch.column('no_sk') == [row['no_sk'] for row in make_rows(6)]
+
+def test_append_and_extend_remap_dictionary_codes():
+    batch = scraper.RecordBatch.from_rows(make_rows(2))
+    other = scraper.RecordBatch.from_rows(make_rows(3, offset=2))
+    batch.extend(other)
+    batch.extend(make_rows(1, offset=5))
+    batch.append([make_rows(1, offset=6)[0][name] for name in batch.fieldnames])
+
+    assert list(batch) == make_rows(7)
+    assert len(batch.categories('strata')) == 2
+
+def test_concat_matches_rows_in_order():
+    batches = [scraper.RecordBatch.from_rows(make_rows(3, offset)) for offset in (0, 3, 6)]
+    assert list(scraper.RecordBatch.concat(batches)) == make_rows(9)
+    assert len(scraper.RecordBatch.concat([])) == 0
+
+def test_indexing_slicing_and_take():
+    rows = make_rows(5)
+    batch = scraper.RecordBatch.from_rows(rows)
+
+    assert batch[0] == rows[0]
+    assert batch[-1] == rows[-1]
+    assert list(batch[1:4]) == rows[1:4]
+    assert list(batch[::2]) == rows[::2]
+    assert list(batch.take([4, 0])) == [rows[4], rows[0]]
+    with pytest.raises(IndexError):
+        batch[5]
+
+def test_take_shares_dictionary_without_affecting_source():
+    batch = scraper.RecordBatch.from_rows(make_rows(4))
+    taken = batch.take([1, 3])
+    taken.map_categories('strata', str.lower)
+
+    assert taken.column('strata') == ['s1', 's1']
+    assert batch.column('strata') == ['S2', 'S1', 'S2', 'S1']
+
+def test_iter_tuples_selects_columns():
+    batch = scraper.RecordBatch.from_rows(make_rows(2))
+    assert list(batch.iter_tuples(('no_sk', 'strata'))) == [('0/SK/BAN-PT', 'S2'), ('1/SK/BAN-PT', 'S1')]
+
+def test_from_cells_skips_rows_without_main_columns():
+    cells = [['PT A', 'Prodi A', 'S1'], ['', '', 'S2'], ['PT B', 'Prodi B']]
+    batch = scraper.RecordBatch.from_cells(cells, scraped_at='2026-01-01T00:00:00')
+
+    assert len(batch) == 2
+    assert batch.skipped_rows == 1
+    assert batch.column('perguruan_tinggi') == ['PT A', 'PT B']
+    # Kolom yang tidak ada di sel diisi string kosong
+    assert batch[1]['strata'] == '' and batch[1]['scraped_at'] == '2026-01-01T00:00:00'
@@ -0,0 +1,120 @@
+'''
+Test parser snapshot HTML #table: semua backend terpasang menghasilkan baris yang sama.
+'''
+import pytest
+
+import fixture_server
+import scraper
+
+SCRAPED_AT = '2026-01-01T00:00:00'
+
+@pytest.fixture(params=list(scraper.HTML_PARSERS))
+def html_parser(request):
+    if request.param not in scraper.available_html_parsers():
+        pytest.skip(f"parser {request.param} tidak terpasang")
+    return request.param
+
+def test_parses_rendered_fixture_table(html_parser):
+    rows = fixture_server.generate_fixture_rows(25)
+    batch = scraper.parse_table_html(fixture_server.render_table_html(rows), parser=html_parser,
+                                     scraped_at=SCRAPED_AT)
+
+    assert batch.fieldnames == scraper.ROW_FIELDNAMES
+    assert [list(values)[:8] for values in batch.iter_tuples()] == rows
+    assert set(batch.column('status_kedaluwarsa')) <= {'Kedaluwarsa', 'Masih Berlaku'}
+    assert batch.column('scraped_at') == [SCRAPED_AT] * 25
+
+def test_cell_text_is_stripped_and_unescaped(html_parser):
+    html_text = ('<table id="table"><thead><tr><th>Perguruan Tinggi</th></tr></thead><tbody>'
+                 '<tr><td>\n  <a href="#">Universitas <b>A &amp; B</b></a> </td><td>Teknik&nbsp;Sipil</td>'
+                 '<td>S1</td><td>Wilayah 3</td><td>1/SK</td><td>2020</td><td>Unggul</td><td>2025-01-01</td>'
+                 '<td>Masih Berlaku</td></tr></tbody></table>')
+    (row,) = scraper.parse_table_html(html_text, parser=html_parser, scraped_at=SCRAPED_AT)
+
+    assert row['perguruan_tinggi'] == 'Universitas A & B'
+    assert row['program_studi'] == 'Teknik\xa0Sipil'
+    assert row['status_kedaluwarsa'] == 'Masih Berlaku'
+
+def test_empty_table_yields_no_rows(html_parser):
+    html_text = fixture_server.render_table_html([])
+    assert 'dataTables_empty' in html_text
+
+    batch = scraper.parse_table_html(html_text, parser=html_parser)
+    assert len(batch) == 0
+
+def test_rows_without_main_columns_are_skipped(html_parser):
+    html_text = ('<table id="table"><tbody><tr><td>PT A</td><td>Prodi A</td></tr>'
+                 '<tr><td></td><td> </td><td>S1</td></tr><tr><td>PT B</td></tr></tbody></table>')
+    batch = scraper.parse_table_html(html_text, parser=html_parser)
+
+    assert batch.column('perguruan_tinggi') == ['PT A', 'PT B']
+    assert batch.skipped_rows == 1
+    # Kolom yang tidak ada di baris diisi string kosong
+    assert batch[1]['program_studi'] == ''
+
+def test_table_is_selected_by_directory_table_id(html_parser):
+    institution_rows = fixture_server.generate_fixture_institution_rows(3)
+    html_text = ('<html><body><table id="menu"><tbody><tr><td>Beranda</td><td>Menu</td></tr></tbody></table>'
+                 + fixture_server.render_table_html(institution_rows, directory='institusi') + '</body></html>')
+    batch = scraper.parse_table_html(html_text, parser=html_parser, directory='institusi')
+
+    assert batch.fieldnames == scraper.INSTITUSI_DIRECTORY.fieldnames
+    assert batch.column('perguruan_tinggi') == [row[0] for row in institution_rows]
+
+def test_unknown_parser_is_rejected():
+    with pytest.raises(ValueError):
+        scraper.parse_table_html('<table></table>', parser='regex')
+
+def test_snapshot_file_round_trip(tmp_path):
+    rows = fixture_server.generate_fixture_rows(5)
+    path = str(tmp_path / "snapshot.html")
+    scraper.TableSnapshot(fixture_server.render_table_html(rows), 5, scraped_at=SCRAPED_AT).save(path)
+
+    loaded = scraper.TableSnapshot.load(path)
+    assert loaded.scraped_at == SCRAPED_AT
+    assert not loaded.html.startswith('<!--')
+    batch = scraper.parse_snapshot_file(path, parser='html.parser')
+    assert batch.column('no_sk') == [row[4] for row in rows]
+    assert batch.column('scraped_at') == [SCRAPED_AT] * 5
+
+def test_parsed_snapshot_files_keep_file_order(tmp_path):
+    rows = fixture_server.generate_fixture_rows(9)
+    for page in range(3):
+        scraper.TableSnapshot(fixture_server.render_table_html(rows[page * 3:(page + 1) * 3])).save(
+            str(tmp_path / f"snapshot-{page:03d}.html"))
+    (tmp_path / "catatan.txt").write_text("bukan snapshot")
+
+    batches = list(scraper.iter_parsed_snapshot_files([str(tmp_path)], workers=0, parser='html.parser'))
+    assert [len(batch) for batch in batches] == [3, 3, 3]
+    assert [row['no_sk'] for batch in batches for row in batch] == [row[4] for row in rows]
+
+def test_iter_parsed_snapshots_restores_progress_of_yielded_page(tmp_path):
+    rows = fixture_server.generate_fixture_rows(6)
+    progress = {}
+
+    def pages():
+        for page in range(1, 4):
+            progress.update(page=page, page_range=[(page - 1) * 2, page * 2], completed=page == 3)
+            yield scraper.TableSnapshot(fixture_server.render_table_html(rows[(page - 1) * 2:page * 2]), 2)
+
+    seen = []
+    for batch in scraper.iter_parsed_snapshots(pages(), progress=progress, parser='html.parser',
+                                               snapshot_dir=str(tmp_path / "arsip"), window=2):
+        seen.append((progress['page'], progress['page_range'], [row['no_sk'] for row in batch]))
+
+    assert seen == [(page, [(page - 1) * 2, page * 2], [row[4] for row in rows[(page - 1) * 2:page * 2]])
+                    for page in range(1, 4)]
+    assert len(list((tmp_path / "arsip").iterdir())) == 3
+
+@pytest.mark.parametrize('text, expected', [
+    ("Showing 1 to 100 of 21,034 entries (filtered from 33,552 total entries)", (1, 100, 21034, 33552)),
+    ("Menampilkan 101 sampai 200 dari 1.234 entri", (101, 200, 1234, 1234)),
+    ("Showing 0 to 0 of 0 entries", (0, 0, 0, 0)),
+])
+def test_parse_table_info(text, expected):
+    info = scraper.parse_table_info(text)
+    assert (info['start'], info['end'], info['total'], info['total_unfiltered']) == expected
+
+def test_parse_table_info_unrecognized():
+    assert scraper.parse_table_info("Loading...") is None
+    assert scraper.parse_table_info(None) is None